@@ -1,33 +1,55 @@
 import os
+import sys
 import argparse
+import asyncio
 import json
 import logging
+import queue
+import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
+from functools import cached_property
+from itertools import chain
+
+# uvloop이 있으면 더 빠른 이벤트 루프 사용 (Windows 미지원)
+try:
+    import uvloop
+    use_uvloop = sys.platform != "win32"
+except ImportError:
+    uvloop = None
+    use_uvloop = False
 
 # 모듈 임포트
 from modules.llm.openai_client import OpenAIClient
 from modules.langchain.chains import ChainManager
 from modules.rag.chroma_client import ChromaManager
-from modules.rag.document_loader import load_document, load_directory, split_documents
-from modules.rag.retriever import get_retriever
+from modules.rag.document_loader import iter_load_documents, load_directory, iter_split_documents
+from modules.rag.retriever import get_retriever, close_retriever
 from modules.rag.keyword_extractor import KeywordExtractor
+from modules.cache.semantic_cache import SemanticCache
 from modules.phishing.detector import PhishingDetector
 from modules.emotion.analyzer import EmotionAnalyzer
 from modules.emotion.trend_monitor import EmotionTrendMonitor
 from modules.emotion.alert_manager import AlertManager
 from modules.export.csv_exporter import LogExporter
 from modules.utils.logger import Logger
-from modules.utils.helpers import load_config, save_config, format_time
+from modules.utils.helpers import load_config, load_env, save_config, format_time
 
 # .env 파일 로드
-load_dotenv()
+load_env()
 
 # 로거 초기화
 app_logger = Logger(os.getenv("LOG_LEVEL", "INFO"))
 logger = logging.getLogger(__name__)
 
+# 분석 결과 캐시 대상 최대 입력 길이 (긴 입력은 반복될 가능성이 낮음)
+ANALYSIS_CACHE_MAX_TEXT = 512
+
+# 백그라운드 로그 기록 시 한 번에 처리할 최대 레코드 수
+LOG_BATCH_SIZE = 64
+
 class BokdoriAI:
     """복도리 AI 비서 메인 클래스"""
     
@@ -38,78 +60,320 @@ class BokdoriAI:
         # 설정 로드
         self.config = load_config()
         
-        # 컴포넌트 초기화
-        self.llm_client = OpenAIClient(
-            model_name=self.config.get("llm", {}).get("model_name", "gpt-3.5-turbo")
-        )
-        self.chain_manager = ChainManager(self.config)
-        self.chroma_manager = ChromaManager(self.config.get("rag", {}))
-        self.phishing_detector = PhishingDetector(self.config)
+        # 컴포넌트는 처음 사용할 때 초기화 (아래 cached_property 참고)
         
-        # 새로 추가된 컴포넌트 초기화
-        self.emotion_analyzer = EmotionAnalyzer(self.config)
-        self.emotion_monitor = EmotionTrendMonitor()
-        self.alert_manager = AlertManager()
-        self.keyword_extractor = KeywordExtractor()
-        self.log_exporter = LogExporter()
+        # 대화 기록 초기화 (최근 기록만 유지)
+        self.conversation_history = deque(maxlen=self.config.get("history_max", 2000))
+        self._turn = 0
         
-        # RAG 검색기 초기화
-        self.retriever = get_retriever(self.config)
+        # 반복 입력에 대한 보이스피싱 분석 결과 캐시
+        # (감정 분석 결과는 EmotionAnalyzer의 LRU 캐시에서 재사용하므로 여기서 다시 캐시하지 않음)
+        self._cache_size = self.config.get("analysis_cache_size", 4096)
+        self._phishing_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
         
-        # 대화 기록 초기화
-        self.conversation_history = []
+        # 대화/감정/보이스피싱 로그는 백그라운드 스레드에서 기록 (응답 지연 방지)
+        self._log_q = queue.Queue(maxsize=self.config.get("log_queue_size", 10000))
+        self._log_thread = threading.Thread(target=self._drain_logs, name="bokdori-log-writer", daemon=True)
+        self._log_thread.start()
         
         logger.info("복도리 AI 비서 초기화 완료")
     
-    def process_message(self, user_input, use_rag=True):
+    @cached_property
+    def llm_client(self):
+        """OpenAI 클라이언트"""
+        return OpenAIClient(
+            model_name=self.config.get("llm", {}).get("model_name", "gpt-3.5-turbo")
+        )
+    
+    @cached_property
+    def chain_manager(self):
+        """LangChain 체인 관리자"""
+        return ChainManager(self.config)
+    
+    @cached_property
+    def chroma_manager(self):
+        """Chroma 벡터 저장소 관리자"""
+        return ChromaManager(self.config.get("rag", {}), self.config.get("embedding", {}))
+    
+    @cached_property
+    def phishing_detector(self):
+        """보이스피싱 감지기"""
+        return PhishingDetector(self.config)
+    
+    @cached_property
+    def emotion_analyzer(self):
+        """감정 분석기"""
+        return EmotionAnalyzer(self.config)
+    
+    @cached_property
+    def emotion_monitor(self):
+        """감정 추세 모니터"""
+        return EmotionTrendMonitor()
+    
+    @cached_property
+    def alert_manager(self):
+        """알림 관리자"""
+        return AlertManager()
+    
+    @cached_property
+    def keyword_extractor(self):
+        """키워드 추출기"""
+        return KeywordExtractor()
+    
+    @cached_property
+    def log_exporter(self):
+        """로그 내보내기"""
+        return LogExporter()
+    
+    @cached_property
+    def retriever(self):
+        """RAG 검색기 (Chroma 인덱스는 이때 처음 로드됨)"""
+        return get_retriever(self.config, db=self.chroma_manager.get_or_create_db())
+    
+    @cached_property
+    def semantic_cache(self):
+        """RAG 답변 시맨틱 캐시 (설정에서 켠 경우에만, 비활성화 시 None)"""
+        cache_config = self.config.get("rag", {}).get("semantic_cache", {})
+        if not cache_config.get("enabled", False):
+            return None
+        
+        # 지식 베이스와 같은 임베딩 모델과 Chroma 클라이언트를 재사용 (캐시 컬렉션은 ChromaManager가 생성)
+        return SemanticCache(self.chroma_manager.embedding_model, self.chroma_manager, cache_config)
+    
+    @cached_property
+    def _rag_chain(self):
+        """현재 검색기에 맞춰 한 번만 생성한 RAG 체인"""
+        return self.chain_manager.get_rag_chain(self.retriever)
+    
+    def _refresh_retriever(self):
+        """검색기를 다시 만들고 이전 검색기로 만든 RAG 체인 폐기"""
+        # 이전 검색기의 배치 처리 스레드 종료
+        close_retriever(self.__dict__.get("retriever"))
+        self.retriever = get_retriever(self.config, db=self.chroma_manager.get_or_create_db())
+        self.__dict__.pop("_rag_chain", None)
+        
+        # 지식 베이스가 바뀌었으므로 이전 답변은 더 이상 재사용하지 않음
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
+    
+    def _cached_analysis(self, cache, analyze, user_input):
         """
-        사용자 메시지 처리
+        정규화된 입력 기준으로 분석 결과를 캐싱 (LRU)
         
         Args:
+            cache (OrderedDict): 결과 캐시
+            analyze (callable): 분석 함수
             user_input (str): 사용자 입력
-            use_rag (bool, optional): RAG 사용 여부. 기본값은 True
             
         Returns:
-            str: AI 응답
+            dict: 분석 결과
         """
-        if not user_input or len(user_input.strip()) == 0:
-            return "메시지가 비어있습니다. 질문이나 대화를 입력해주세요."
+        key = user_input.strip().lower()
+        if len(key) > ANALYSIS_CACHE_MAX_TEXT:
+            return analyze(user_input)
         
-        start_time = time.time()
-        logger.info(f"사용자 메시지 처리 중: '{user_input[:50]}...'")
+        with self._cache_lock:
+            result = cache.get(key)
+            if result is not None:
+                cache.move_to_end(key)
+                return result
         
-        # 대화 기록에 추가
-        self.conversation_history.append(user_input)
+        result = analyze(user_input)
+        
+        with self._cache_lock:
+            cache[key] = result
+            if len(cache) > self._cache_size:
+                cache.popitem(last=False)
+        
+        return result
+    
+    def _enqueue_log(self, kind, *args):
+        """
+        로그 기록 요청을 백그라운드 큐에 추가 (큐가 가득 차면 직접 기록)
+        
+        Args:
+            kind (str): 로그 유형 ("conversation", "emotion", "phishing")
+            *args: 해당 Logger 메서드 인자
+        """
+        try:
+            self._log_q.put_nowait((kind, args))
+        except queue.Full:
+            logger.warning("로그 큐가 가득 차서 직접 기록합니다.")
+            self._write_log(kind, args)
+    
+    def _write_log(self, kind, args):
+        """
+        로그 한 건 기록
+        
+        Args:
+            kind (str): 로그 유형
+            args (tuple): 해당 Logger 메서드 인자
+        """
+        if kind == "conversation":
+            app_logger.log_conversation(*args)
+        elif kind == "emotion":
+            app_logger.log_emotion(*args)
+        elif kind == "phishing":
+            app_logger.log_phishing_detection(*args)
+        else:
+            logger.error(f"알 수 없는 로그 유형: {kind}")
+    
+    def _drain_logs(self):
+        """백그라운드 로그 기록 루프 (최대 LOG_BATCH_SIZE개씩 모아서 처리)"""
+        while True:
+            batch = [self._log_q.get()]
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self._log_q.get_nowait())
+                except queue.Empty:
+                    break
+            
+            for kind, args in batch:
+                try:
+                    self._write_log(kind, args)
+                except Exception as e:
+                    logger.error(f"백그라운드 로그 기록 실패: {e}")
+            
+            # 배치 단위로 한 번만 파일에 내보낸 뒤 완료 처리 (flush_logs가 기록 완료를 보장하도록)
+            app_logger.flush()
+            for _ in batch:
+                self._log_q.task_done()
+    
+    def flush_logs(self):
+        """대기 중인 로그가 모두 기록될 때까지 대기"""
+        self._log_q.join()
+        
+        # 큐가 가득 차서 직접 기록한 로그도 파일에 내보냄
+        app_logger.flush()
+    
+    def close(self):
+        """대기 중인 로그를 기록하고 LLM 클라이언트의 HTTP 연결 풀 닫기 (종료 시 호출)"""
+        self.flush_logs()
+        
+        # 아직 만들지 않은 클라이언트는 닫기 위해 새로 만들지 않음
+        llm_client = self.__dict__.get("llm_client")
+        if llm_client is not None:
+            llm_client.close()
+    
+    async def aclose(self):
+        """LLM 클라이언트의 비동기 HTTP 연결 풀 닫기 (메시지를 처리한 이벤트 루프에서 호출)"""
+        llm_client = self.__dict__.get("llm_client")
+        if llm_client is not None:
+            await llm_client.aclose()
+    
+    def _detect_phishing(self, user_input):
+        """
+        보이스피싱 감지 (오류 시 기본 결과 반환)
         
-        # 보이스피싱 감지
+        Args:
+            user_input (str): 사용자 입력
+            
+        Returns:
+            dict: 보이스피싱 감지 결과
+        """
         try:
-            phishing_result = self.phishing_detector.detect(user_input)
-            app_logger.log_phishing_detection(user_input, phishing_result)
+            phishing_result = self._cached_analysis(self._phishing_cache, self.phishing_detector.detect, user_input)
+            self._enqueue_log("phishing", user_input, phishing_result)
+            return phishing_result
         except Exception as e:
             logger.error(f"보이스피싱 감지 중 오류: {e}")
-            phishing_result = {"is_phishing": False, "risk_level": "unknown", "score": 0, "keywords": [], "explanation": "감지 오류"}
+            return {"is_phishing": False, "risk_level": "unknown", "score": 0, "keywords": [], "explanation": "감지 오류"}
+    
+    def _analyze_emotion(self, user_input):
+        """
+        감정 분석 (오류 시 기본 결과 반환)
         
-        # 감정 분석
+        Args:
+            user_input (str): 사용자 입력
+            
+        Returns:
+            dict: 감정 분석 결과
+        """
         try:
             emotion_result = self.emotion_analyzer.analyze_text(user_input)
-            app_logger.log_emotion(user_input, emotion_result)
+            self._enqueue_log("emotion", user_input, emotion_result)
+            return emotion_result
         except Exception as e:
             logger.error(f"감정 분석 중 오류: {e}")
-            emotion_result = {"dominant_emotion": "unknown", "emotion_category": "neutral", "confidence": 0.0, "keywords": []}
+            return {"dominant_emotion": "unknown", "emotion_category": "neutral", "confidence": 0.0, "keywords": []}
+    
+    async def _invoke_rag_chain(self, user_input):
+        """RAG 체인 비동기 실행 (시맨틱 캐시가 켜져 있으면 비슷한 질문의 답변 재사용)"""
+        # 캐시와 RAG 체인은 처음 사용할 때 생성되므로 (Chroma/LLM 초기화) 스레드에서 가져옴
+        cache = await asyncio.to_thread(getattr, self, "semantic_cache")
+        embedding = None
+        if cache is not None:
+            answer, embedding = await asyncio.to_thread(cache.lookup, user_input)
+            if answer is not None:
+                return {"answer": answer}
+        
+        rag_chain = await asyncio.to_thread(getattr, self, "_rag_chain")
+        result = await rag_chain.ainvoke({
+            "input": user_input
+        })
+        
+        if cache is not None and result.get("answer"):
+            await asyncio.to_thread(cache.store, user_input, result["answer"], embedding)
+        
+        return result
+    
+    async def process_message(self, user_input, use_rag=True):
+        """
+        사용자 메시지 처리
+        
+        보이스피싱 감지와 감정 분석은 스레드에서 동시에 실행하고, RAG 응답은
+        감지 결과를 기다리지 않고 미리 요청한 뒤 보이스피싱 의심 시 취소합니다.
+        
+        Args:
+            user_input (str): 사용자 입력
+            use_rag (bool, optional): RAG 사용 여부. 기본값은 True
+            
+        Returns:
+            str: AI 응답
+        """
+        if not user_input or len(user_input.strip()) == 0:
+            return "메시지가 비어있습니다. 질문이나 대화를 입력해주세요."
+        
+        start_time = time.time()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("사용자 메시지 처리 중: '%s...'", user_input[:50])
+        
+        # 대화 기록에 추가
+        self._append_history(user_input)
+        
+        # RAG 응답 미리 요청 (대화 메모리를 쓰지 않는 RAG 체인만 추측 실행)
+        rag_task = None
+        # 첫 접근 시 Chroma 인덱스를 로드하므로 이벤트 루프를 막지 않도록 스레드에서 가져옴
+        retriever = await asyncio.to_thread(getattr, self, "retriever") if use_rag else None
+        if retriever:
+            rag_task = asyncio.create_task(self._invoke_rag_chain(user_input))
+        
+        # 보이스피싱 감지 및 감정 분석 동시 실행
+        phishing_result, emotion_result = await asyncio.gather(
+            asyncio.to_thread(self._detect_phishing, user_input),
+            asyncio.to_thread(self._analyze_emotion, user_input)
+        )
         
         # 위험도가 높은 보이스피싱 감지 시
         if phishing_result.get("is_phishing", False):
             level = phishing_result.get("risk_level", "unknown")
             if level in ["high", "medium"]:
+                # 미리 요청한 RAG 응답 취소
+                if rag_task:
+                    rag_task.cancel()
+                    await asyncio.gather(rag_task, return_exceptions=True)
+                
                 warning = f"⚠️ 주의: 이 대화에서 보이스피싱 의심 징후가 감지되었습니다! ({phishing_result['score']:.2f}점)\n\n"
                 warning += f"{phishing_result['explanation']}\n\n"
                 warning += "개인정보나 금융정보를 제공하지 마시고, 의심스러운 요청은 해당 기관에 직접 문의하세요."
                 
-                logger.warning(f"보이스피싱 의심 감지: {phishing_result['score']:.2f}점, {level} 위험")
+                logger.warning("보이스피싱 의심 감지: %.2f점, %s 위험", phishing_result['score'], level)
                 
                 # 로깅 및 응답
                 processing_time = time.time() - start_time
-                app_logger.log_conversation(
+                self._enqueue_log(
+                    "conversation",
                     user_input, 
                     warning, 
                     {
@@ -120,18 +384,15 @@ class BokdoriAI:
                 )
                 
                 # 대화 기록에 응답 추가
-                self.conversation_history.append(warning)
+                self._append_history(warning)
                 
                 return warning
         
         try:
             # RAG 또는 일반 대화 처리
-            if use_rag and self.retriever:
-                # RAG 체인으로 처리 - 최신 LangChain API 사용
-                rag_chain = self.chain_manager.get_rag_chain(self.retriever)
-                result = rag_chain.invoke({
-                    "input": user_input
-                })
+            if rag_task:
+                # RAG 체인으로 처리 - 미리 요청한 응답 대기
+                result = await rag_task
                 
                 ai_response = result.get("answer", "")
                 if not ai_response:  # 'answer' 키가 없거나 비어있으면 다른 키 확인
@@ -149,7 +410,7 @@ class BokdoriAI:
             else:
                 # 일반 대화 체인으로 처리
                 conversation_chain = self.chain_manager.get_conversation_chain()
-                result = conversation_chain.invoke({
+                result = await conversation_chain.ainvoke({
                     "input": user_input
                 })
                 
@@ -161,7 +422,8 @@ class BokdoriAI:
             
             # 처리 시간 측정
             processing_time = time.time() - start_time
-            logger.info(f"메시지 처리 완료: {format_time(processing_time)}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("메시지 처리 완료: %s", format_time(processing_time))
             
             # 응답 감정 분석 (사용자의 감정에 맞춘 응답 조정 가능)
             emotion_category = emotion_result.get("emotion_category", "neutral")
@@ -175,7 +437,8 @@ class BokdoriAI:
             final_response = ai_response + emotion_response
             
             # 대화 및 감정 로깅
-            app_logger.log_conversation(
+            self._enqueue_log(
+                "conversation",
                 user_input,
                 final_response,
                 {
@@ -187,11 +450,12 @@ class BokdoriAI:
             )
             
             # 대화 기록에 응답 추가
-            self.conversation_history.append(final_response)
+            self._append_history(final_response)
             
             # 알림 확인 (일정 주기로 실행, 여기서는 10번째 메시지마다)
-            if len(self.conversation_history) % 10 == 0:
-                self._check_alerts()
+            if self._turn % 10 == 0:
+                # 로그 기록 대기와 알림 파일 읽기/쓰기는 블로킹 작업이므로 스레드에서 실행
+                await asyncio.to_thread(self._check_alerts)
             
             return final_response
         
@@ -203,7 +467,8 @@ class BokdoriAI:
             
             # 대화 로깅
             processing_time = time.time() - start_time
-            app_logger.log_conversation(
+            self._enqueue_log(
+                "conversation",
                 user_input, 
                 error_response, 
                 {
@@ -213,12 +478,25 @@ class BokdoriAI:
             )
             
             # 대화 기록에 응답 추가
-            self.conversation_history.append(error_response)
+            self._append_history(error_response)
             
             return error_response
     
+    def _append_history(self, entry):
+        """
+        대화 기록에 항목 추가
+        
+        Args:
+            entry (str): 사용자 메시지 또는 응답
+        """
+        self.conversation_history.append(entry)
+        self._turn += 1
+    
     def _check_alerts(self):
         """알림 확인 및 처리"""
+        # 알림은 감정 로그 파일을 읽으므로 대기 중인 로그를 먼저 기록
+        self.flush_logs()
+        
         alerts = self.alert_manager.check_all_alerts()
         
         for alert in alerts:
@@ -238,54 +516,57 @@ class BokdoriAI:
         Returns:
             int: 추가된 문서 수
         """
-        documents = []
+        # 파일별 문서 생성기 (분할/색인과 함께 진행되어 전체 문서를 메모리에 모아두지 않음)
+        sources = []
         
         # 파일 로드
         if file_paths:
+            valid_paths = []
             for file_path in file_paths:
                 if os.path.exists(file_path):
-                    logger.info(f"파일 로드 중: {file_path}")
-                    docs = load_document(file_path)
-                    documents.extend(docs)
+                    valid_paths.append(file_path)
                 else:
                     logger.warning(f"파일을 찾을 수 없음: {file_path}")
+            
+            logger.info(f"파일 {len(valid_paths)}개 로드 중")
+            sources.append(iter_load_documents(valid_paths))
         
         # 디렉토리 로드
         if directory_path:
             if os.path.exists(directory_path) and os.path.isdir(directory_path):
                 logger.info(f"디렉토리 로드 중: {directory_path}")
-                docs = load_directory(directory_path)
-                documents.extend(docs)
+                sources.append(load_directory(directory_path))
             else:
                 logger.warning(f"디렉토리를 찾을 수 없음: {directory_path}")
         
-        if not documents:
-            logger.warning("추가할 문서가 없습니다.")
-            return 0
-        
         # 청크 크기 및 중복 설정
         rag_config = self.config.get("rag", {})
         chunk_size = rag_config.get("chunk_size", 1000)
         chunk_overlap = rag_config.get("chunk_overlap", 200)
         
-        # 문서 분할
-        logger.info(f"문서 분할 중: {len(documents)} 문서, 청크 크기: {chunk_size}, 중복: {chunk_overlap}")
-        chunked_documents = split_documents(documents, chunk_size, chunk_overlap)
+        batch_size = rag_config.get("ingest_batch_size", 512)
+        
+        # 문서 로드, 분할, Chroma DB 추가를 배치 단위로 함께 진행
+        logger.info(f"문서 분할 및 추가 중: 청크 크기: {chunk_size}, 중복: {chunk_overlap}")
+        documents = chain.from_iterable(sources)
+        chunks = iter_split_documents(documents, chunk_size, chunk_overlap)
+        db, chunk_count = self.chroma_manager.add_document_batches(chunks, batch_size)
         
-        # Chroma DB에 추가
-        logger.info(f"Chroma DB에 문서 추가 중: {len(chunked_documents)} 청크")
-        db = self.chroma_manager.add_documents(chunked_documents)
+        if not chunk_count:
+            logger.warning("추가할 문서가 없습니다.")
+            return 0
         
         # 검색기 갱신
-        self.retriever = get_retriever(self.config)
+        self._refresh_retriever()
         
-        logger.info(f"문서 추가 완료: {len(chunked_documents)} 청크")
-        return len(chunked_documents)
+        logger.info(f"문서 추가 완료: {chunk_count} 청크")
+        return chunk_count
     
     def reset_conversation(self):
         """대화 기록 초기화"""
         logger.info("대화 기록 초기화")
-        self.conversation_history = []
+        self.conversation_history.clear()
+        self._turn = 0
         self.chain_manager.clear_memory()
         return "대화 기록이 초기화되었습니다."
     
@@ -296,39 +577,52 @@ class BokdoriAI:
         
         if result:
             # 검색기 갱신
-            self.retriever = get_retriever(self.config)
+            self._refresh_retriever()
             return "지식 베이스가 초기화되었습니다."
         else:
             return "지식 베이스 초기화 중 오류가 발생했습니다."
     
+    def _save_emotion_report(self):
+        """
+        주간 감정 보고서 생성 및 저장
+        
+        Returns:
+            str: 저장된 파일 경로
+        """
+        emotion_report = self.emotion_monitor.generate_weekly_report()
+        return self.emotion_monitor.save_weekly_report(emotion_report)
+    
     def generate_weekly_reports(self):
         """주간 보고서 생성"""
         logger.info("주간 보고서 생성 중...")
         
-        reports = {}
+        # 대기 중인 로그를 먼저 기록
+        self.flush_logs()
         
-        # 감정 보고서
-        try:
-            emotion_report = self.emotion_monitor.generate_weekly_report()
-            report_path = self.emotion_monitor.save_weekly_report(emotion_report)
-            reports["emotion"] = report_path
-            logger.info(f"감정 보고서 생성 완료: {report_path}")
-        except Exception as e:
-            logger.error(f"감정 보고서 생성 실패: {e}")
+        today = datetime.now()
+        week_ago = today - timedelta(days=7)
         
-        # 대화 보고서
-        try:
-            today = datetime.now()
-            week_ago = today - timedelta(days=7)
-            
-            report_path = self.log_exporter.generate_conversation_report(
-                week_ago.strftime('%Y-%m-%d'),
-                today.strftime('%Y-%m-%d')
-            )
-            reports["conversation"] = report_path
-            logger.info(f"대화 보고서 생성 완료: {report_path}")
-        except Exception as e:
-            logger.error(f"대화 보고서 생성 실패: {e}")
+        # 감정 보고서와 대화 보고서는 서로 독립적이므로 동시에 생성
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {
+                "emotion": executor.submit(self._save_emotion_report),
+                "conversation": executor.submit(
+                    self.log_exporter.generate_conversation_report,
+                    week_ago.strftime('%Y-%m-%d'),
+                    today.strftime('%Y-%m-%d')
+                )
+            }
+        
+        labels = {"emotion": "감정", "conversation": "대화"}
+        
+        reports = {}
+        for report_type, future in futures.items():
+            try:
+                report_path = future.result()
+                reports[report_type] = report_path
+                logger.info(f"{labels[report_type]} 보고서 생성 완료: {report_path}")
+            except Exception as e:
+                logger.error(f"{labels[report_type]} 보고서 생성 실패: {e}")
         
         return reports
 
@@ -347,6 +641,9 @@ class BokdoriAI:
         """
         logger.info(f"{log_type} 로그 내보내기 중: {start_date} ~ {end_date}, 형식: {format}")
         
+        # 대기 중인 로그를 먼저 기록
+        self.flush_logs()
+        
         if format.lower() == "csv":
             return self.log_exporter.export_to_csv(log_type, start_date, end_date)
         else:
@@ -363,41 +660,52 @@ def interactive_mode():
     # 복도리 AI 초기화
     bokdori = BokdoriAI()
     
-    while True:
-        try:
-            # 사용자 입력 받기
-            user_input = input("\n사용자 > ")
+    # 메시지 처리용 이벤트 루프 (세션 동안 재사용)
+    loop = uvloop.new_event_loop() if use_uvloop else asyncio.new_event_loop()
+    
+    try:
+        while True:
+            try:
+                # 사용자 입력 받기
+                user_input = input("\n사용자 > ")
+                
+                # 종료 명령 확인
+                if user_input.lower() in ["exit", "quit", "종료"]:
+                    print("복도리 AI 비서를 종료합니다.")
+                    break
+                
+                # 특수 명령 처리
+                if user_input.lower() == "reset":
+                    print("복도리 > " + bokdori.reset_conversation())
+                    continue
+                
+                if user_input.lower() == "report":
+                    reports = bokdori.generate_weekly_reports()
+                    print("복도리 > 주간 보고서가 생성되었습니다:")
+                    for report_type, path in reports.items():
+                        print(f"  - {report_type}: {path}")
+                    continue
+                
+                # 메시지 처리
+                response = loop.run_until_complete(bokdori.process_message(user_input))
+                
+                # 응답 출력
+                print("복도리 > " + response)
             
-            # 종료 명령 확인
-            if user_input.lower() in ["exit", "quit", "종료"]:
-                print("복도리 AI 비서를 종료합니다.")
+            except KeyboardInterrupt:
+                print("\n복도리 AI 비서를 종료합니다.")
                 break
             
-            # 특수 명령 처리
-            if user_input.lower() == "reset":
-                print("복도리 > " + bokdori.reset_conversation())
-                continue
-            
-            if user_input.lower() == "report":
-                reports = bokdori.generate_weekly_reports()
-                print("복도리 > 주간 보고서가 생성되었습니다:")
-                for report_type, path in reports.items():
-                    print(f"  - {report_type}: {path}")
-                continue
-            
-            # 메시지 처리
-            response = bokdori.process_message(user_input)
-            
-            # 응답 출력
-            print("복도리 > " + response)
-        
-        except KeyboardInterrupt:
-            print("\n복도리 AI 비서를 종료합니다.")
-            break
-        
-        except Exception as e:
-            logger.error(f"예상치 못한 오류 발생: {e}")
-            print(f"복도리 > 오류가 발생했습니다: {e}")
+            except Exception as e:
+                logger.error(f"예상치 못한 오류 발생: {e}")
+                print(f"복도리 > 오류가 발생했습니다: {e}")
+    finally:
+        # 비동기 연결 풀은 메시지를 처리한 루프에서 닫은 뒤 루프 종료
+        loop.run_until_complete(bokdori.aclose())
+        loop.close()
+        
+        # 종료 전 대기 중인 로그 기록 및 HTTP 연결 풀 닫기
+        bokdori.close()
 
 
 def add_documents_mode(file_paths=None, directory_path=None):
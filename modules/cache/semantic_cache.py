@@ -0,0 +1,140 @@
+import time
+import uuid
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """질문 임베딩이 충분히 비슷하면 이전 답변을 재사용하는 시맨틱 캐시 (Chroma 컬렉션에 저장)"""
+    
+    def __init__(self, embedding_model, client, config=None):
+        """
+        SemanticCache 초기화
+        
+        Args:
+            embedding_model (Embeddings): 질문 임베딩에 사용할 모델
+            client (ChromaManager): 캐시 컬렉션을 만들 객체 (get_or_create_collection/delete_collection 제공)
+            config (dict, optional): 캐시 설정. 기본값은 None
+        """
+        self.config = config or {}
+        self.embedding_model = embedding_model
+        self.client = client
+        
+        self.collection_name = self.config.get("collection_name", "bokdori_qa_cache")
+        
+        # 코사인 유사도가 이 값 이상이면 같은 질문으로 간주
+        self.threshold = self.config.get("threshold", 0.92)
+        
+        # 캐시 항목 유효 시간 (초)
+        self.ttl_seconds = self.config.get("ttl_seconds", 86400)
+        
+        # 이 횟수만큼 저장할 때마다 만료된 항목 정리
+        self.sweep_every = self.config.get("sweep_every", 100)
+        
+        self._collection = None
+        self._lock = threading.Lock()
+        self._stores = 0
+        
+        logger.info(f"SemanticCache 초기화 완료: collection={self.collection_name}, threshold={self.threshold}")
+    
+    @property
+    def collection(self):
+        """캐시 컬렉션 (처음 사용할 때 생성, 코사인 거리 사용)"""
+        with self._lock:
+            if self._collection is None:
+                self._collection = self.client.get_or_create_collection(
+                    name=self.collection_name,
+                    metadata={"hnsw:space": "cosine"}
+                )
+            return self._collection
+    
+    def lookup(self, question):
+        """
+        비슷한 질문의 캐시된 답변 조회
+        
+        Args:
+            question (str): 사용자 질문
+        
+        Returns:
+            tuple: (캐시된 답변 또는 None, 질문 임베딩 또는 None (store에서 재사용))
+        """
+        try:
+            embedding = self.embedding_model.embed_query(question)
+        except Exception as e:
+            logger.error(f"시맨틱 캐시 임베딩 실패: {e}")
+            return None, None
+        
+        try:
+            result = self.collection.query(
+                query_embeddings=[embedding],
+                n_results=1,
+                include=["metadatas", "distances"]
+            )
+            
+            if not result["ids"] or not result["ids"][0]:
+                return None, embedding
+            
+            distance = result["distances"][0][0]
+            metadata = result["metadatas"][0][0] or {}
+            
+            # 코사인 거리 = 1 - 코사인 유사도
+            if 1 - distance < self.threshold:
+                return None, embedding
+            
+            if time.time() - metadata.get("created_at", 0) > self.ttl_seconds:
+                return None, embedding
+            
+            logger.debug(f"시맨틱 캐시 적중: 유사도={1 - distance:.3f}")
+            return metadata.get("answer"), embedding
+        
+        except Exception as e:
+            logger.error(f"시맨틱 캐시 조회 실패: {e}")
+            return None, embedding
+    
+    def store(self, question, answer, embedding=None):
+        """
+        질문과 답변을 캐시에 저장
+        
+        Args:
+            question (str): 사용자 질문
+            answer (str): 생성된 답변
+            embedding (list, optional): lookup에서 계산한 질문 임베딩. 기본값은 None (다시 계산)
+        """
+        try:
+            if embedding is None:
+                embedding = self.embedding_model.embed_query(question)
+            
+            self.collection.add(
+                ids=[str(uuid.uuid4())],
+                embeddings=[embedding],
+                documents=[question],
+                metadatas=[{"answer": answer, "created_at": time.time()}]
+            )
+            
+            self._stores += 1
+            if self.sweep_every and self._stores % self.sweep_every == 0:
+                self.sweep()
+        
+        except Exception as e:
+            logger.error(f"시맨틱 캐시 저장 실패: {e}")
+    
+    def sweep(self):
+        """유효 시간이 지난 캐시 항목 삭제"""
+        try:
+            self.collection.delete(where={"created_at": {"$lt": time.time() - self.ttl_seconds}})
+            logger.debug("시맨틱 캐시 만료 항목 정리 완료")
+        except Exception as e:
+            logger.error(f"시맨틱 캐시 정리 실패: {e}")
+    
+    def clear(self):
+        """캐시 전체 삭제 (지식 베이스가 바뀌어 이전 답변이 맞지 않을 수 있을 때)"""
+        try:
+            # 아직 만들지 않은 컬렉션도 지울 수 있도록 먼저 가져옴
+            self.collection
+            with self._lock:
+                self.client.delete_collection(self.collection_name)
+                self._collection = None
+            logger.info("시맨틱 캐시 초기화 완료")
+        except Exception as e:
+            logger.error(f"시맨틱 캐시 초기화 실패: {e}")
@@ -1,22 +1,32 @@
 import os
-import json
+import glob
+import mmap
+import sqlite3
 import logging
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import datetime
+import numpy as np
 
 # 로컬 모듈 임포트
-from modules.emotion.trend_monitor import EmotionTrendMonitor
+from modules.emotion.trend_monitor import CATEGORY_NAMES, EmotionTrendMonitor
+from modules.utils.helpers import from_json, recent_dates, to_json_line
 
 logger = logging.getLogger(__name__)
 
+# 하루(밀리초)
+DAY_MS = 24 * 60 * 60 * 1000
+
 class AlertManager:
     """감정 기반 알림을 관리하는 클래스"""
     
-    def __init__(self, alerts_dir="logs/alerts"):
+    def __init__(self, alerts_dir="logs/alerts", use_index=True):
         """
         AlertManager 초기화
         
         Args:
             alerts_dir (str): 알림 로그 디렉토리
+            use_index (bool, optional): SQLite 알림 인덱스 사용 여부. 기본값은 True
         """
         self.alerts_dir = alerts_dir
         self.emotion_monitor = EmotionTrendMonitor()
@@ -24,6 +34,13 @@ class AlertManager:
         # 알림 로그 디렉토리 생성
         os.makedirs(alerts_dir, exist_ok=True)
         
+        # 최근 알림 조회용 인덱스 (실패 시 파일 검색으로 대체)
+        self._index_lock = threading.Lock()
+        self._index = self._open_index() if use_index else None
+        
+        # 파일 검색 시 파일별 유형당 최근 알림 캐시 {경로: (수정 시각, 크기, {유형: 알림})}
+        self._file_latest = {}
+        
         logger.info(f"AlertManager 초기화 완료: {alerts_dir}")
     
     def check_depression_alert(self):
@@ -44,14 +61,16 @@ class AlertManager:
         last_alert = self._get_last_alert("depression")
         
         # 최근 3일 이내에 알림을 보낸 경우 중복 방지
-        if last_alert and (datetime.now() - datetime.fromisoformat(last_alert["timestamp"])).days < 3:
+        now_ms = int(time.time() * 1000)
+        if last_alert and now_ms - self._alert_epoch(last_alert) < 3 * DAY_MS:
             logger.info(f"최근에 우울증 알림이 이미 전송됨: {last_alert['timestamp']}")
             return None
         
         # 알림 생성
         alert = {
             "type": "depression",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.fromtimestamp(now_ms / 1000).isoformat(),
+            "ts_epoch": now_ms,
             "severity": "warning",
             "message": "지난 7일 동안 지속적인 부정적 감정이 감지되었습니다. 사용자의 상태를 확인해 주세요.",
             "details": {
@@ -73,29 +92,26 @@ class AlertManager:
         Returns:
             dict: 알림 정보 (필요 시)
         """
-        # 최근 3일 로그 로드
-        logs = self.emotion_monitor.load_emotion_logs(days=3)
+        # 최근 3일 로그 로드 (정렬은 아래에서 정수 시각으로 처리)
+        logs = self.emotion_monitor.load_emotion_logs(days=3, sort=False)
         
         if len(logs) < 2:
             # 로그가 충분하지 않으면 패스
             return None
         
-        # 로그를 시간순으로 정렬
-        logs.sort(key=lambda x: x.get('timestamp', ''))
+        # (시각, 카테고리) 배열에서 가장 최근 두 개의 로그 위치 찾기
+        arr = self.emotion_monitor.to_category_array(logs)
+        previous_idx, latest_idx = np.argsort(arr["ts"], kind="stable")[-2:]
         
-        # 최근 두 개의 로그 비교
-        latest = logs[-1]
-        previous = logs[-2]
+        latest = logs[latest_idx]
+        previous = logs[previous_idx]
         
         # 감정 카테고리 확인
-        latest_category = latest.get("emotion_category", "neutral")
-        previous_category = previous.get("emotion_category", "neutral")
+        latest_category = CATEGORY_NAMES[arr["cat"][latest_idx]]
+        previous_category = CATEGORY_NAMES[arr["cat"][previous_idx]]
         
         # 긍정 -> 부정 또는 부정 -> 긍정으로 급변한 경우
-        significant_change = (
-            (latest_category == "negative" and previous_category == "positive") or
-            (latest_category == "positive" and previous_category == "negative")
-        )
+        significant_change = {latest_category, previous_category} == {"negative", "positive"}
         
         if not significant_change:
             return None
@@ -104,7 +120,8 @@ class AlertManager:
         last_alert = self._get_last_alert("emotion_change")
         
         # 최근 1일 이내에 알림을 보낸 경우 중복 방지
-        if last_alert and (datetime.now() - datetime.fromisoformat(last_alert["timestamp"])).days < 1:
+        now_ms = int(time.time() * 1000)
+        if last_alert and now_ms - self._alert_epoch(last_alert) < DAY_MS:
             return None
         
         # 알림 생성
@@ -113,7 +130,8 @@ class AlertManager:
         
         alert = {
             "type": "emotion_change",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.fromtimestamp(now_ms / 1000).isoformat(),
+            "ts_epoch": now_ms,
             "severity": "info",
             "message": message,
             "details": {
@@ -131,6 +149,65 @@ class AlertManager:
         logger.info(f"감정 변화 알림이 생성되었습니다: {change_type}")
         return alert
     
+    def _open_index(self):
+        """
+        알림 인덱스(SQLite) 열기
+        
+        Returns:
+            sqlite3.Connection: DB 연결 또는 None (실패 시)
+        """
+        db_path = os.path.join(self.alerts_dir, "alerts.db")
+        
+        try:
+            is_new = not os.path.exists(db_path)
+            
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS alerts ("
+                "type TEXT NOT NULL, timestamp TEXT NOT NULL, payload BLOB NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_alerts_type_timestamp "
+                "ON alerts (type, timestamp DESC)"
+            )
+            
+            # 새 인덱스면 기존 알림 로그 파일 가져오기
+            if is_new:
+                self._import_alert_files(conn)
+            
+            conn.commit()
+            return conn
+        
+        except sqlite3.Error as e:
+            logger.error(f"알림 인덱스 열기 실패: {db_path}, {e}. 파일 검색을 사용합니다.")
+            return None
+    
+    def _import_alert_files(self, conn):
+        """
+        기존 알림 로그 파일을 인덱스에 추가
+        
+        Args:
+            conn (sqlite3.Connection): DB 연결
+        """
+        count = 0
+        for log_file in sorted(glob.glob(os.path.join(self.alerts_dir, "*_alerts.json*"))):
+            try:
+                for alert in self._read_alert_file(log_file):
+                    # 이전 알림도 중복 확인 시 다시 파싱하지 않도록 epoch 시각 저장
+                    alert.setdefault("ts_epoch", self._alert_epoch(alert))
+                    conn.execute(
+                        "INSERT INTO alerts (type, timestamp, payload) VALUES (?, ?, ?)",
+                        (alert.get("type", ""), alert.get("timestamp", ""), to_json_line(alert))
+                    )
+                    count += 1
+            except Exception as e:
+                logger.error(f"알림 로그 파일 가져오기 실패: {log_file}, {e}")
+        
+        if count:
+            logger.info(f"기존 알림 {count}개를 인덱스에 추가했습니다.")
+    
     def _get_last_alert(self, alert_type):
         """
         특정 유형의 최근 알림 조회
@@ -142,43 +219,164 @@ class AlertManager:
             dict: 최근 알림 정보 또는 None
         """
         # 최근 일주일 알림 로그 확인
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=7)
-        
-        alerts = []
+        dates = recent_dates(7)
+        
+        if self._index is not None:
+            try:
+                with self._index_lock:
+                    row = self._index.execute(
+                        "SELECT payload FROM alerts WHERE type = ? AND timestamp >= ? "
+                        "ORDER BY timestamp DESC LIMIT 1",
+                        (alert_type, dates[0])
+                    ).fetchone()
+                return from_json(row[0]) if row else None
+            except sqlite3.Error as e:
+                logger.error(f"알림 인덱스 조회 실패: {e}. 파일 검색을 사용합니다.")
+        
+        latest = None
+        latest_epoch = None
         
         # 날짜별 파일 검사
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime('%Y-%m-%d')
-            log_file = os.path.join(self.alerts_dir, f"{date_str}_alerts.json")
-            
-            if os.path.exists(log_file):
+        for date_str in dates:
+            # JSONL 파일 및 이전 형식(JSON 배열) 파일 확인
+            for log_file in (
+                os.path.join(self.alerts_dir, f"{date_str}_alerts.jsonl"),
+                os.path.join(self.alerts_dir, f"{date_str}_alerts.json")
+            ):
+                if not os.path.exists(log_file):
+                    continue
+                
                 try:
-                    with open(log_file, 'r', encoding='utf-8') as f:
-                        day_alerts = json.load(f)
-                    
-                    # 리스트가 아니면 리스트로 변환
-                    if not isinstance(day_alerts, list):
-                        day_alerts = [day_alerts]
-                    
-                    # 특정 유형의 알림만 필터링
-                    filtered_alerts = [a for a in day_alerts if a.get("type") == alert_type]
-                    alerts.extend(filtered_alerts)
+                    if log_file.endswith('.jsonl'):
+                        alert = self._find_last_in_jsonl(log_file, alert_type)
+                    else:
+                        alert = self._latest_in_file(log_file).get(alert_type)
                 except Exception as e:
                     logger.error(f"알림 로그 파일 로드 실패: {log_file}, {e}")
+                    continue
+                
+                # 정수 시각 비교로 가장 최근 알림 선택
+                if alert is not None and (latest_epoch is None or alert["ts_epoch"] > latest_epoch):
+                    latest = alert
+                    latest_epoch = alert["ts_epoch"]
+        
+        # 가장 최근 알림 반환
+        return latest
+    
+    def _find_last_in_jsonl(self, log_file, alert_type):
+        """
+        JSONL 알림 파일을 끝에서부터 검색하여 특정 유형의 마지막 알림 조회
+        
+        Args:
+            log_file (str): JSONL 알림 로그 파일 경로
+            alert_type (str): 알림 유형
             
-            current_date += timedelta(days=1)
+        Returns:
+            dict: 마지막 알림 정보 또는 None
+        """
+        if os.path.getsize(log_file) == 0:
+            return None
         
-        # 시간순 정렬
-        alerts.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+        # 압축 형식(orjson)과 공백 포함 형식(json.dumps) 모두 검색
+        type_value = to_json_line(alert_type).rstrip(b"\n")
+        needles = [b'"type":' + type_value, b'"type": ' + type_value]
+        
+        with open(log_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            while end > 0:
+                pos = max(mm.rfind(needle, 0, end) for needle in needles)
+                if pos < 0:
+                    return None
+                
+                # 해당 줄만 잘라서 파싱
+                line_start = mm.rfind(b"\n", 0, pos) + 1
+                line_end = mm.find(b"\n", pos)
+                if line_end < 0:
+                    line_end = len(mm)
+                
+                alert = from_json(mm[line_start:line_end])
+                if isinstance(alert, dict) and alert.get("type") == alert_type:
+                    alert.setdefault("ts_epoch", self._alert_epoch(alert))
+                    return alert
+                
+                # 다른 필드 안에서 일치한 경우 이전 줄부터 다시 검색
+                end = line_start
+        
+        return None
+    
+    def _latest_in_file(self, log_file):
+        """
+        이전 형식(JSON 배열) 알림 파일에서 유형별 최근 알림 조회 (파일이 바뀌지 않았으면 캐시 사용)
         
-        # 가장 최근 알림 반환
-        return alerts[0] if alerts else None
+        Args:
+            log_file (str): 알림 로그 파일 경로
+            
+        Returns:
+            dict: {알림 유형: 최근 알림}
+        """
+        stat = os.stat(log_file)
+        cached = self._file_latest.get(log_file)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        
+        latest = {}
+        for alert in self._read_alert_file(log_file):
+            # 이전 알림은 ts_epoch가 없으므로 한 번만 계산해 둠
+            alert.setdefault("ts_epoch", self._alert_epoch(alert))
+            
+            current = latest.get(alert.get("type"))
+            if current is None or alert["ts_epoch"] > current["ts_epoch"]:
+                latest[alert.get("type")] = alert
+        
+        self._file_latest[log_file] = (stat.st_mtime_ns, stat.st_size, latest)
+        return latest
+    
+    def _alert_epoch(self, alert):
+        """
+        알림 시각(epoch 밀리초) 조회
+        
+        Args:
+            alert (dict): 알림 정보
+            
+        Returns:
+            int: epoch 밀리초 (시각을 알 수 없으면 0)
+        """
+        ts_epoch = alert.get("ts_epoch")
+        if ts_epoch is not None:
+            return ts_epoch
+        
+        # ts_epoch가 없는 이전 형식 알림
+        try:
+            timestamp = datetime.fromisoformat(alert["timestamp"].replace('Z', '+00:00'))
+            return int(timestamp.timestamp() * 1000)
+        except (KeyError, TypeError, ValueError):
+            return 0
+    
+    def _read_alert_file(self, log_file):
+        """
+        알림 로그 파일 읽기 (JSONL 또는 이전 형식의 JSON 배열)
+        
+        Args:
+            log_file (str): 알림 로그 파일 경로
+            
+        Returns:
+            list: 알림 목록
+        """
+        with open(log_file, 'rb') as f:
+            if log_file.endswith('.jsonl'):
+                return [from_json(line) for line in f if line.strip()]
+            
+            day_alerts = from_json(f.read())
+        
+        # 리스트가 아니면 리스트로 변환
+        if not isinstance(day_alerts, list):
+            day_alerts = [day_alerts]
+        
+        return day_alerts
     
     def _save_alert(self, alert):
         """
-        알림 저장
+        알림 저장 (날짜별 JSONL 파일 및 인덱스에 추가)
         
         Args:
             alert (dict): 알림 정보
@@ -187,35 +385,35 @@ class AlertManager:
             bool: 성공 여부
         """
         # 날짜 추출
-        try:
-            timestamp = datetime.fromisoformat(alert["timestamp"].replace('Z', '+00:00'))
-            date_str = timestamp.strftime('%Y-%m-%d')
-        except ValueError:
-            date_str = datetime.now().strftime('%Y-%m-%d')
+        if "ts_epoch" in alert:
+            date_str = time.strftime('%Y-%m-%d', time.localtime(alert["ts_epoch"] / 1000))
+        else:
+            try:
+                timestamp = datetime.fromisoformat(alert["timestamp"].replace('Z', '+00:00'))
+                date_str = timestamp.strftime('%Y-%m-%d')
+            except ValueError:
+                date_str = datetime.now().strftime('%Y-%m-%d')
         
         # 파일 경로
-        log_file = os.path.join(self.alerts_dir, f"{date_str}_alerts.json")
+        log_file = os.path.join(self.alerts_dir, f"{date_str}_alerts.jsonl")
         
         try:
-            # 기존 파일 확인
-            if os.path.exists(log_file):
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    try:
-                        alerts = json.load(f)
-                        # 리스트가 아니면 리스트로 변환
-                        if not isinstance(alerts, list):
-                            alerts = [alerts]
-                    except json.JSONDecodeError:
-                        alerts = []
-            else:
-                alerts = []
+            # 기존 내용을 다시 쓰지 않고 한 줄만 추가
+            line = to_json_line(alert)
+            with open(log_file, 'ab') as f:
+                f.write(line)
             
-            # 알림 추가
-            alerts.append(alert)
-            
-            # 저장
-            with open(log_file, 'w', encoding='utf-8') as f:
-                json.dump(alerts, f, ensure_ascii=False, indent=2)
+            # 인덱스에 추가
+            if self._index is not None:
+                try:
+                    with self._index_lock:
+                        self._index.execute(
+                            "INSERT INTO alerts (type, timestamp, payload) VALUES (?, ?, ?)",
+                            (alert.get("type", ""), alert.get("timestamp", ""), line)
+                        )
+                        self._index.commit()
+                except sqlite3.Error as e:
+                    logger.error(f"알림 인덱스 추가 실패: {e}")
             
             logger.info(f"알림 저장 완료: {log_file}")
             return True
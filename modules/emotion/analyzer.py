@@ -2,14 +2,98 @@ import os
 import json
 import re
 import logging
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import numpy as np
 
+# pyahocorasick이 있으면 한 번의 순회로 모든 키워드 검색
+try:
+    import ahocorasick
+    use_ahocorasick = True
+except ImportError:
+    ahocorasick = None
+    use_ahocorasick = False
+
+# Hyperscan이 있으면 사용 (다중 리터럴 DFA 검색, pyahocorasick이 없을 때)
+try:
+    import hyperscan
+    use_hyperscan = True
+except ImportError:
+    hyperscan = None
+    use_hyperscan = False
+
 # 로컬 모듈 임포트
-from modules.utils.helpers import load_config
+from modules.emotion import kernels
+from modules.utils.helpers import load_config, load_json_file
 
 logger = logging.getLogger(__name__)
 
+# 키워드 주변 맥락 범위 (글자 수)
+CONTEXT_WINDOW = 20
+
+# 트라이 검색을 사용할 최대 텍스트 길이 (더 긴 텍스트는 단어별 str.find가 더 빠름)
+TRIE_SCAN_MAX_TEXT = 200
+
+# 결과를 캐시할 최대 텍스트 길이 (긴 텍스트는 반복될 가능성이 낮음)
+CACHE_MAX_TEXT = 1024
+
+# numba 점수 커널을 사용할 최소 키워드 일치 수 (적으면 배열 변환 비용이 더 큼)
+KERNEL_MIN_MATCHES = 32
+
+# 여러 텍스트를 이어 붙여 검색할 때 사이에 넣는 구분 문자
+BATCH_SEPARATOR = "\x00"
+
+def _is_word_char(char):
+    """
+    정규식 \\w 에 해당하는 문자인지 확인
+    
+    Args:
+        char (str): 문자 한 개
+        
+    Returns:
+        bool: 단어 문자 여부
+    """
+    return char.isalnum() or char == "_"
+
+def _any_within(entries, start, end):
+    """
+    맥락 단어 중 하나라도 [start, end) 구간 안에 완전히 포함되어 출현하는지 확인
+    
+    Args:
+        entries (list): 텍스트에 출현한 단어별 (시작 위치 목록(오름차순), 단어 길이) 목록 (None이면 항상 포함)
+        start (int): 구간 시작
+        end (int): 구간 끝
+        
+    Returns:
+        bool: 포함 여부
+    """
+    if entries is None:
+        return True
+    
+    for positions, term_len in entries:
+        idx = bisect_left(positions, start)
+        if idx < len(positions) and positions[idx] + term_len <= end:
+            return True
+    
+    return False
+
+def _copy_result(result):
+    """
+    분석 결과 복사 (호출자가 결과를 수정해도 캐시에 영향이 없도록)
+    
+    Args:
+        result (dict): 감정 분석 결과
+        
+    Returns:
+        dict: 복사된 결과
+    """
+    copied = dict(result)
+    copied["emotion_scores"] = dict(result["emotion_scores"])
+    copied["keywords"] = list(result["keywords"])
+    return copied
+
 class EmotionAnalyzer:
     """대화 내용에서 감정을 분석하는 클래스"""
     
@@ -25,13 +109,21 @@ class EmotionAnalyzer:
         # 감정 패턴 로드
         self.patterns = self._load_emotion_patterns()
         
-        # 감정 분류
+        # 감정 분류 (소속 확인용 집합)
         self.emotion_categories = {
-            "positive": ["기쁨", "행복", "만족", "흥미", "기대", "사랑"],
-            "negative": ["슬픔", "분노", "불안", "공포", "우울", "절망", "실망"],
-            "neutral": ["평온", "무관심", "집중", "고요"]
+            "positive": frozenset(["기쁨", "행복", "만족", "흥미", "기대", "사랑"]),
+            "negative": frozenset(["슬픔", "분노", "불안", "공포", "우울", "절망", "실망"]),
+            "neutral": frozenset(["평온", "무관심", "집중", "고요"])
         }
         
+        # 키워드/수정자/부정어 검색기 준비
+        self._build_matcher()
+        
+        # 분석 결과 캐시 (LRU)
+        self._cache = OrderedDict()
+        self._cache_size = self.config.get("emotion_analysis", {}).get("cache_size", 4096)
+        self._cache_lock = threading.Lock()
+        
         logger.info("EmotionAnalyzer 초기화 완료")
     
     def _load_emotion_patterns(self):
@@ -62,8 +154,7 @@ class EmotionAnalyzer:
         
         try:
             if os.path.exists(patterns_path):
-                with open(patterns_path, 'r', encoding='utf-8') as f:
-                    patterns = json.load(f)
+                patterns = load_json_file(patterns_path)
                 
                 logger.info(f"감정 패턴 로드 완료: {patterns_path}")
                 return patterns
@@ -87,6 +178,329 @@ class EmotionAnalyzer:
         except Exception as e:
             logger.error(f"기본 감정 패턴 저장 실패: {e}")
     
+    def reload_patterns(self):
+        """
+        감정 패턴 파일을 다시 읽고 검색기와 분석 결과 캐시 초기화
+        """
+        self.patterns = self._load_emotion_patterns()
+        self._build_matcher()
+        
+        with self._cache_lock:
+            self._cache.clear()
+        
+        logger.info("감정 패턴 다시 로드 완료")
+    
+    def _build_matcher(self):
+        """
+        감정 키워드, 강도 수정자, 부정어를 한 번에 찾기 위한 검색기 준비
+        """
+        modifiers = self.patterns["intensity_modifiers"]
+        self._high_modifiers = list(modifiers["high"])
+        self._low_modifiers = list(modifiers["low"])
+        self._negation_words = list(self.patterns["negation_words"])
+        
+        # 맥락 단어 종류별(강한 수정자, 약한 수정자, 부정어) 검색 단어 (빈 단어가 있으면 None = 항상 포함)
+        self._context_classes = [
+            None if "" in terms else list(dict.fromkeys(terms))
+            for terms in (self._high_modifiers, self._low_modifiers, self._negation_words)
+        ]
+        
+        # 감정 이름 목록과 (감정 인덱스, 키워드) 누적 순서
+        self._emotion_names = list(self.patterns["emotions"])
+        self._emotion_keyword_pairs = [
+            (emotion_id, keyword)
+            for emotion_id, keywords in enumerate(self.patterns["emotions"].values())
+            for keyword in keywords
+        ]
+        
+        # 키워드별 감정 목록 (같은 키워드가 여러 감정/여러 번 등록될 수 있음)
+        self._keyword_emotions = {}
+        # 정규식 특수문자가 포함된 키워드는 기존처럼 정규식으로 검색
+        self._regex_keywords = {}
+        
+        for emotion, keywords in self.patterns["emotions"].items():
+            for keyword in keywords:
+                self._keyword_emotions.setdefault(keyword, []).append(emotion)
+                if not keyword or re.escape(keyword) != keyword.replace(" ", "\\ "):
+                    self._regex_keywords[keyword] = re.compile(r'\b' + keyword + r'\w*\b')
+        
+        # 문자열 그대로 검색할 키워드와 맥락 단어(수정자/부정어)
+        self._keyword_terms = [kw for kw in self._keyword_emotions if kw and kw not in self._regex_keywords]
+        keyword_term_set = set(self._keyword_terms)
+        self._context_terms = [
+            term
+            for term in dict.fromkeys(self._high_modifiers + self._low_modifiers + self._negation_words)
+            if term and term not in keyword_term_set
+        ]
+        self._terms = keyword_term_set | set(self._context_terms)
+        
+        # 한 번의 순회로 전체 단어를 검색하는 검색기 (Aho-Corasick > Hyperscan 순서로 사용)
+        # 일치마다 파이썬 콜백이 호출되는 Hyperscan보다 Aho-Corasick 쪽이 짧은 대화문에서 더 빠름
+        self._hs_db = None
+        self._automaton = None
+        if use_ahocorasick and self._terms:
+            self._automaton = ahocorasick.Automaton()
+            for term in self._terms:
+                self._automaton.add_word(term, term)
+            self._automaton.make_automaton()
+        elif use_hyperscan and self._terms:
+            self._build_hyperscan()
+        
+        # 외부 검색기가 없을 때 사용할 문자 단위 트라이 {문자: {...}, None: 단어}
+        self._trie = {}
+        for term in self._terms:
+            node = self._trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[None] = term
+    
+    def _scans_all_terms(self, text_len):
+        """
+        _find_occurrences가 terms와 관계없이 전체 단어를 한 번에 검색하는지 여부
+        
+        Args:
+            text_len (int): 텍스트 길이
+            
+        Returns:
+            bool: 전체 단어 검색 여부
+        """
+        return self._hs_db is not None or self._automaton is not None or text_len <= TRIE_SCAN_MAX_TEXT
+    
+    def _build_hyperscan(self):
+        """
+        전체 검색 단어로 Hyperscan 데이터베이스 생성
+        
+        텍스트는 UTF-32-LE로 인코딩해 검색하므로 바이트 위치를 4로 나누면 문자 위치가 됩니다.
+        """
+        self._hs_terms = sorted(self._terms)
+        
+        # 바이트 단위 리터럴 패턴 (정규식 특수문자가 없도록 모든 바이트를 \xHH로 표기)
+        expressions = [
+            b"".join(b"\\x%02x" % byte for byte in term.encode("utf-32-le"))
+            for term in self._hs_terms
+        ]
+        
+        try:
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=[0] * len(expressions)
+            )
+            self._hs_db = db
+            self._hs_local = threading.local()
+        except Exception as e:
+            logger.error(f"Hyperscan 데이터베이스 생성 실패: {e}. 다른 검색 방식을 사용합니다.")
+            self._hs_db = None
+    
+    def _find_occurrences(self, text, terms):
+        """
+        검색 대상 단어의 모든 출현 위치 찾기 (겹치는 출현 포함)
+        
+        Hyperscan/Aho-Corasick 검색기가 있거나 텍스트가 짧으면(트라이 검색)
+        terms와 관계없이 전체 단어를 한 번에 검색합니다.
+        
+        Args:
+            text (str): 소문자로 변환된 텍스트
+            terms (list): 검색할 단어 목록
+            
+        Returns:
+            dict: {단어: 시작 위치 목록 (오름차순)}
+        """
+        occurrences = {}
+        
+        if self._hs_db is not None:
+            # 스크래치 공간은 스레드별로 생성
+            scratch = getattr(self._hs_local, "scratch", None)
+            if scratch is None:
+                scratch = self._hs_local.scratch = hyperscan.Scratch(self._hs_db)
+            
+            hs_terms = self._hs_terms
+            
+            def on_match(term_id, start, end, flags, context):
+                # 문자 경계에 맞지 않는 일치는 무시
+                if end % 4 == 0:
+                    term = hs_terms[term_id]
+                    occurrences.setdefault(term, []).append(end // 4 - len(term))
+            
+            self._hs_db.scan(text.encode("utf-32-le"), match_event_handler=on_match, scratch=scratch)
+            return occurrences
+        
+        if self._automaton is not None:
+            for end_idx, term in self._automaton.iter(text):
+                occurrences.setdefault(term, []).append(end_idx - len(term) + 1)
+            return occurrences
+        
+        text_len = len(text)
+        if text_len <= TRIE_SCAN_MAX_TEXT:
+            # 각 위치에서 트라이를 따라가며 그 위치에서 시작하는 단어를 모두 찾음
+            trie = self._trie
+            for i in range(text_len):
+                node = trie.get(text[i])
+                j = i + 1
+                while node is not None:
+                    term = node.get(None)
+                    if term is not None:
+                        occurrences.setdefault(term, []).append(i)
+                    if j >= text_len:
+                        break
+                    node = node.get(text[j])
+                    j += 1
+            return occurrences
+        
+        for term in terms:
+            pos = text.find(term)
+            while pos != -1:
+                occurrences.setdefault(term, []).append(pos)
+                pos = text.find(term, pos + 1)
+        
+        return occurrences
+    
+    def _keyword_spans(self, text, keyword, starts):
+        """
+        키워드 일치 구간 계산 (r'\\b' + keyword + r'\\w*\\b' 의 finditer 결과와 동일)
+        
+        Args:
+            text (str): 소문자로 변환된 텍스트
+            keyword (str): 감정 키워드
+            starts (list): 키워드 출현 시작 위치 목록
+            
+        Returns:
+            list: (시작, 끝) 위치 목록
+        """
+        if keyword in self._regex_keywords:
+            return [match.span() for match in self._regex_keywords[keyword].finditer(text)]
+        
+        spans = []
+        last_end = 0
+        text_len = len(text)
+        keyword_len = len(keyword)
+        
+        for start in starts or ():
+            if start < last_end:
+                continue
+            
+            # 시작 위치가 단어 경계인지 확인
+            prev_is_word = start > 0 and _is_word_char(text[start - 1])
+            if prev_is_word == _is_word_char(text[start]):
+                continue
+            
+            # 단어 끝까지 확장
+            end = start + keyword_len
+            while end < text_len and _is_word_char(text[end]):
+                end += 1
+            
+            # 확장하지 못했으면 키워드 마지막 글자 뒤가 단어 경계여야 함
+            if end == start + keyword_len and not _is_word_char(text[end - 1]):
+                continue
+            
+            spans.append((start, end))
+            last_end = end
+        
+        return spans
+    
+    def _context_spans(self, occurrences):
+        """
+        맥락 단어 종류별 출현 구간 목록
+        
+        Args:
+            occurrences (dict): 단어별 출현 위치
+            
+        Returns:
+            list: 종류별 (시작, 끝) 위치 목록 (빈 단어가 있는 종류는 None)
+        """
+        context_spans = []
+        for terms in self._context_classes:
+            if terms is None:
+                context_spans.append(None)
+                continue
+            
+            spans = []
+            for term in terms:
+                positions = occurrences.get(term)
+                if positions:
+                    term_len = len(term)
+                    spans.extend((pos, pos + term_len) for pos in positions)
+            context_spans.append(spans)
+        
+        return context_spans
+    
+    def _context_score(self, context_index, start, end, text_len):
+        """
+        키워드 주변 맥락의 강도 수정자/부정어를 반영한 점수 계산
+        
+        Args:
+            context_index (list): 맥락 단어 종류별 출현 단어 목록 (_any_within 입력)
+            start (int): 키워드 일치 시작 위치
+            end (int): 키워드 일치 끝 위치
+            text_len (int): 텍스트 길이
+            
+        Returns:
+            float: 점수
+        """
+        context_start = max(0, start - CONTEXT_WINDOW)
+        context_end = min(text_len, end + CONTEXT_WINDOW)
+        high_index, low_index, negation_index = context_index
+        
+        # 기본 점수
+        score = 1.0
+        
+        # 강도 수정자 확인
+        if _any_within(high_index, context_start, context_end):
+            score *= 1.5
+        
+        if _any_within(low_index, context_start, context_end):
+            score *= 0.7
+        
+        # 부정어 확인
+        if _any_within(negation_index, context_start, context_end):
+            score *= -0.5  # 부정이면 감정 반전 (약화)
+        
+        return score
+    
+    def _accumulate_with_kernel(self, emotion_scores, keyword_spans, occurrences, text_len):
+        """
+        numba 커널로 키워드 일치 점수를 감정별로 누적 (_context_score 누적과 같은 결과)
+        
+        Args:
+            emotion_scores (list): 감정 인덱스별 점수 (누적 결과로 수정됨)
+            keyword_spans (dict): 키워드별 일치 구간
+            occurrences (dict): 단어별 출현 위치
+            text_len (int): 텍스트 길이
+            
+        Returns:
+            dict: 일치한 키워드 (처음 일치한 순서, 중복 없음)
+        """
+        # 기존 누적 순서(감정 -> 키워드 -> 일치)대로 일치 배열 구성
+        starts = []
+        ends = []
+        emotion_ids = []
+        matched_keywords = {}
+        for emotion_id, keyword in self._emotion_keyword_pairs:
+            spans = keyword_spans.get(keyword)
+            if not spans:
+                continue
+            
+            matched_keywords[keyword] = None
+            for start, end in spans:
+                starts.append(start)
+                ends.append(end)
+                emotion_ids.append(emotion_id)
+        
+        # 강도 수정자/부정어 출현 구간 (빈 단어가 있으면 항상 포함)
+        context_spans = self._context_spans(occurrences)
+        
+        sums = kernels.score_matches(
+            starts, ends, emotion_ids, context_spans, (1.5, 0.7, -0.5),
+            text_len, CONTEXT_WINDOW, len(emotion_scores)
+        )
+        
+        for emotion_id in set(emotion_ids):
+            emotion_scores[emotion_id] = float(sums[emotion_id])
+        
+        return matched_keywords
+    
     def analyze_text(self, text):
         """
         텍스트에서 감정 분석
@@ -119,59 +533,188 @@ class EmotionAnalyzer:
                 "confidence": 0.0
             }
         
-        # 감정 점수 초기화
-        emotion_scores = {emotion: 0 for emotion in self.patterns["emotions"].keys()}
+        if len(text) > CACHE_MAX_TEXT:
+            return self._score_text(text)
         
-        # 각 감정에 대한 키워드 검사
-        for emotion, keywords in self.patterns["emotions"].items():
-            for keyword in keywords:
-                # 정규 표현식으로 키워드 검색 (단어 경계 고려)
-                matches = re.finditer(r'\b' + keyword + r'\w*\b', text.lower())
+        # 같은 텍스트는 캐시된 결과 사용 (패턴이 같으면 결과도 같음)
+        with self._cache_lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+        
+        if cached is None:
+            cached = self._score_text(text)
+            with self._cache_lock:
+                self._cache[text] = cached
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        
+        return _copy_result(cached)
+    
+    def analyze_texts(self, texts):
+        """
+        여러 텍스트를 한 번에 감정 분석 (analyze_text를 각각 호출한 결과와 동일)
+        
+        캐시에 없는 텍스트는 구분 문자로 이어 붙여 검색 단어를 한 번만 검색한 뒤
+        일치 위치를 텍스트별로 나누어 점수를 계산합니다.
+        
+        Args:
+            texts (list): 분석할 텍스트 목록
+            
+        Returns:
+            list: 텍스트별 감정 분석 결과
+        """
+        results = [None] * len(texts)
+        pending = {}  # 새로 계산할 텍스트 -> 결과 위치 목록
+        
+        for i, text in enumerate(texts):
+            # 문자열이 아니거나 짧은 텍스트는 기존 경로로 처리
+            if not isinstance(text, str) or len(text) < 3:
+                results[i] = self.analyze_text(text)
+                continue
+            
+            if len(text) <= CACHE_MAX_TEXT:
+                with self._cache_lock:
+                    cached = self._cache.get(text)
+                    if cached is not None:
+                        self._cache.move_to_end(text)
+                if cached is not None:
+                    results[i] = _copy_result(cached)
+                    continue
+            
+            pending.setdefault(text, []).append(i)
+        
+        if not pending:
+            return results
+        
+        # 소문자 텍스트를 구분 문자로 이어 붙여 한 번에 검색
+        # (검색 단어에는 구분 문자가 없으므로 일치 구간이 텍스트 경계를 넘지 않음)
+        pending_texts = list(pending)
+        lowered = [text.lower() for text in pending_texts]
+        offsets = []
+        pos = 0
+        for text_lower in lowered:
+            offsets.append(pos)
+            pos += len(text_lower) + len(BATCH_SEPARATOR)
+        
+        buffer = BATCH_SEPARATOR.join(lowered)
+        per_text = [{} for _ in lowered]
+        for term, starts in self._find_occurrences(buffer, self._terms).items():
+            for start in starts:
+                idx = bisect_right(offsets, start) - 1
+                per_text[idx].setdefault(term, []).append(start - offsets[idx])
+        
+        for text, text_lower, occurrences in zip(pending_texts, lowered, per_text):
+            # 전체 검색 단어를 검색했으므로 맥락 단어를 다시 검색할 필요 없음
+            scored = self._score_occurrences(text_lower, occurrences, True)
+            
+            if len(text) <= CACHE_MAX_TEXT:
+                with self._cache_lock:
+                    self._cache[text] = scored
+                    if len(self._cache) > self._cache_size:
+                        self._cache.popitem(last=False)
+            
+            indices = pending[text]
+            results[indices[0]] = scored if len(text) > CACHE_MAX_TEXT else _copy_result(scored)
+            for i in indices[1:]:
+                results[i] = _copy_result(scored)
+        
+        return results
+    
+    def _score_text(self, text):
+        """
+        키워드 기반 감정 점수 계산
+        
+        Args:
+            text (str): 분석할 텍스트 (3자 이상)
+            
+        Returns:
+            dict: 감정 분석 결과
+        """
+        # 키워드 위치 검색
+        text_lower = text.lower()
+        occurrences = self._find_occurrences(text_lower, self._keyword_terms)
+        return self._score_occurrences(text_lower, occurrences, self._scans_all_terms(len(text_lower)))
+    
+    def _score_occurrences(self, text_lower, occurrences, all_terms_found):
+        """
+        검색 단어 출현 위치로 감정 점수 계산
+        
+        Args:
+            text_lower (str): 소문자로 변환된 텍스트
+            occurrences (dict): 단어별 출현 위치 (수정될 수 있음)
+            all_terms_found (bool): 수정자/부정어 위치까지 검색했는지 여부
+            
+        Returns:
+            dict: 감정 분석 결과
+        """
+        # 감정 점수 초기화 (감정 인덱스 순서)
+        emotion_names = self._emotion_names
+        emotion_scores = [0] * len(emotion_names)
+        text_len = len(text_lower)
+        
+        # 텍스트에 출현한 키워드와 정규식 키워드만 일치 구간 계산 (누적 순서는 아래에서 따로 맞춤)
+        keyword_spans = {}
+        keyword_emotions = self._keyword_emotions
+        candidates = [term for term in occurrences if term in keyword_emotions]
+        candidates.extend(self._regex_keywords)
+        for keyword in candidates:
+            spans = self._keyword_spans(text_lower, keyword, occurrences.get(keyword))
+            if spans:
+                keyword_spans[keyword] = spans
+        
+        # 일치한 키워드가 있을 때만 수정자/부정어 검색 (전체 단어를 이미 검색했으면 생략)
+        if keyword_spans and not all_terms_found:
+            occurrences.update(self._find_occurrences(text_lower, self._context_terms))
+        
+        if kernels.use_numba and sum(map(len, keyword_spans.values())) >= KERNEL_MIN_MATCHES:
+            # 일치가 많으면 컴파일된 커널로 맥락 점수 계산 및 누적
+            matched_keywords = self._accumulate_with_kernel(emotion_scores, keyword_spans, occurrences, text_len)
+        else:
+            # 맥락 단어 종류별로 텍스트에 출현한 단어만 추림 (일치마다 전체 단어를 확인하지 않도록)
+            context_index = [
+                None if terms is None else [
+                    (occurrences[term], len(term)) for term in terms if term in occurrences
+                ]
+                for terms in self._context_classes
+            ]
+            
+            # 키워드별 일치 점수 (같은 키워드는 한 번만 계산)
+            keyword_scores = {
+                keyword: [self._context_score(context_index, start, end, text_len) for start, end in spans]
+                for keyword, spans in keyword_spans.items()
+            }
+            
+            # 각 감정에 대한 점수 누적 (기존과 같은 순서로 더함)
+            matched_keywords = {}  # 일치한 키워드 (처음 일치한 순서, 중복 없음)
+            for emotion_id, keyword in self._emotion_keyword_pairs:
+                scores = keyword_scores.get(keyword)
+                if not scores:
+                    continue
                 
-                for match in matches:
-                    # 기본 점수
-                    score = 1.0
-                    
-                    # 맥락 확인 (주변 텍스트)
-                    context_start = max(0, match.start() - 20)
-                    context_end = min(len(text), match.end() + 20)
-                    context = text[context_start:context_end].lower()
-                    
-                    # 강도 수정자 확인
-                    for high_mod in self.patterns["intensity_modifiers"]["high"]:
-                        if high_mod in context:
-                            score *= 1.5
-                            break
-                    
-                    for low_mod in self.patterns["intensity_modifiers"]["low"]:
-                        if low_mod in context:
-                            score *= 0.7
-                            break
-                    
-                    # 부정어 확인
-                    for neg in self.patterns["negation_words"]:
-                        if neg in context:
-                            score *= -0.5  # 부정이면 감정 반전 (약화)
-                            break
-                    
-                    # 점수 누적
-                    emotion_scores[emotion] += score
+                matched_keywords[keyword] = None
+                for score in scores:
+                    emotion_scores[emotion_id] += score
         
         # 최종 점수 계산 및 정규화
-        total_score = sum(abs(score) for score in emotion_scores.values())
+        total_score = sum(abs(score) for score in emotion_scores)
         
         if total_score > 0:
             # 점수 정규화 (0-1 사이)
-            normalized_scores = {e: abs(s)/total_score for e, s in emotion_scores.items()}
+            normalized = [abs(s)/total_score for s in emotion_scores]
             
-            # 가장 강한 감정 찾기
-            dominant_emotion = max(normalized_scores, key=normalized_scores.get)
-            dominant_score = normalized_scores[dominant_emotion]
+            # 가장 강한 감정 찾기 (같은 점수면 앞쪽 감정)
+            dominant_id = max(range(len(normalized)), key=normalized.__getitem__)
+            dominant_emotion = emotion_names[dominant_id]
+            dominant_score = normalized[dominant_id]
         else:
-            normalized_scores = {e: 0 for e in emotion_scores}
+            normalized = emotion_scores
             dominant_emotion = "neutral"
             dominant_score = 0.0
         
+        # 결과 딕셔너리는 마지막에 한 번만 생성
+        normalized_scores = dict(zip(emotion_names, normalized))
+        
         # 감정 카테고리 결정
         if dominant_emotion in self.emotion_categories["positive"]:
             category = "positive"
@@ -181,24 +724,17 @@ class EmotionAnalyzer:
             category = "neutral"
         
         # 신뢰도 계산 (주요 감정과 다음 감정의 점수 차이)
-        scores_list = sorted(normalized_scores.values(), reverse=True)
+        scores_list = sorted(normalized, reverse=True)
         confidence = dominant_score
         if len(scores_list) > 1 and scores_list[1] > 0:
             confidence = (scores_list[0] - scores_list[1]) / scores_list[0]
         
-        # 주요 키워드 추출
-        keywords = []
-        for emotion, keywords_list in self.patterns["emotions"].items():
-            for keyword in keywords_list:
-                if re.search(r'\b' + keyword + r'\w*\b', text.lower()):
-                    keywords.append(keyword)
-        
         return {
             "dominant_emotion": dominant_emotion,
             "emotion_category": category,
             "emotion_scores": normalized_scores,
             "confidence": min(confidence, 1.0),  # 0-1 사이로 제한
-            "keywords": list(set(keywords))[:5]  # 중복 제거 및 상위 5개만
+            "keywords": list(matched_keywords)[:5]  # 상위 5개만
         }
     
     def analyze_conversation(self, conversation_history):
@@ -222,11 +758,8 @@ class EmotionAnalyzer:
                 "emotion_scores_by_message": []
             }
         
-        # 각 메시지별 감정 분석
-        emotion_results = []
-        for message in user_messages:
-            result = self.analyze_text(message)
-            emotion_results.append(result)
+        # 각 메시지별 감정 분석 (한 번에 검색)
+        emotion_results = self.analyze_texts(user_messages)
         
         # 전체 감정 분포 계산
         emotion_counts = {}
@@ -244,21 +777,21 @@ class EmotionAnalyzer:
         # 감정 변화 추세 분석
         if len(emotion_results) > 2:
             # 감정 카테고리를 숫자로 변환 (긍정:1, 중립:0, 부정:-1)
-            emotion_values = []
-            for result in emotion_results:
-                if result["emotion_category"] == "positive":
-                    emotion_values.append(1)
-                elif result["emotion_category"] == "negative":
-                    emotion_values.append(-1)
-                else:
-                    emotion_values.append(0)
-            
-            # 단순 선형 회귀로 추세 계산
-            x = np.array(range(len(emotion_values)))
-            y = np.array(emotion_values)
+            category_values = {"positive": 1, "negative": -1}
+            y = np.fromiter(
+                (category_values.get(result["emotion_category"], 0) for result in emotion_results),
+                dtype=np.int8,
+                count=len(emotion_results)
+            )
+            n = y.size
             
-            if len(x) > 1:  # 최소 2개 이상의 포인트 필요
-                slope = np.polyfit(x, y, 1)[0]
+            if n > 1:  # 최소 2개 이상의 포인트 필요
+                # 단순 선형 회귀 기울기 (x = 0..n-1, 정수 합으로 닫힌 형태 계산)
+                sx = n * (n - 1) // 2
+                sxx = (n - 1) * n * (2 * n - 1) // 6
+                sy = int(y.sum(dtype=np.int64))
+                sxy = int(np.dot(np.arange(n, dtype=np.int64), y.astype(np.int64)))
+                slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
                 
                 if slope > 0.1:
                     trend = "improving"  # 감정이 좋아지는 추세
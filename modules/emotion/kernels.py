@@ -0,0 +1,226 @@
+import logging
+import numpy as np
+
+# numba 선택적 임포트 (없으면 numpy 구현 사용)
+try:
+    from numba import njit
+    use_numba = True
+except ImportError:
+    njit = None
+    use_numba = False
+
+logger = logging.getLogger(__name__)
+
+# 일별 감정 비율 열 순서
+EMOTION_COLUMNS = ("positive_ratio", "negative_ratio", "neutral_ratio")
+
+
+def _score_window_loop(emotions, weights, threshold):
+    """
+    가중 감정 점수가 임계값 이상인 날 수 계산 (numba 컴파일용 루프)
+    
+    Args:
+        emotions (np.ndarray): 일별 감정 비율 (일수 x 감정 수, float64)
+        weights (np.ndarray): 감정별 가중치 (float64)
+        threshold (float): 점수 임계값
+        
+    Returns:
+        int: 임계값 이상인 날 수
+    """
+    count = 0
+    for i in range(emotions.shape[0]):
+        score = 0.0
+        for j in range(emotions.shape[1]):
+            score += emotions[i, j] * weights[j]
+        if score >= threshold:
+            count += 1
+    return count
+
+
+def _score_window_numpy(emotions, weights, threshold):
+    """
+    가중 감정 점수가 임계값 이상인 날 수 계산 (numpy 구현)
+    
+    Args:
+        emotions (np.ndarray): 일별 감정 비율 (일수 x 감정 수, float64)
+        weights (np.ndarray): 감정별 가중치 (float64)
+        threshold (float): 점수 임계값
+        
+    Returns:
+        int: 임계값 이상인 날 수
+    """
+    return int(np.count_nonzero(emotions @ weights >= threshold))
+
+
+if use_numba:
+    # 시그니처를 명시하여 import 시 한 번만 컴파일하고, 결과는 디스크에 캐시
+    # (::1 = C 연속 배열, NaN 처리를 바꾸지 않는 fastmath 옵션만 사용)
+    _score_window_impl = njit(
+        "int64(float64[:, ::1], float64[::1], float64)",
+        cache=True,
+        nogil=True,
+        boundscheck=False,
+        fastmath={"contract", "reassoc"}
+    )(_score_window_loop)
+    logger.debug("numba 감정 커널 사용")
+else:
+    _score_window_impl = _score_window_numpy
+
+
+def score_window(emotions, weights, threshold):
+    """
+    가중 감정 점수가 임계값 이상인 날 수 계산
+    
+    Args:
+        emotions (np.ndarray): 일별 감정 비율 (일수 x 감정 수)
+        weights (np.ndarray): 감정별 가중치
+        threshold (float): 점수 임계값
+        
+    Returns:
+        int: 임계값 이상인 날 수
+    """
+    # 컴파일된 시그니처에 맞게 C 연속 float64 배열로 변환 (이미 맞으면 복사 없음)
+    emotions = np.ascontiguousarray(emotions, dtype=np.float64)
+    weights = np.ascontiguousarray(weights, dtype=np.float64)
+    return int(_score_window_impl(emotions, weights, float(threshold)))
+
+
+def _context_within(ctx_starts, ctx_min_ends, lo, hi, start, end):
+    """
+    맥락 단어 출현 중 하나라도 [start, end) 구간 안에 완전히 포함되는지 확인
+    
+    Args:
+        ctx_starts (np.ndarray): 맥락 단어 출현 시작 위치 (오름차순, int64)
+        ctx_min_ends (np.ndarray): 각 위치 이후 출현들의 최소 끝 위치 (int64)
+        lo (int): 확인할 단어 종류의 배열 시작 인덱스
+        hi (int): 확인할 단어 종류의 배열 끝 인덱스
+        start (int): 구간 시작
+        end (int): 구간 끝
+        
+    Returns:
+        bool: 포함 여부
+    """
+    idx = lo + np.searchsorted(ctx_starts[lo:hi], start)
+    return idx < hi and ctx_min_ends[idx] <= end
+
+
+def _score_matches_loop(starts, ends, emotion_ids, ctx_starts, ctx_min_ends, ctx_bounds,
+                        always, multipliers, text_len, window, n_emotions):
+    """
+    키워드 일치별 맥락 점수를 계산해 감정별로 누적 (numba 컴파일용 루프)
+    
+    Args:
+        starts (np.ndarray): 키워드 일치 시작 위치 (int64, 누적 순서대로)
+        ends (np.ndarray): 키워드 일치 끝 위치 (int64)
+        emotion_ids (np.ndarray): 일치별 감정 인덱스 (int64)
+        ctx_starts (np.ndarray): 맥락 단어 종류별로 이어 붙인 출현 시작 위치 (int64)
+        ctx_min_ends (np.ndarray): 종류별 최소 끝 위치 누적값 (int64)
+        ctx_bounds (np.ndarray): 맥락 단어 종류별 배열 경계 (int64, 종류 수 + 1)
+        always (np.ndarray): 종류별로 항상 포함으로 볼지 여부 (uint8, 빈 단어가 있는 경우)
+        multipliers (np.ndarray): 종류별 점수 배율 (float64)
+        text_len (int): 텍스트 길이
+        window (int): 맥락 범위 (글자 수)
+        n_emotions (int): 감정 수
+        
+    Returns:
+        np.ndarray: 감정별 점수 합계 (float64)
+    """
+    scores = np.zeros(n_emotions)
+    for i in range(starts.shape[0]):
+        context_start = max(0, starts[i] - window)
+        context_end = min(text_len, ends[i] + window)
+        
+        score = 1.0
+        for c in range(multipliers.shape[0]):
+            if always[c] or _context_within(ctx_starts, ctx_min_ends, ctx_bounds[c], ctx_bounds[c + 1],
+                                            context_start, context_end):
+                score *= multipliers[c]
+        
+        scores[emotion_ids[i]] += score
+    return scores
+
+
+if use_numba:
+    _context_within = njit(
+        "boolean(int64[::1], int64[::1], int64, int64, int64, int64)",
+        cache=True,
+        nogil=True,
+        boundscheck=False
+    )(_context_within)
+    _score_matches_impl = njit(
+        "float64[::1](int64[::1], int64[::1], int64[::1], int64[::1], int64[::1], int64[::1], "
+        "uint8[::1], float64[::1], int64, int64, int64)",
+        cache=True,
+        nogil=True,
+        boundscheck=False
+    )(_score_matches_loop)
+else:
+    _score_matches_impl = _score_matches_loop
+
+
+def score_matches(starts, ends, emotion_ids, context_spans, multipliers, text_len, window, n_emotions):
+    """
+    키워드 일치들의 맥락 점수를 감정별로 누적
+    
+    각 일치의 점수는 1.0에서 시작해, 맥락 범위 안에 완전히 포함된 맥락 단어가 있는 종류마다
+    해당 배율을 순서대로 곱한 값입니다. 감정별 합계는 일치 순서대로 더합니다.
+    
+    Args:
+        starts (list): 키워드 일치 시작 위치
+        ends (list): 키워드 일치 끝 위치
+        emotion_ids (list): 일치별 감정 인덱스
+        context_spans (list): 맥락 단어 종류별 출현 (시작, 끝) 목록. None이면 항상 포함
+        multipliers (list): 종류별 점수 배율
+        text_len (int): 텍스트 길이
+        window (int): 맥락 범위 (글자 수)
+        n_emotions (int): 감정 수
+        
+    Returns:
+        np.ndarray: 감정별 점수 합계
+    """
+    ctx_starts = []
+    ctx_min_ends = []
+    ctx_bounds = [0]
+    always = []
+    
+    for spans in context_spans:
+        always.append(spans is None)
+        if spans:
+            spans = sorted(spans)
+            ctx_starts.extend(span[0] for span in spans)
+            
+            # 뒤에서부터 최소 끝 위치 (시작 위치 이후 출현 중 가장 먼저 끝나는 위치)
+            min_ends = np.minimum.accumulate(np.array([span[1] for span in spans], dtype=np.int64)[::-1])[::-1]
+            ctx_min_ends.extend(min_ends.tolist())
+        ctx_bounds.append(len(ctx_starts))
+    
+    return _score_matches_impl(
+        np.array(starts, dtype=np.int64),
+        np.array(ends, dtype=np.int64),
+        np.array(emotion_ids, dtype=np.int64),
+        np.array(ctx_starts, dtype=np.int64),
+        np.array(ctx_min_ends, dtype=np.int64),
+        np.array(ctx_bounds, dtype=np.int64),
+        np.array(always, dtype=np.uint8),
+        np.ascontiguousarray(multipliers, dtype=np.float64),
+        int(text_len),
+        int(window),
+        int(n_emotions)
+    )
+
+
+def to_emotion_array(daily_stats, dates):
+    """
+    일별 감정 통계를 커널 입력 배열로 변환
+    
+    Args:
+        daily_stats (dict): 일별 감정 통계
+        dates (list): 변환할 날짜 목록
+        
+    Returns:
+        np.ndarray: 일별 감정 비율 (일수 x 감정 수)
+    """
+    return np.array(
+        [[daily_stats[date][column] for column in EMOTION_COLUMNS] for date in dates],
+        dtype=np.float64
+    ).reshape(len(dates), len(EMOTION_COLUMNS))
@@ -1,13 +1,32 @@
 import os
-import json
+import re
+import heapq
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import pandas as pd
 import numpy as np
-from collections import defaultdict
+from collections import Counter
+
+# 로컬 모듈 임포트
+from modules.emotion import kernels
+from modules.utils.helpers import recent_dates, to_json
+from modules.utils.logger import read_emotion_logs
 
 logger = logging.getLogger(__name__)
 
+# 감정 카테고리 코드 (구조화 배열용)
+CATEGORY_CODES = {"negative": 0, "neutral": 1, "positive": 2}
+CATEGORY_NAMES = ("negative", "neutral", "positive")
+
+# 일별 통계 건수 배열의 카테고리 위치 (positive, negative, neutral 순)
+_RATIO_INDEX = {"positive": 0, "negative": 1, "neutral": 2}
+
+# 타임스탬프 앞부분의 날짜 형식 (YYYY-MM-DD)
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# 감정 로그 구조화 배열 형식 (시각: epoch 밀리초, 카테고리 코드)
+EMOTION_LOG_DTYPE = np.dtype([("ts", "i8"), ("cat", "u1")])
+
 class EmotionTrendMonitor:
     """감정 추세를 모니터링하는 클래스"""
     
@@ -20,121 +39,196 @@ class EmotionTrendMonitor:
         """
         self.logs_dir = logs_dir
         os.makedirs(logs_dir, exist_ok=True)
+        
+        # 부정 감정 비율만 선택하는 가중치
+        self._negative_weights = np.array([0.0, 1.0, 0.0], dtype=np.float64)
         logger.info(f"EmotionTrendMonitor 초기화 완료: {logs_dir}")
     
-    def load_emotion_logs(self, days=7):
+    def _read_date(self, date_str):
+        """
+        날짜별 감정 로그 읽기 (JSON Lines/이전 형식 파싱은 read_emotion_logs에서 처리, 실패 시 빈 목록)
+        
+        Args:
+            date_str (str): 'YYYY-MM-DD' 형식 날짜
+            
+        Returns:
+            list: 감정 로그 리스트
+        """
+        try:
+            return list(read_emotion_logs(date_str, self.logs_dir))
+        except Exception as e:
+            logger.error(f"로그 파일 로드 실패: {date_str}, {e}")
+            return []
+    
+    def load_emotion_logs(self, days=7, sort=True):
         """
         최근 감정 로그 로드
         
         Args:
             days (int): 로드할 일수
+            sort (bool, optional): 타임스탬프순 정렬 여부. 기본값은 True
             
         Returns:
             list: 감정 로그 리스트
         """
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
+        # 날짜 문자열은 recent_dates로 한 번에 생성 (오래된 날짜부터), 로그가 있는 날짜만 읽음
+        dates = [
+            date_str for date_str in recent_dates(days)
+            if os.path.exists(os.path.join(self.logs_dir, f"{date_str}_emotion_log.json"))
+        ]
         
-        logs = []
+        # 날짜별 파일을 병렬로 읽기 (파일이 하나 이하면 스레드 없이 읽기)
+        if len(dates) <= 1:
+            results = [self._read_date(date_str) for date_str in dates]
+        else:
+            with ThreadPoolExecutor(max_workers=min(8, len(dates))) as executor:
+                results = list(executor.map(self._read_date, dates))
         
-        # 날짜별 파일 검사
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime('%Y-%m-%d')
-            log_file = os.path.join(self.logs_dir, f"{date_str}_emotion_log.json")
-            
-            if os.path.exists(log_file):
-                try:
-                    with open(log_file, 'r', encoding='utf-8') as f:
-                        day_logs = json.load(f)
-                    
-                    # 리스트가 아니면 리스트로 변환
-                    if not isinstance(day_logs, list):
-                        day_logs = [day_logs]
-                    
-                    logs.extend(day_logs)
-                except Exception as e:
-                    logger.error(f"로그 파일 로드 실패: {log_file}, {e}")
-            
-            current_date += timedelta(days=1)
+        logs = [log for records in results for log in records]
         
-        logs.sort(key=lambda x: x.get('timestamp', ''))
+        if sort:
+            logs.sort(key=lambda x: x.get('timestamp', ''))
         return logs
     
-    def calculate_daily_emotions(self, logs):
+    def iter_emotion_logs(self, days=7):
         """
-        일별 감정 통계 계산
+        최근 감정 로그를 날짜 순서대로 하나씩 반환 (전체 로그를 리스트로 모으지 않음)
+        
+        Args:
+            days (int): 로드할 일수
+            
+        Yields:
+            dict: 감정 로그
+        """
+        for date_str in recent_dates(days):
+            try:
+                yield from read_emotion_logs(date_str, self.logs_dir)
+            except Exception as e:
+                logger.error(f"로그 파일 로드 실패: {date_str}, {e}")
+    
+    def to_category_array(self, logs):
+        """
+        감정 로그를 (시각, 카테고리) 구조화 배열로 변환
         
         Args:
             logs (list): 감정 로그 리스트
             
         Returns:
-            dict: 일별 감정 통계
+            np.ndarray: EMOTION_LOG_DTYPE 형식 배열 (로그와 같은 순서)
         """
-        if not logs:
-            return {}
+        arr = np.empty(len(logs), dtype=EMOTION_LOG_DTYPE)
         
-        daily_stats = defaultdict(lambda: {"positive": 0, "negative": 0, "neutral": 0, "total": 0})
+        for i, log in enumerate(logs):
+            arr[i] = (self._log_epoch_ms(log), CATEGORY_CODES.get(log.get("emotion_category", "neutral"), 1))
+        
+        return arr
+    
+    def _log_epoch_ms(self, log):
+        """
+        로그 시각(epoch 밀리초) 조회
         
+        Args:
+            log (dict): 감정 로그
+            
+        Returns:
+            int: epoch 밀리초 (알 수 없으면 0)
+        """
+        # 로거가 기록한 unix_timestamp 우선 사용 (문자열 파싱 생략)
+        unix_timestamp = log.get("unix_timestamp")
+        if isinstance(unix_timestamp, (int, float)):
+            return int(unix_timestamp * 1000)
+        
+        try:
+            timestamp = datetime.fromisoformat(log["timestamp"].replace('Z', '+00:00'))
+            return int(timestamp.timestamp() * 1000)
+        except (KeyError, TypeError, ValueError):
+            return 0
+    
+    def calculate_daily_emotions(self, logs):
+        """
+        일별 감정 통계 계산 (로그를 한 번만 순회하므로 이터레이터도 가능)
+        
+        Args:
+            logs (iterable): 감정 로그 리스트 또는 이터레이터
+            
+        Returns:
+            dict: 일별 감정 통계
+        """
+        # 날짜별 [positive, negative, neutral] 건수 (날짜는 처음 등장한 순서)
+        counts = {}
+        invalid_count = 0
         for log in logs:
-            # 타임스탬프가 없으면 건너뛰기
             if "timestamp" not in log:
                 continue
             
-            try:
-                # ISO 형식 타임스탬프 파싱
-                timestamp = datetime.fromisoformat(log["timestamp"].replace('Z', '+00:00'))
-                date_str = timestamp.strftime('%Y-%m-%d')
-                
-                # 감정 카테고리 집계
-                category = log.get("emotion_category", "neutral")
-                daily_stats[date_str][category] += 1
-                daily_stats[date_str]["total"] += 1
-            except Exception as e:
-                logger.error(f"로그 처리 중 오류: {e}, 로그: {log}")
+            # 타임스탬프의 날짜 부분(YYYY-MM-DD)만 사용 (전체 파싱 없이 형식만 확인)
+            timestamp = log["timestamp"]
+            if not (isinstance(timestamp, str) and _DATE_RE.match(timestamp)):
+                invalid_count += 1
+                continue
+            
+            row = counts.setdefault(timestamp[:10], [0, 0, 0])
+            
+            # 알 수 없는 카테고리는 집계하지 않음
+            index = _RATIO_INDEX.get(log.get("emotion_category", "neutral"))
+            if index is not None:
+                row[index] += 1
+        
+        if invalid_count:
+            logger.error(f"타임스탬프 형식 오류 로그 {invalid_count}개를 건너뜁니다")
+        
+        if not counts:
+            return {}
+        
+        # 비율과 가장 많은 카테고리를 배열 연산으로 한 번에 계산
+        # (argmax는 동률이면 앞 열(positive, negative, neutral 순)을 선택)
+        dates = np.array(list(counts), dtype=object)
+        values = np.array(list(counts.values()), dtype=np.float64)
+        totals = values.sum(axis=1)
+        
+        # 집계된 로그가 없는 날짜는 제외
+        valid = totals > 0
+        dates, values, totals = dates[valid], values[valid], totals[valid]
+        
+        ratios = values / totals[:, None]
+        dominant = np.array(["positive", "negative", "neutral"])[values.argmax(axis=1)]
         
-        # 비율 계산
         result = {}
-        for date, stats in daily_stats.items():
-            total = stats["total"]
-            if total > 0:
-                result[date] = {
-                    "positive_ratio": stats["positive"] / total,
-                    "negative_ratio": stats["negative"] / total,
-                    "neutral_ratio": stats["neutral"] / total,
-                    "dominant_emotion": max(["positive", "negative", "neutral"], 
-                                        key=lambda x: stats[x])
-                }
+        for date, (positive, negative, neutral), emotion in zip(dates.tolist(), ratios.tolist(), dominant.tolist()):
+            result[date] = {
+                "positive_ratio": positive,
+                "negative_ratio": negative,
+                "neutral_ratio": neutral,
+                "dominant_emotion": emotion
+            }
         
         return result
     
-    def detect_depression_risk(self, days=7, threshold=0.6):
+    def detect_depression_risk(self, days=7, threshold=0.6, daily_stats=None):
         """
         우울증 위험 감지 (지속적인 부정 감정)
         
         Args:
             days (int): 확인할 일수
             threshold (float): 부정 감정 비율 임계값
+            daily_stats (dict, optional): 미리 계산된 최근 days일의 일별 감정 통계. 없으면 로그에서 계산
             
         Returns:
             bool: 위험 감지 여부
         """
-        logs = self.load_emotion_logs(days)
-        daily_stats = self.calculate_daily_emotions(logs)
+        if daily_stats is None:
+            daily_stats = self.calculate_daily_emotions(self.iter_emotion_logs(days))
         
-        # 최근 N일 동안의 데이터만 분석
-        dates = sorted(daily_stats.keys())[-days:]
+        # 최근 N일 동안의 데이터만 분석 (전체 정렬 없이 최근 날짜 N개만 선택, 오래된 날짜부터)
+        dates = heapq.nlargest(days, daily_stats)[::-1]
         
         if len(dates) < days:
             # 데이터가 충분하지 않으면 위험 없음으로 간주
             return False
         
         # 부정 감정이 임계값을 넘는 날 수
-        high_negative_days = 0
-        
-        for date in dates:
-            if date in daily_stats and daily_stats[date]["negative_ratio"] >= threshold:
-                high_negative_days += 1
+        emotions = kernels.to_emotion_array(daily_stats, dates)
+        high_negative_days = kernels.score_window(emotions, self._negative_weights, float(threshold))
         
         # 대부분의 날(70% 이상)에서 부정 감정이 높으면 위험으로 간주
         return high_negative_days >= (days * 0.7)
@@ -146,41 +240,51 @@ class EmotionTrendMonitor:
         Returns:
             dict: 주간 보고서 데이터
         """
-        # 최근 7일 로그 로드
-        logs = self.load_emotion_logs(7)
-        daily_stats = self.calculate_daily_emotions(logs)
+        # 감정 키워드 빈도 (일별 통계를 계산하며 같은 순회에서 함께 집계)
+        keyword_counts = Counter()
         
-        # 감정 키워드 빈도 분석
-        keyword_counts = defaultdict(int)
-        for log in logs:
-            for keyword in log.get("keywords", []):
-                keyword_counts[keyword] += 1
+        def count_keywords(logs):
+            for log in logs:
+                keyword_counts.update(log.get("keywords", []))
+                yield log
+        
+        # 최근 7일 로그 통계 (우울 위험 감지에도 같은 통계 사용)
+        daily_stats = self.calculate_daily_emotions(count_keywords(self.iter_emotion_logs(7)))
         
         # 상위 키워드
-        top_keywords = sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        top_keywords = keyword_counts.most_common(10)
+        
+        # 주간 통계 계산 (일별 비율의 평균, 한 번의 순회로 합산)
+        positive_ratio = negative_ratio = neutral_ratio = 0
+        for stats in daily_stats.values():
+            positive_ratio += stats["positive_ratio"]
+            negative_ratio += stats["negative_ratio"]
+            neutral_ratio += stats["neutral_ratio"]
+        
+        if daily_stats:
+            positive_ratio /= len(daily_stats)
+            negative_ratio /= len(daily_stats)
+            neutral_ratio /= len(daily_stats)
         
-        # 주간 통계 계산
-        positive_ratio = sum(stats["positive_ratio"] for stats in daily_stats.values()) / len(daily_stats) if daily_stats else 0
-        negative_ratio = sum(stats["negative_ratio"] for stats in daily_stats.values()) / len(daily_stats) if daily_stats else 0
-        neutral_ratio = sum(stats["neutral_ratio"] for stats in daily_stats.values()) / len(daily_stats) if daily_stats else 0
+        overall_ratios = {"positive": positive_ratio, "negative": negative_ratio, "neutral": neutral_ratio}
         
-        # 보고서 생성
+        # 보고서 생성 (기간과 생성 시각은 같은 현재 시각 기준)
+        now = datetime.now()
         report = {
             "period": {
-                "start": (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'),
-                "end": datetime.now().strftime('%Y-%m-%d')
+                "start": (now - timedelta(days=7)).strftime('%Y-%m-%d'),
+                "end": now.strftime('%Y-%m-%d')
             },
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": now.isoformat(),
             "overall_stats": {
                 "positive_ratio": positive_ratio,
                 "negative_ratio": negative_ratio,
                 "neutral_ratio": neutral_ratio,
-                "dominant_emotion": max(["positive", "negative", "neutral"], 
-                                    key=lambda x: locals()[f"{x}_ratio"])
+                "dominant_emotion": max(overall_ratios, key=overall_ratios.get)
             },
             "daily_stats": daily_stats,
             "top_keywords": dict(top_keywords),
-            "depression_risk": self.detect_depression_risk()
+            "depression_risk": self.detect_depression_risk(days=7, daily_stats=daily_stats)
         }
         
         return report
@@ -207,8 +311,8 @@ class EmotionTrendMonitor:
         file_path = os.path.join(reports_dir, f"weekly_emotion_report_{end_date}.json")
         
         # 저장
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        with open(file_path, 'wb') as f:
+            f.write(to_json(report))
         
         logger.info(f"주간 감정 보고서 저장 완료: {file_path}")
         return file_path
\ No newline at end of file
@@ -1,12 +1,185 @@
 import os
-import json
+import re
 import csv
 import logging
-from datetime import datetime, timedelta
-import pandas as pd
+import threading
+from datetime import datetime
+from cachetools import LRUCache
+
+# pyarrow가 있으면 C++ CSV 작성기로 내보내기 (없으면 csv 모듈로 한 행씩 기록)
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    use_pyarrow = True
+except ImportError:
+    pa = None
+    pc = None
+    pacsv = None
+    use_pyarrow = False
+
+# 로컬 모듈 임포트
+from modules.utils.helpers import read_log_files, to_json
 
 logger = logging.getLogger(__name__)
 
+# CSV 행 구분 문자 (pyarrow/csv 모듈 경로 모두 pandas to_csv 기본값과 같게 사용)
+CSV_LINE_TERMINATOR = os.linesep
+
+# 따옴표로 감싸야 하는 CSV 값 (구분자, 따옴표, 줄바꿈 포함)
+_CSV_NEEDS_QUOTING = r'[,"\r\n]'
+
+def _flatten_log(log, prefix="", out=None):
+    """
+    중첩 딕셔너리를 '.'으로 연결한 키로 평탄화 (pd.json_normalize와 같은 키/순서)
+    
+    Args:
+        log (dict): 로그 레코드
+        prefix (str): 상위 키 접두사
+        out (dict, optional): 결과를 추가할 딕셔너리
+        
+    Returns:
+        dict: 평탄화된 레코드
+    """
+    if out is None:
+        out = {}
+    
+    # 단순 값을 먼저 넣고 중첩 딕셔너리는 뒤에 펼침 (json_normalize와 같은 열 순서)
+    nested = []
+    for key, value in log.items():
+        if isinstance(value, dict):
+            nested.append((key, value))
+        else:
+            out[prefix + str(key)] = value
+    
+    for key, value in nested:
+        _flatten_log(value, f"{prefix}{key}.", out)
+    
+    return out
+
+def _format_timestamp(value):
+    """
+    ISO 형식 타임스탬프를 'YYYY-MM-DD HH:MM:SS[.ffffff]' 형식으로 변환
+    
+    Args:
+        value (object): 타임스탬프 값
+        
+    Returns:
+        object: 변환된 문자열 (ISO 형식이 아니면 원래 값)
+    """
+    if not isinstance(value, str):
+        return value
+    
+    try:
+        return str(datetime.fromisoformat(value.replace('Z', '+00:00')))
+    except ValueError:
+        return value
+
+def _to_columns(logs):
+    """
+    로그 목록을 열별 값 목록으로 변환 (열 순서는 처음 등장한 순서)
+    
+    Args:
+        logs (list): 로그 데이터
+        
+    Returns:
+        dict: {열 이름: 값 목록}
+    """
+    columns = {}
+    
+    for row, log in enumerate(logs):
+        for key, value in _flatten_log(log).items():
+            values = columns.get(key)
+            if values is None:
+                # 새 열은 이전 행을 빈 값으로 채움
+                values = columns[key] = [None] * row
+            elif len(values) < row:
+                values.extend([None] * (row - len(values)))
+            
+            # 리스트 등 CSV로 쓸 수 없는 값은 문자열로 변환 (pandas와 같은 표기)
+            if isinstance(value, (list, tuple, set, dict)):
+                value = str(value)
+            values.append(value)
+    
+    total = len(logs)
+    for values in columns.values():
+        if len(values) < total:
+            values.extend([None] * (total - len(values)))
+    
+    return columns
+
+def _to_arrow_column(name, values):
+    """
+    열 값 목록을 pyarrow 배열로 변환 (csv 모듈 경로와 같은 표기가 되도록 변환)
+    
+    정수 열만 그대로 두고, 나머지 값은 csv 모듈처럼 str()로 변환합니다
+    (pyarrow는 불리언을 true/false로, 1.0을 1로 쓰므로).
+    
+    Args:
+        name (str): 열 이름
+        values (list): 열 값 목록
+        
+    Returns:
+        pa.Array: 변환된 배열
+    """
+    # 타임스탬프는 csv 모듈 경로와 같은 형식으로 변환
+    if name == "timestamp":
+        values = [_format_timestamp(value) for value in values]
+    elif not any(isinstance(value, bool) for value in values):
+        try:
+            array = pa.array(values)
+            if pa.types.is_integer(array.type) or pa.types.is_string(array.type) or pa.types.is_null(array.type):
+                return array
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            pass
+    
+    return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+
+def _needs_quoting(table):
+    """
+    따옴표로 감싸야 하는 값이나 열 이름이 있는지 확인
+    
+    pyarrow CSV 작성기는 문자열을 모두 따옴표로 감싸거나(needed) 전혀 감싸지 않으므로(none),
+    감싸야 하는 값이 있으면 csv 모듈로 기록합니다.
+    
+    Args:
+        table (pa.Table): 내보낼 표
+        
+    Returns:
+        bool: 따옴표가 필요한 값 존재 여부
+    """
+    # 열이 하나면 csv 모듈은 빈 값을 ""로 쓰므로 같은 결과를 위해 csv 모듈 사용
+    if table.num_columns == 1:
+        return True
+    
+    if any(re.search(_CSV_NEEDS_QUOTING, name) for name in table.column_names):
+        return True
+    
+    for column in table.columns:
+        if pa.types.is_string(column.type) and pc.any(pc.match_substring_regex(column, _CSV_NEEDS_QUOTING)).as_py():
+            return True
+    
+    return False
+
+def _write_csv_rows(logs, output_file):
+    """
+    csv 모듈로 로그를 한 행씩 평탄화해서 기록 (전체 표를 만들지 않음)
+    
+    Args:
+        logs (list): 로그 데이터
+        output_file (str): 출력 파일 경로
+    """
+    fieldnames = list(dict.fromkeys(key for log in logs for key in _flatten_log(log)))
+    
+    with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator=CSV_LINE_TERMINATOR)
+        writer.writeheader()
+        for log in logs:
+            row = _flatten_log(log)
+            if "timestamp" in row:
+                row["timestamp"] = _format_timestamp(row["timestamp"])
+            writer.writerow(row)
+
 class LogExporter:
     """로그 데이터를 다양한 형식으로 내보내는 클래스"""
     
@@ -21,6 +194,10 @@ class LogExporter:
         self.base_logs_dir = base_logs_dir
         self.export_dir = export_dir
         os.makedirs(export_dir, exist_ok=True)
+        
+        # (로그 유형, 시작일, 종료일)별 로드 결과 (파일 목록/수정 시각이 같을 때만 재사용)
+        self._logs_cache = LRUCache(maxsize=32)
+        self._logs_cache_lock = threading.Lock()
         logger.info(f"LogExporter 초기화 완료: {base_logs_dir} -> {export_dir}")
     
     def load_logs(self, log_type, start_date, end_date):
@@ -43,35 +220,37 @@ class LogExporter:
         
         # 날짜 파싱
         try:
-            start = datetime.strptime(start_date, '%Y-%m-%d')
-            end = datetime.strptime(end_date, '%Y-%m-%d')
+            start = datetime.strptime(start_date, '%Y-%m-%d').strftime('%Y-%m-%d')
+            end = datetime.strptime(end_date, '%Y-%m-%d').strftime('%Y-%m-%d')
         except ValueError:
             logger.error(f"날짜 형식 오류: {start_date} ~ {end_date}, 형식은 YYYY-MM-DD여야 합니다.")
             return []
         
-        # 로그 수집
-        logs = []
-        current = start
-        while current <= end:
-            date_str = current.strftime('%Y-%m-%d')
-            log_file = os.path.join(log_dir, f"{date_str}_{log_type[:-1]}_log.json")  # 단수형으로 변환
-            
-            if os.path.exists(log_file):
-                try:
-                    with open(log_file, 'r', encoding='utf-8') as f:
-                        day_logs = json.load(f)
-                    
-                    # 리스트가 아니면 리스트로 변환
-                    if not isinstance(day_logs, list):
-                        day_logs = [day_logs]
-                    
-                    logs.extend(day_logs)
-                except Exception as e:
-                    logger.error(f"로그 파일 로드 실패: {log_file}, {e}")
-            
-            current += timedelta(days=1)
+        # 디렉토리를 한 번만 읽어 기간 안의 날짜별 로그 파일 찾기 (날짜마다 존재 여부를 확인하지 않음)
+        suffix = f"_{log_type[:-1]}_log.json"  # 단수형으로 변환
+        files = []
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(suffix) and len(name) == 10 + len(suffix) and start <= name[:10] <= end and entry.is_file():
+                    stat = entry.stat()
+                    files.append((name, entry.path, stat.st_mtime_ns, stat.st_size))
+        files.sort()
+        
+        # 파일 목록과 수정 시각/크기가 같으면 이전에 읽은 결과 재사용
+        key = (log_type, start, end)
+        signature = tuple((name, mtime_ns, size) for name, _, mtime_ns, size in files)
+        with self._logs_cache_lock:
+            cached = self._logs_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return list(cached[1])
+        
+        # 로그 수집 (파일별 병렬 읽기)
+        logs = read_log_files([path for _, path, _, _ in files])
         
-        return logs
+        with self._logs_cache_lock:
+            self._logs_cache[key] = (signature, logs)
+        return list(logs)
     
     def export_to_csv(self, log_type, start_date, end_date, output_file=None):
         """
@@ -101,15 +280,29 @@ class LogExporter:
             )
         
         try:
-            # DataFrame으로 변환
-            df = pd.json_normalize(logs)
-            
-            # 타임스탬프를 날짜/시간으로 변환 (있는 경우)
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
+            table = None
+            if use_pyarrow:
+                # 열별 배열로 변환 (pandas 객체 열을 거치지 않음)
+                columns = _to_columns(logs)
+                table = pa.table({name: _to_arrow_column(name, values) for name, values in columns.items()})
+                
+                # 따옴표가 필요한 값이 있으면 csv 모듈로 기록 (두 경로의 출력을 같게 유지)
+                if _needs_quoting(table):
+                    table = None
             
-            # CSV로 저장
-            df.to_csv(output_file, index=False, encoding='utf-8-sig')
+            if table is not None:
+                # pyarrow CSV 작성기로 저장 (따옴표가 필요 없으므로 csv 모듈과 같은 출력)
+                write_options = pacsv.WriteOptions(
+                    include_header=True,
+                    quoting_style="none",
+                    quoting_header="none",
+                    eol=CSV_LINE_TERMINATOR
+                )
+                with open(output_file, 'wb') as f:
+                    f.write('\ufeff'.encode('utf-8'))  # utf-8-sig (엑셀 호환 BOM)
+                    pacsv.write_csv(table, f, write_options=write_options)
+            else:
+                _write_csv_rows(logs, output_file)
             
             logger.info(f"CSV 내보내기 완료: {output_file}, {len(logs)}개 로그")
             return output_file
@@ -161,8 +354,8 @@ class LogExporter:
             }
             
             # JSON으로 저장
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2)
+            with open(output_file, 'wb') as f:
+                f.write(to_json(export_data))
             
             logger.info(f"JSON 내보내기 완료: {output_file}, {len(logs)}개 로그")
             return output_file
@@ -235,8 +428,8 @@ class LogExporter:
             }
             
             # JSON으로 저장
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2)
+            with open(output_file, 'wb') as f:
+                f.write(to_json(report))
             
             logger.info(f"대화 보고서 생성 완료: {output_file}")
             return output_file
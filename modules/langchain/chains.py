@@ -1,29 +1,16 @@
-from langchain.chains import LLMChain, ConversationalRetrievalChain
-from langchain.memory import ConversationBufferMemory
-from dotenv import load_dotenv
 import os
 import logging
-import json
+from functools import cached_property
 
 # 로컬 모듈 임포트
 from modules.langchain.prompts import get_conversation_prompt, get_rag_prompt, get_phishing_detection_prompt
-from modules.llm.openai_client import OpenAIClient
+from modules.utils.helpers import load_config, load_env
 
 # .env 파일 로드
-load_dotenv()
+load_env()
 
 logger = logging.getLogger(__name__)
 
-def load_config():
-    """설정 파일 로드"""
-    config_path = "config/config.json"
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        logger.warning(f"설정 파일 로드 실패: {e}. 기본 설정을 사용합니다.")
-        return {}
-
 class ChainManager:
     """LangChain 체인 관리 클래스"""
     
@@ -38,9 +25,39 @@ class ChainManager:
         
         # LLM 설정
         llm_config = self.config.get("llm", {})
-        model_name = llm_config.get("model_name", "gpt-3.5-turbo")
-        temperature = llm_config.get("temperature", 0.7)
+        self.model_name = llm_config.get("model_name", "gpt-3.5-turbo")
+        self.temperature = llm_config.get("temperature", 0.7)
+        
+        # 대화 메모리에 유지할 최대 토큰 수 (넘으면 오래된 대화부터 제거)
+        self.memory_max_tokens = llm_config.get("memory_max_tokens", 2000)
+        
+        # 마지막으로 생성한 RAG 체인 (검색기가 같으면 재사용)
+        self._rag_retriever = None
+        self._rag_chain = None
         
+        # LLM/메모리/체인은 처음 사용할 때 생성
+        logger.info(f"ChainManager 초기화 완료: model={self.model_name}, temp={self.temperature}")
+    
+    @cached_property
+    def llm(self):
+        """LLM (처음 사용할 때 한 번만 생성)"""
+        return self._create_llm()
+    
+    @cached_property
+    def json_llm(self):
+        """JSON 객체로만 응답하는 LLM (구조화된 결과가 필요한 체인용, 처음 사용할 때 한 번만 생성)"""
+        return self._create_llm(model_kwargs={"response_format": {"type": "json_object"}})
+    
+    def _create_llm(self, **kwargs):
+        """
+        ChatOpenAI LLM 생성
+        
+        Args:
+            **kwargs: ChatOpenAI에 추가로 전달할 인자
+            
+        Returns:
+            ChatOpenAI: LLM
+        """
         # API 키 로드 확인
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
@@ -54,77 +71,128 @@ class ChainManager:
             # 최신 langchain_openai 패키지 사용
             from langchain_openai import ChatOpenAI
             logger.info("langchain_openai 패키지 사용 중")
-            self.llm = ChatOpenAI(
-                model_name=model_name,
-                temperature=temperature
+            return ChatOpenAI(
+                model_name=self.model_name,
+                temperature=self.temperature,
                 # API 키는 환경변수에서 자동으로 로드
+                **kwargs
             )
         except Exception as e:
             logger.error(f"LLM 초기화 오류: {e}")
             raise ValueError(f"LLM 초기화 실패: {e}")
+    
+    @cached_property
+    def memory(self):
+        """대화 메모리 (처음 사용할 때 한 번만 생성, 토큰 수 제한으로 프롬프트가 계속 커지지 않도록 함)"""
+        # langchain은 임포트 비용이 크므로 실제로 쓸 때 로드
+        from langchain.memory import ConversationTokenBufferMemory
         
-        # 대화 메모리 초기화
         try:
-            self.memory = ConversationBufferMemory(
+            return ConversationTokenBufferMemory(
+                llm=self.llm,
+                max_token_limit=self.memory_max_tokens,
                 memory_key="chat_history", 
                 return_messages=True
             )
         except Exception as e:
             logger.error(f"메모리 초기화 오류: {e}")
             raise
-        
-        logger.info(f"ChainManager 초기화 완료: model={model_name}, temp={temperature}")
     
-    def get_conversation_chain(self):
-        """
-        기본 대화 체인 생성
-        
-        Returns:
-            LLMChain: 대화 체인
-        """
+    @cached_property
+    def conversation_chain(self):
+        """기본 대화 체인 (처음 사용할 때 한 번만 생성)"""
         logger.debug("대화 체인 생성")
         
+        from langchain.chains import LLMChain
+        
         prompt = get_conversation_prompt()
         
         try:
-            chain = LLMChain(
+            return LLMChain(
                 llm=self.llm,
                 prompt=prompt,
                 memory=self.memory,
                 verbose=self.config.get("debug", False)
             )
-            return chain
         except Exception as e:
             logger.error(f"대화 체인 생성 실패: {e}")
             raise
     
+    @cached_property
+    def rag_document_chain(self):
+        """
+        검색된 문서로 답변만 생성하는 체인 (처음 사용할 때 한 번만 생성)
+        
+        검색을 따로 실행한 경우 입력 {"input": ..., "context": 문서 목록}으로 바로 호출할 수 있습니다.
+        """
+        logger.debug("RAG 문서 체인 생성")
+        
+        from langchain.chains.combine_documents import create_stuff_documents_chain
+        
+        try:
+            return create_stuff_documents_chain(self.llm, get_rag_prompt())
+        except Exception as e:
+            logger.error(f"RAG 문서 체인 생성 실패: {e}")
+            raise
+    
+    @cached_property
+    def phishing_detection_chain(self):
+        """보이스피싱 감지 체인 (처음 사용할 때 한 번만 생성, 결과를 JSON으로 받음)"""
+        logger.debug("보이스피싱 감지 체인 생성")
+        
+        from langchain.chains import LLMChain
+        
+        prompt = get_phishing_detection_prompt()
+        
+        try:
+            return LLMChain(
+                llm=self.json_llm,
+                prompt=prompt,
+                verbose=self.config.get("debug", False)
+            )
+        except Exception as e:
+            logger.error(f"보이스피싱 감지 체인 생성 실패: {e}")
+            raise
+    
+    def get_conversation_chain(self):
+        """
+        기본 대화 체인 반환
+        
+        Returns:
+            LLMChain: 대화 체인
+        """
+        return self.conversation_chain
+    
     def get_rag_chain(self, retriever):
         """
-        RAG 체인 생성
+        RAG 체인 생성 (같은 검색기면 이전 체인 반환)
+        
+        질문 재작성 LLM 호출 없이 입력으로 바로 검색한 뒤 답변을 생성하는 LCEL 체인입니다.
         
         Args:
             retriever: 문서 검색기
             
         Returns:
-            ConversationalRetrievalChain: RAG 체인
+            Runnable: RAG 체인 (입력 {"input": ...}, 결과의 "answer"에 답변, "context"에 검색 문서)
         """
-        logger.debug("RAG 체인 생성")
-        
         if not retriever:
             raise ValueError("RAG 체인을 생성하려면 retriever가 필요합니다.")
         
+        # 같은 검색기로 만든 체인이 있으면 재사용
+        if retriever is self._rag_retriever:
+            return self._rag_chain
+        
+        logger.debug("RAG 체인 생성")
+        
         try:
             # 최신 LangChain에 맞게 RAG 체인 구성
             from langchain.chains import create_retrieval_chain
-            from langchain.chains.combine_documents import create_stuff_documents_chain
             
-            # 문서 체인 생성
-            prompt = get_rag_prompt()  # RAG용 프롬프트 가져오기
-            document_chain = create_stuff_documents_chain(self.llm, prompt)
-            
-            # 검색 체인 생성
-            retrieval_chain = create_retrieval_chain(retriever, document_chain)
+            # 검색 체인 생성 (문서 체인은 검색기와 상관없이 재사용)
+            retrieval_chain = create_retrieval_chain(retriever, self.rag_document_chain)
             
+            self._rag_retriever = retriever
+            self._rag_chain = retrieval_chain
             return retrieval_chain
         except Exception as e:
             logger.error(f"RAG 체인 생성 실패: {e}")
@@ -132,29 +200,21 @@ class ChainManager:
     
     def get_phishing_detection_chain(self):
         """
-        보이스피싱 감지 체인 생성
+        보이스피싱 감지 체인 반환
         
         Returns:
             LLMChain: 보이스피싱 감지 체인
         """
-        logger.debug("보이스피싱 감지 체인 생성")
-        
-        prompt = get_phishing_detection_prompt()
-        
-        try:
-            chain = LLMChain(
-                llm=self.llm,
-                prompt=prompt,
-                verbose=self.config.get("debug", False)
-            )
-            return chain
-        except Exception as e:
-            logger.error(f"보이스피싱 감지 체인 생성 실패: {e}")
-            raise
+        return self.phishing_detection_chain
     
     def clear_memory(self):
         """대화 기록 초기화"""
         logger.debug("대화 기록 초기화")
+        
+        # 메모리를 아직 만들지 않았으면 지울 것도 없음
+        if "memory" not in self.__dict__:
+            return
+        
         try:
             self.memory.clear()
         except Exception as e:
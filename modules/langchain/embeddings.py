@@ -1,15 +1,397 @@
 import os
+import json
+import time
+import queue
+import hashlib
 import logging
-from dotenv import load_dotenv
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+from cachetools import LRUCache
+from langchain_core.embeddings import Embeddings
+
+# 로컬 모듈 임포트
+from modules.utils.helpers import load_env
 
 # .env 파일 로드
-load_dotenv()
+load_env()
 
 logger = logging.getLogger(__name__)
 
+# 설정별로 한 번만 만든 임베딩 모델 (ChromaManager/검색기를 다시 만들어도 모델은 재사용)
+_MODEL_CACHE = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+class BatchedEmbeddings(Embeddings):
+    """동시에 들어온 임베딩 요청을 묶어서 한 번에 처리하는 래퍼 클래스"""
+    
+    def __init__(self, inner, batch_size=256, max_wait_ms=10, max_workers=4):
+        """
+        BatchedEmbeddings 초기화
+        
+        Args:
+            inner (Embeddings): 실제 임베딩 모델
+            batch_size (int, optional): 요청 1회당 최대 텍스트 수. 기본값은 256
+            max_wait_ms (int, optional): 쿼리를 모으기 위해 기다리는 최대 시간(ms). 기본값은 10
+            max_workers (int, optional): 동시에 보낼 배치 요청 수. 기본값은 4
+        """
+        self.inner = inner
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+    
+    def embed_documents(self, texts):
+        """
+        문서 임베딩 (길이순 정렬 후 배치 단위로 동시 요청)
+        
+        Args:
+            texts (list): 임베딩할 텍스트 목록
+            
+        Returns:
+            list: 입력 순서와 같은 순서의 임베딩 벡터 목록
+        """
+        if not texts:
+            return []
+        
+        # 비슷한 길이끼리 묶어 배치별 요청 크기를 고르게 맞춤
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batches = [order[i:i + self.batch_size] for i in range(0, len(order), self.batch_size)]
+        
+        def embed_batch(batch):
+            return self.inner.embed_documents([texts[i] for i in batch])
+        
+        if len(batches) == 1:
+            batch_vectors = [embed_batch(batches[0])]
+        else:
+            batch_vectors = list(self._executor.map(embed_batch, batches))
+        
+        # 원래 순서로 복원
+        vectors = [None] * len(texts)
+        for batch, embedded in zip(batches, batch_vectors):
+            for i, vector in zip(batch, embedded):
+                vectors[i] = vector
+        
+        return vectors
+    
+    def embed_query(self, text):
+        """
+        쿼리 임베딩 (다른 스레드의 쿼리와 묶어서 요청)
+        
+        Args:
+            text (str): 임베딩할 쿼리
+            
+        Returns:
+            list: 임베딩 벡터
+        """
+        if self.max_wait <= 0:
+            return self.inner.embed_query(text)
+        
+        future = Future()
+        self._queue.put((text, future))
+        self._ensure_worker()
+        return future.result()
+    
+    def _ensure_worker(self):
+        """쿼리 배치 처리 스레드 시작"""
+        if self._worker is not None:
+            return
+        
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_query_batches, daemon=True)
+                self._worker.start()
+    
+    def _run_query_batches(self):
+        """대기 중인 쿼리를 모아서 한 번의 요청으로 임베딩"""
+        while True:
+            pending = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            
+            while len(pending) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            
+            try:
+                if len(pending) == 1:
+                    vectors = [self.inner.embed_query(pending[0][0])]
+                else:
+                    logger.debug(f"쿼리 임베딩 배치 처리: {len(pending)}개")
+                    vectors = self.inner.embed_documents([text for text, _ in pending])
+                
+                for (_, future), vector in zip(pending, vectors):
+                    future.set_result(vector)
+            
+            except Exception as e:
+                logger.error(f"쿼리 임베딩 배치 처리 실패: {e}")
+                for _, future in pending:
+                    future.set_exception(e)
+
+class CachedEmbeddings(Embeddings):
+    """같은 텍스트의 임베딩을 재사용하는 캐시 래퍼 클래스 (메모리 LRU + SQLite)"""
+    
+    # SQLite 조회 1회당 최대 키 수 (SQLite 변수 개수 제한)
+    _LOOKUP_CHUNK = 500
+    
+    def __init__(self, inner, model_name, maxsize=10000, cache_path="./data/emb_cache.db"):
+        """
+        CachedEmbeddings 초기화
+        
+        Args:
+            inner (Embeddings): 실제 임베딩 모델
+            model_name (str): 임베딩 모델명 (캐시 키에 포함)
+            maxsize (int, optional): 메모리 캐시 최대 항목 수. 기본값은 10000
+            cache_path (str, optional): 디스크 캐시(SQLite) 경로. None이면 메모리 캐시만 사용
+        """
+        self.inner = inner
+        self.model_name = model_name
+        # 벡터는 float32 배열로 보관 (1536차원 기준 항목당 약 6KB, float 리스트는 약 49KB)
+        # 반환값도 이 값으로 만들므로 캐시 적중 여부와 상관없이 같은 텍스트는 같은 벡터를 받음
+        self._memory = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._db = self._open_db(cache_path) if cache_path else None
+    
+    def _open_db(self, cache_path):
+        """
+        디스크 캐시(SQLite) 열기
+        
+        Args:
+            cache_path (str): 캐시 파일 경로
+            
+        Returns:
+            sqlite3.Connection: DB 연결 또는 None (실패 시)
+        """
+        try:
+            os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+            
+            conn = sqlite3.connect(cache_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            conn.commit()
+            
+            logger.info(f"임베딩 디스크 캐시 사용: {cache_path}")
+            return conn
+        
+        except Exception as e:
+            logger.error(f"임베딩 디스크 캐시 열기 실패: {e}. 메모리 캐시만 사용합니다.")
+            return None
+    
+    def _key(self, text):
+        """
+        캐시 키 생성
+        
+        Args:
+            text (str): 임베딩할 텍스트
+            
+        Returns:
+            bytes: SHA-256 다이제스트 (모델명 + 텍스트)
+        """
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).digest()
+    
+    def _lookup(self, keys):
+        """
+        캐시에서 임베딩 조회 (메모리 -> 디스크 순서)
+        
+        Args:
+            keys (list): 캐시 키 목록
+            
+        Returns:
+            dict: {키: float32 임베딩 배열} (찾은 항목만)
+        """
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    found[key] = vector
+        
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if not missing or self._db is None:
+            return found
+        
+        try:
+            with self._lock:
+                for i in range(0, len(missing), self._LOOKUP_CHUNK):
+                    chunk = missing[i:i + self._LOOKUP_CHUNK]
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float64).astype(np.float32)
+                        self._memory[key] = vector
+                        found[key] = vector
+        except Exception as e:
+            logger.error(f"임베딩 디스크 캐시 조회 실패: {e}")
+        
+        return found
+    
+    def _store(self, items):
+        """
+        임베딩을 캐시에 저장
+        
+        Args:
+            items (dict): {키: 임베딩 벡터}
+            
+        Returns:
+            dict: {키: 메모리 캐시에 저장한 float32 배열}
+        """
+        arrays = {key: np.asarray(vector, dtype=np.float32) for key, vector in items.items()}
+        
+        with self._lock:
+            for key, vector in arrays.items():
+                self._memory[key] = vector
+            
+            if self._db is None:
+                return arrays
+            
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, np.asarray(vector, dtype=np.float64).tobytes()) for key, vector in items.items()]
+                )
+                self._db.commit()
+            except Exception as e:
+                logger.error(f"임베딩 디스크 캐시 저장 실패: {e}")
+        
+        return arrays
+    
+    def embed_documents(self, texts):
+        """
+        문서 임베딩 (캐시에 없는 텍스트만 한 번에 요청)
+        
+        Args:
+            texts (list): 임베딩할 텍스트 목록
+            
+        Returns:
+            list: 입력 순서와 같은 순서의 임베딩 벡터 목록
+        """
+        if not texts:
+            return []
+        
+        keys = [self._key(text) for text in texts]
+        found = self._lookup(keys)
+        
+        # 캐시에 없는 텍스트 (같은 텍스트는 한 번만 요청)
+        misses = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in misses:
+                misses[key] = text
+        
+        if misses:
+            logger.debug("임베딩 캐시: %d개 중 %d개 새로 요청", len(texts), len(misses))
+            vectors = self.inner.embed_documents(list(misses.values()))
+            found.update(self._store(dict(zip(misses, vectors))))
+        
+        # 호출자가 수정해도 캐시에 영향이 없도록 새 리스트로 반환
+        return [found[key].tolist() for key in keys]
+    
+    def embed_query(self, text):
+        """
+        쿼리 임베딩 (캐시에 있으면 API 호출 없이 반환)
+        
+        Args:
+            text (str): 임베딩할 쿼리
+            
+        Returns:
+            list: 임베딩 벡터
+        """
+        key = self._key(text)
+        vector = self._lookup([key]).get(key)
+        
+        if vector is None:
+            vector = self._store({key: self.inner.embed_query(text)})[key]
+        
+        return vector.tolist()
+
+def _embedding_cache_enabled(embedding_config):
+    """
+    임베딩 캐시 사용 여부 (환경 변수 ENABLE_EMBEDDING_CACHE가 설정 파일보다 우선)
+    
+    Args:
+        embedding_config (dict): 임베딩 설정
+        
+    Returns:
+        bool: 사용 여부
+    """
+    env_value = os.getenv("ENABLE_EMBEDDING_CACHE")
+    if env_value is not None:
+        return env_value.strip().lower() not in ("0", "false", "no", "off")
+    return embedding_config.get("cache_enabled", True)
+
+def _wrap_openai_embeddings(model_name, embedding_config, batch_size, max_wait_ms):
+    """
+    OpenAI 임베딩 모델을 배치 처리(및 캐시) 래퍼로 감싸서 반환
+    
+    Args:
+        model_name (str): 임베딩 모델명
+        embedding_config (dict): 임베딩 설정
+        batch_size (int): 요청 1회당 최대 텍스트 수
+        max_wait_ms (int): 쿼리를 모으기 위해 기다리는 최대 시간(ms)
+        
+    Returns:
+        Embeddings: 임베딩 모델 객체
+    """
+    from langchain_openai import OpenAIEmbeddings
+    
+    # OpenAI 임베딩은 쿼리/문서 임베딩이 같으므로 요청을 묶어서 처리
+    embeddings = BatchedEmbeddings(
+        OpenAIEmbeddings(
+            model=model_name
+            # API 키는 환경 변수에서 자동으로 로드
+        ),
+        batch_size=batch_size,
+        max_wait_ms=max_wait_ms
+    )
+    
+    # 같은 텍스트는 다시 요청하지 않도록 캐시 (캐시 적중 시 배치 대기도 생략)
+    if _embedding_cache_enabled(embedding_config):
+        embeddings = CachedEmbeddings(
+            embeddings,
+            model_name,
+            maxsize=embedding_config.get("cache_size", 10000),
+            cache_path=embedding_config.get("cache_path", "./data/emb_cache.db")
+        )
+    
+    return embeddings
+
 def get_embedding_model(config=None):
     """
-    구성에 따라 적절한 임베딩 모델 반환
+    구성에 따라 적절한 임베딩 모델 반환 (같은 임베딩 설정이면 프로세스당 한 번만 생성)
+    
+    Args:
+        config (dict, optional): 구성 정보. 기본값은 None
+    
+    Returns:
+        Embeddings: 임베딩 모델 객체
+    """
+    embedding_config = (config or {}).get("embedding", {})
+    cache_key = json.dumps(embedding_config, sort_keys=True, default=str)
+    
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(cache_key)
+        if model is None:
+            model = _create_embedding_model(config)
+            _MODEL_CACHE[cache_key] = model
+    
+    return model
+
+def _create_embedding_model(config=None):
+    """
+    구성에 따라 적절한 임베딩 모델 생성
     
     Args:
         config (dict, optional): 구성 정보. 기본값은 None
@@ -27,6 +409,10 @@ def get_embedding_model(config=None):
         provider = embedding_config.get("provider", provider)
         model_name = embedding_config.get("model_name", model_name)
     
+    # 배치 설정
+    batch_size = embedding_config.get("batch_size", 256)
+    max_wait_ms = embedding_config.get("max_wait_ms", 10)
+    
     logger.info(f"임베딩 모델 로드 중: provider={provider}, model={model_name}")
     
     # API 키 환경 변수 확인
@@ -39,12 +425,8 @@ def get_embedding_model(config=None):
     
     if provider == "openai":
         try:
-            from langchain_openai import OpenAIEmbeddings
             logger.info("langchain_openai 패키지 사용 중")
-            return OpenAIEmbeddings(
-                model=model_name
-                # API 키는 환경 변수에서 자동으로 로드
-            )
+            return _wrap_openai_embeddings(model_name, embedding_config, batch_size, max_wait_ms)
         except Exception as e:
             logger.error(f"OpenAI 임베딩 모델 초기화 실패: {e}")
             raise
@@ -60,8 +442,7 @@ def get_embedding_model(config=None):
     else:
         logger.warning(f"지원되지 않는 임베딩 제공자: {provider}. OpenAI 임베딩을 기본값으로 사용합니다.")
         try:
-            from langchain_openai import OpenAIEmbeddings
-            return OpenAIEmbeddings(model=model_name)
+            return _wrap_openai_embeddings(model_name, embedding_config, batch_size, max_wait_ms)
         except Exception as e:
             logger.error(f"기본 임베딩 모델 초기화 실패: {e}")
             raise
\ No newline at end of file
@@ -1,51 +1,62 @@
-from langchain.prompts import PromptTemplate
-from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# 프롬프트 템플릿은 변하지 않으므로 함수마다 한 번만 생성하고 같은 객체를 재사용
+@lru_cache(maxsize=None)
 def get_conversation_prompt():
     """
     기본 대화 프롬프트 템플릿 생성
     
+    고정된 시스템 메시지 뒤에 이전 대화 메시지와 현재 입력을 차례로 붙여, 매 턴 앞부분이
+    바이트 단위로 같게 유지되도록 합니다 (제공자 측 프롬프트 접두사 캐시 활용).
+    
     Returns:
-        PromptTemplate: 대화 프롬프트 템플릿
+        ChatPromptTemplate: 대화 프롬프트 템플릿
     """
     logger.debug("기본 대화 프롬프트 템플릿 생성")
     
-    template = """당신은 '복도리'라는 AI 비서입니다. 사용자에게 친절하고 도움이 되는 방식으로 응답해 주세요.
+    from langchain.prompts import ChatPromptTemplate, HumanMessagePromptTemplate, MessagesPlaceholder, SystemMessagePromptTemplate
     
+    system_template = """당신은 '복도리'라는 AI 비서입니다. 사용자에게 친절하고 도움이 되는 방식으로 응답해 주세요.
+
 특히 다음 사항에 유의하세요:
 - 보이스피싱과 같은 금융 사기를 감지하고 경고해야 합니다
 - 계좌번호, 비밀번호, OTP 등의 민감한 금융 정보 요청에 주의해야 합니다
 - 간결하고 자연스러운 대화체로 응답하세요
-- 한국어로 대화합니다
-
-이전 대화 기록:
-{chat_history}
-
-사용자: {input}
-복도리: """
+- 한국어로 대화합니다"""
     
-    return PromptTemplate(
-        input_variables=["chat_history", "input"],
-        template=template
-    )
+    system_message_prompt = SystemMessagePromptTemplate.from_template(system_template)
+    
+    human_template = "{input}"
+    human_message_prompt = HumanMessagePromptTemplate.from_template(human_template)
+    
+    chat_prompt = ChatPromptTemplate.from_messages([
+        system_message_prompt,
+        MessagesPlaceholder(variable_name="chat_history"),
+        human_message_prompt
+    ])
+    
+    return chat_prompt
 
+@lru_cache(maxsize=None)
 def get_rag_prompt():
     """
     RAG 시스템용 프롬프트 템플릿 생성
     
+    검색 문서는 매번 달라지므로 고정된 지침 뒤의 별도 시스템 메시지에 넣습니다.
+    
     Returns:
         ChatPromptTemplate: RAG 프롬프트 템플릿
     """
     logger.debug("RAG 프롬프트 템플릿 생성")
     
+    from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
+    
     system_template = """당신은 '복도리'라는 AI 비서입니다. 사용자에게 친절하고 도움이 되는 방식으로 응답해 주세요.
 
-다음 정보를 참고하여 사용자의 질문에 답변하세요:
-
-{context}
+아래에 주어지는 정보를 참고하여 사용자의 질문에 답변하세요.
 
 특징:
 - 주어진 정보에 기반하여 정확하게 답변하세요
@@ -55,16 +66,23 @@ def get_rag_prompt():
     
     system_message_prompt = SystemMessagePromptTemplate.from_template(system_template)
     
+    context_template = """참고 정보:
+
+{context}"""
+    context_message_prompt = SystemMessagePromptTemplate.from_template(context_template)
+    
     human_template = "{input}"
     human_message_prompt = HumanMessagePromptTemplate.from_template(human_template)
     
     chat_prompt = ChatPromptTemplate.from_messages([
         system_message_prompt,
+        context_message_prompt,
         human_message_prompt
     ])
     
     return chat_prompt
 
+@lru_cache(maxsize=None)
 def get_phishing_detection_prompt():
     """
     보이스피싱 감지용 프롬프트 템플릿 생성
@@ -74,6 +92,8 @@ def get_phishing_detection_prompt():
     """
     logger.debug("보이스피싱 감지 프롬프트 템플릿 생성")
     
+    from langchain.prompts import PromptTemplate
+    
     template = """다음 대화 내용에서 보이스피싱 사기 시도가 있는지 분석해주세요:
 
 대화 내용: {text}
@@ -85,12 +105,13 @@ def get_phishing_detection_prompt():
 4. 기존 대출 상환을 위한 신규 대출 유도
 5. 정부지원금, 환급금 등을 빙자한 금전 요구
 
-분석 결과를 다음 형식으로 제공해주세요:
-- 보이스피싱 확률(0-1 사이 숫자): 의심 정도를 나타내는 확률값
-- 위험 수준(안전/주의/경고/위험): 전반적인 위험도
-- 의심 키워드: 발견된 의심 키워드 목록
-- 설명: 왜 의심되는지 또는 안전한지에 대한 간략한 설명
-- 대응 방법: 사용자에게 제공할 적절한 대응 방법"""
+분석 결과를 다른 설명 없이 다음 키를 가진 JSON 객체로만 응답해주세요:
+- "score": 보이스피싱 확률 (0-1 사이 숫자)
+- "risk_level": 전반적인 위험도 ("안전", "주의", "경고", "위험" 중 하나)
+- "keywords": 발견된 의심 키워드 목록 (문자열 배열)
+- "explanation": 왜 의심되는지 또는 안전한지에 대한 간략한 설명
+
+예시: {{"score": 0.8, "risk_level": "경고", "keywords": ["검찰", "송금"], "explanation": "검찰을 사칭하며 송금을 요구합니다."}}"""
     
     return PromptTemplate(
         input_variables=["text"],
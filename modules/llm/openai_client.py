@@ -1,14 +1,44 @@
 import os
-import openai
-from openai import OpenAI
-from dotenv import load_dotenv
 import logging
+import threading
+import numpy as np
+from cachetools import LRUCache
+from tenacity import before_sleep_log, retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+# 로컬 모듈 임포트
+from modules.utils.helpers import load_env
 
 # .env 파일 로드
-load_dotenv()
+load_env()
 
 logger = logging.getLogger(__name__)
 
+def _is_transient_error(error):
+    """
+    재시도하면 성공할 수 있는 일시적 API 오류인지 확인
+    (속도 제한, 연결 실패, 시간 초과, 5xx 서버 오류, 408/409 응답 - SDK 기본 재시도 대상과 동일)
+    
+    Args:
+        error (BaseException): 발생한 예외
+        
+    Returns:
+        bool: 일시적 오류 여부
+    """
+    import openai
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError,
+                          openai.APITimeoutError, openai.InternalServerError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code in (408, 409)
+
+# 일시적 API 오류는 지수 백오프(+지터)로 최대 3번까지 시도하고, 그래도 실패하면 원래 예외 발생
+_retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=0.5, max=5),
+    retry=retry_if_exception(_is_transient_error),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True
+)
+
 class OpenAIClient:
     """OpenAI API와 상호작용하는 클라이언트 클래스"""
     
@@ -24,11 +54,51 @@ class OpenAIClient:
         key_type = "project" if self.api_key.startswith("sk-proj-") else "personal"
         logger.info(f"OpenAI API 키 유형: {key_type}")
         
-        # 최신 OpenAI 클라이언트 사용
-        self.client = OpenAI(api_key=self.api_key)
+        # 최신 OpenAI 클라이언트 사용 (openai 패키지는 임포트 비용이 크므로 여기서 로드)
+        import httpx
+        from openai import AsyncOpenAI, OpenAI
+        
+        # 연결 풀을 명시적으로 구성해 요청마다 TLS 핸드셰이크를 다시 하지 않도록 함
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        timeout = httpx.Timeout(30.0, connect=5.0)
+        self._http_client = httpx.Client(limits=limits, timeout=timeout)
+        self._async_http_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        
+        # 재시도는 _retry_transient에서 처리하므로 SDK 자체 재시도는 끔 (중복 재시도 방지)
+        self.client = OpenAI(api_key=self.api_key, http_client=self._http_client, max_retries=0)
+        self.async_client = AsyncOpenAI(api_key=self.api_key, http_client=self._async_http_client, max_retries=0)
         self.model_name = model_name
+        
+        # (모델명, 텍스트)별 임베딩 캐시 (float 리스트 대신 float32 배열로 보관해 메모리 절약)
+        self._embedding_cache = LRUCache(maxsize=1024)
+        self._embedding_lock = threading.Lock()
+        self._embedding_hits = 0
+        self._embedding_misses = 0
         logger.info(f"OpenAI 클라이언트 초기화 완료: 모델={self.model_name}")
     
+    def close(self):
+        """HTTP 연결 풀 닫기"""
+        self._http_client.close()
+    
+    async def aclose(self):
+        """비동기 HTTP 연결 풀 닫기"""
+        await self._async_http_client.aclose()
+    
+    @_retry_transient
+    def _create_chat_completion(self, **kwargs):
+        """채팅 완성 요청 (일시적 오류는 재시도)"""
+        return self.client.chat.completions.create(**kwargs)
+    
+    @_retry_transient
+    async def _acreate_chat_completion(self, **kwargs):
+        """비동기 채팅 완성 요청 (일시적 오류는 재시도)"""
+        return await self.async_client.chat.completions.create(**kwargs)
+    
+    @_retry_transient
+    def _create_embedding(self, **kwargs):
+        """임베딩 요청 (일시적 오류는 재시도)"""
+        return self.client.embeddings.create(**kwargs)
+    
     def generate_text(self, prompt, temperature=0.7, max_tokens=1000):
         """
         텍스트 생성
@@ -44,7 +114,7 @@ class OpenAIClient:
         try:
             logger.debug(f"텍스트 생성 요청: {prompt[:50]}...")
             
-            response = self.client.chat.completions.create(
+            response = self._create_chat_completion(
                 model=self.model_name,
                 messages=[
                     {"role": "user", "content": prompt}
@@ -60,6 +130,37 @@ class OpenAIClient:
             logger.error(f"텍스트 생성 실패: {e}")
             return f"오류 발생: {e}"
     
+    async def generate_text_async(self, prompt, temperature=0.7, max_tokens=1000):
+        """
+        텍스트 생성 (비동기, 응답을 기다리는 동안 이벤트 루프를 막지 않음)
+        
+        Args:
+            prompt (str): 입력 프롬프트
+            temperature (float, optional): 생성 다양성 (0-1). 기본값은 0.7
+            max_tokens (int, optional): 최대 토큰 수. 기본값은 1000
+            
+        Returns:
+            str: 생성된 텍스트
+        """
+        try:
+            logger.debug(f"비동기 텍스트 생성 요청: {prompt[:50]}...")
+            
+            response = await self._acreate_chat_completion(
+                model=self.model_name,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            
+            logger.debug("비동기 텍스트 생성 성공")
+            return response.choices[0].message.content
+        
+        except Exception as e:
+            logger.error(f"비동기 텍스트 생성 실패: {e}")
+            return f"오류 발생: {e}"
+    
     def generate_stream(self, prompt, temperature=0.7, max_tokens=1000):
         """
         스트리밍 방식으로 텍스트 생성 (생성형 제너레이터)
@@ -75,7 +176,7 @@ class OpenAIClient:
         try:
             logger.debug(f"스트리밍 텍스트 생성 요청: {prompt[:50]}...")
             
-            response = self.client.chat.completions.create(
+            response = self._create_chat_completion(
                 model=self.model_name,
                 messages=[
                     {"role": "user", "content": prompt}
@@ -106,17 +207,104 @@ class OpenAIClient:
         Returns:
             list: 임베딩 벡터
         """
+        # 같은 텍스트는 API를 다시 호출하지 않음
+        cache_key = (model_name, text)
+        with self._embedding_lock:
+            cached = self._embedding_cache.get(cache_key)
+            if cached is not None:
+                self._embedding_hits += 1
+            else:
+                self._embedding_misses += 1
+        if cached is not None:
+            return cached.tolist()
+        
         try:
             logger.debug(f"임베딩 생성 요청: {text[:50]}...")
             
-            response = self.client.embeddings.create(
+            response = self._create_embedding(
                 model=model_name,
                 input=text
             )
             
             logger.debug("임베딩 생성 성공")
-            return response.data[0].embedding
+            embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+            
+            with self._embedding_lock:
+                self._embedding_cache[cache_key] = embedding
+            return embedding.tolist()
         
         except Exception as e:
             logger.error(f"임베딩 생성 실패: {e}")
-            raise ValueError(f"임베딩 생성 중 오류 발생: {e}")
\ No newline at end of file
+            raise ValueError(f"임베딩 생성 중 오류 발생: {e}")
+    
+    def create_embeddings(self, texts, model_name="text-embedding-ada-002", batch_size=2048):
+        """
+        여러 텍스트의 임베딩을 배치 요청으로 생성 (요청 1회에 최대 batch_size개)
+        
+        Args:
+            texts (list): 임베딩할 텍스트 목록
+            model_name (str, optional): 임베딩 모델명. 기본값은 'text-embedding-ada-002'
+            batch_size (int, optional): 요청 1회당 최대 텍스트 수 (API 한도 2048). 기본값은 2048
+            
+        Returns:
+            list: 입력 순서와 같은 순서의 임베딩 벡터 목록
+        """
+        embeddings = [None] * len(texts)
+        
+        # 캐시에 있는 텍스트는 제외하고 요청
+        missing = []
+        with self._embedding_lock:
+            for i, text in enumerate(texts):
+                cached = self._embedding_cache.get((model_name, text))
+                if cached is not None:
+                    embeddings[i] = cached.tolist()
+                else:
+                    missing.append(i)
+            self._embedding_hits += len(texts) - len(missing)
+            self._embedding_misses += len(missing)
+        
+        try:
+            for start in range(0, len(missing), batch_size):
+                batch = missing[start:start + batch_size]
+                logger.debug(f"배치 임베딩 생성 요청: {len(batch)}개")
+                
+                response = self._create_embedding(
+                    model=model_name,
+                    input=[texts[i] for i in batch]
+                )
+                
+                # 응답은 index 필드로 입력 위치를 알려줌
+                with self._embedding_lock:
+                    for item in response.data:
+                        i = batch[item.index]
+                        embedding = np.asarray(item.embedding, dtype=np.float32)
+                        embeddings[i] = embedding.tolist()
+                        self._embedding_cache[(model_name, texts[i])] = embedding
+            
+            logger.debug(f"배치 임베딩 생성 성공: {len(texts)}개 (API 요청 {len(missing)}개)")
+            return embeddings
+        
+        except Exception as e:
+            logger.error(f"배치 임베딩 생성 실패: {e}")
+            raise ValueError(f"배치 임베딩 생성 중 오류 발생: {e}")
+    
+    def get_embedding_cache_stats(self):
+        """
+        임베딩 캐시 통계 조회
+        
+        Returns:
+            dict: 적중/미스 횟수, 적중률, 현재/최대 항목 수
+        """
+        with self._embedding_lock:
+            hits = self._embedding_hits
+            misses = self._embedding_misses
+            size = len(self._embedding_cache)
+        
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+            "size": size,
+            "maxsize": self._embedding_cache.maxsize
+        }
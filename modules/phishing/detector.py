@@ -1,17 +1,88 @@
-import json
 import re
 import os
 import logging
-from dotenv import load_dotenv
+from functools import lru_cache
+
+# pyahocorasick이 있으면 한 번의 순회로 모든 키워드 검색
+try:
+    import ahocorasick
+    use_ahocorasick = True
+except ImportError:
+    ahocorasick = None
+    use_ahocorasick = False
+
+# tiktoken이 있으면 LLM 입력 길이를 토큰 단위로 제한
+try:
+    import tiktoken
+    use_tiktoken = True
+except ImportError:
+    tiktoken = None
+    use_tiktoken = False
 
 # 로컬 모듈 임포트
 from modules.langchain.chains import ChainManager
+from modules.utils.helpers import from_json, load_env, load_json_file
 
 # .env 파일 로드
-load_dotenv()
+load_env()
 
 logger = logging.getLogger(__name__)
 
+# 키워드 위험 수준
+RISK_LEVELS = ("high_risk", "medium_risk", "low_risk")
+
+# JSON이 아닌 LLM 결과 파싱용 정규식 (모듈 로드 시 한 번만 컴파일)
+_PROBABILITY_RE = re.compile(r'확률[:\s]*([0-9.]+)')
+_LEVEL_RE = re.compile(r'위험[^:]*[:\s]*(안전|주의|경고|위험)')
+_KEYWORDS_RE = re.compile(r'키워드[^:]*[:\s]*(.*?)(?:\n|$)')
+_EXPLANATION_RE = re.compile(r'설명[^:]*[:\s]*(.*?)(?:\n|대응|\Z)', re.DOTALL)
+
+# LLM 결과의 위험 수준 표현 -> 위험 수준
+LLM_RISK_LEVELS = {"안전": "safe", "주의": "low", "경고": "medium", "위험": "high"}
+
+@lru_cache(maxsize=8)
+def _compile_keyword_matchers(keywords):
+    """
+    키워드 집합으로 검색용 정규식과 Aho-Corasick 오토마톤 생성 (같은 키워드 집합이면 인스턴스끼리 공유)
+    
+    Args:
+        keywords (frozenset): 소문자로 변환한 키워드 (빈 문자열 제외)
+        
+    Returns:
+        tuple: (키워드 포함 여부 검사용 정규식, 오토마톤). 키워드가 없으면 None, 오토마톤은 pyahocorasick이 없어도 None
+    """
+    if not keywords:
+        return None, None
+    
+    # 긴 키워드 우선 (검색 결과에는 영향 없음, 매칭 시 되돌아가기 감소)
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    prefilter = re.compile(alternation)
+    
+    automaton = None
+    if use_ahocorasick:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+    
+    return prefilter, automaton
+
+@lru_cache(maxsize=4)
+def _get_encoding(model_name):
+    """
+    모델별 토크나이저 로드 (모델별로 한 번만 로드)
+    
+    Args:
+        model_name (str): LLM 모델명
+        
+    Returns:
+        tiktoken.Encoding: 토크나이저 (알 수 없는 모델이면 cl100k_base)
+    """
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
 class PhishingDetector:
     """보이스피싱 감지 클래스"""
     
@@ -27,10 +98,33 @@ class PhishingDetector:
         # 보이스피싱 패턴 로드
         self.patterns = self._load_patterns()
         
+        # 위험 수준별 (원래 키워드, 소문자 키워드) 목록
+        self._level_keywords = {
+            level: [(keyword, keyword.lower()) for keyword in self.patterns.get(level, []) if isinstance(keyword, str)]
+            for level in RISK_LEVELS
+        }
+        
+        # 소문자 키워드 -> [(패턴 순서, 위험 수준, 원래 키워드)] (검색된 키워드만 확인하는 데 사용)
+        self._keyword_entries = {}
+        ordered = ((level, keyword, lowered) for level in RISK_LEVELS for keyword, lowered in self._level_keywords[level])
+        for order, (level, keyword, lowered) in enumerate(ordered):
+            self._keyword_entries.setdefault(lowered, []).append((order, level, keyword))
+        
+        # 전체 키워드 정규식(키워드가 없는 입력을 한 번에 걸러냄)과 Aho-Corasick 오토마톤
+        # (패턴이 같으면 이전 인스턴스에서 만든 것을 재사용)
+        keywords = frozenset(lowered for pairs in self._level_keywords.values() for _, lowered in pairs if lowered)
+        self.keyword_prefilter, self._automaton = _compile_keyword_matchers(keywords)
+        
         # 임계값 설정
         phishing_config = self.config.get("phishing_detection", {})
         self.threshold = phishing_config.get("threshold", 0.7)
         
+        # 규칙 기반 점수가 이 값 이상이고 키워드가 3개 이상이면 LLM 분석 생략 (결과가 바뀌지 않음)
+        self.skip_llm_above = phishing_config.get("skip_llm_above", 0.9)
+        
+        # LLM에 보낼 최대 입력 토큰 수 (넘으면 최근 대화만 남김)
+        self.max_input_tokens = phishing_config.get("max_input_tokens", 1024)
+        
         # 보이스피싱 감지용 LLM 체인 생성
         self.chain_manager = ChainManager(self.config)
         
@@ -54,8 +148,7 @@ class PhishingDetector:
         
         try:
             if os.path.exists(patterns_path):
-                with open(patterns_path, 'r', encoding='utf-8') as f:
-                    patterns = json.load(f)
+                patterns = load_json_file(patterns_path)
                 
                 # 기본 키가 있는지 확인
                 if all(k in patterns for k in ["high_risk", "medium_risk", "low_risk"]):
@@ -104,15 +197,29 @@ class PhishingDetector:
             "low_risk": []
         }
         
-        # 키워드 검색
-        for level, keywords in self.patterns.items():
-            for keyword in keywords:
-                # 키워드 타입 검증 추가
-                if not isinstance(keyword, str):
-                    continue
-                
-                if keyword.lower() in normalized_text:
-                    detected_keywords[level].append(keyword)
+        if self._automaton is not None:
+            # 한 번의 순회로 텍스트에 나온 키워드를 모두 수집 (겹치는 출현 포함)
+            found = {keyword for _, keyword in self._automaton.iter(normalized_text)}
+            if not found:
+                return {"risk_level": "safe", "score": 0.0, "keywords": [], "explanation": "보이스피싱 징후가 감지되지 않았습니다."}
+            
+            # 빈 키워드는 항상 포함된 것으로 간주 (부분 문자열 검사와 동일)
+            found.add("")
+            
+            # 나온 키워드의 패턴 항목만 패턴 순서대로 추가
+            entries = sorted(entry for keyword in found for entry in self._keyword_entries.get(keyword, ()))
+            for _, level, keyword in entries:
+                detected_keywords[level].append(keyword)
+        else:
+            # 키워드가 하나도 없으면 개별 검색 생략
+            if self.keyword_prefilter is None or not self.keyword_prefilter.search(normalized_text):
+                return {"risk_level": "safe", "score": 0.0, "keywords": [], "explanation": "보이스피싱 징후가 감지되지 않았습니다."}
+            
+            # 패턴 순서대로 키워드 확인 (version 등 위험 수준이 아닌 항목은 제외)
+            for level in RISK_LEVELS:
+                for keyword, lowered in self._level_keywords[level]:
+                    if lowered in normalized_text:
+                        detected_keywords[level].append(keyword)
         
         # 점수 계산
         score = (
@@ -181,7 +288,7 @@ class PhishingDetector:
             chain = self.chain_manager.get_phishing_detection_chain()
             
             # 텍스트 분석
-            result = chain.run(text=text)
+            result = chain.run(text=self._truncate_for_llm(text))
             
             # 결과 파싱
             parsed = self._parse_llm_result(result)
@@ -194,6 +301,70 @@ class PhishingDetector:
             # 실패 시 규칙 기반 분석으로 대체
             return self.detect_with_patterns(text)
     
+    async def detect_with_llm_async(self, text):
+        """
+        LLM 기반 보이스피싱 감지 (비동기, 응답을 기다리는 동안 이벤트 루프를 막지 않음)
+        
+        Args:
+            text (str): 분석할 텍스트
+            
+        Returns:
+            dict: 감지 결과
+        """
+        # 타입 검증 추가
+        if not isinstance(text, str):
+            try:
+                text = str(text)
+                logger.warning(f"문자열이 아닌 입력을 문자열로 변환: {type(text).__name__} -> str")
+            except Exception as e:
+                logger.error(f"텍스트 변환 실패: {e}")
+                return {"risk_level": "unknown", "score": 0, "keywords": [], "explanation": "유효하지 않은 텍스트 형식입니다."}
+        
+        if not text or len(text) < 10:
+            return {"risk_level": "unknown", "score": 0, "keywords": [], "explanation": "텍스트가 너무 짧습니다."}
+        
+        try:
+            # 보이스피싱 감지 체인 가져오기
+            chain = self.chain_manager.get_phishing_detection_chain()
+            
+            # 텍스트 분석
+            result = await chain.arun(text=self._truncate_for_llm(text))
+            
+            # 결과 파싱
+            return self._parse_llm_result(result)
+        
+        except Exception as e:
+            logger.error(f"LLM 기반 보이스피싱 감지 실패: {e}")
+            
+            # 실패 시 규칙 기반 분석으로 대체
+            return self.detect_with_patterns(text)
+    
+    def _truncate_for_llm(self, text):
+        """
+        LLM 입력을 최근 max_input_tokens 토큰으로 자르기 (보이스피싱 징후는 최근 대화에 나타남)
+        
+        Args:
+            text (str): 분석할 텍스트
+            
+        Returns:
+            str: 잘린 텍스트 (제한 이내면 그대로)
+        """
+        # 토큰 수는 UTF-8 바이트 수(글자당 최대 4바이트)를 넘지 않으므로 짧은 텍스트는 인코딩 생략
+        if len(text) * 4 <= self.max_input_tokens:
+            return text
+        
+        if not use_tiktoken:
+            # tiktoken이 없으면 글자 수 기준으로 자름 (한국어는 대체로 글자당 1토큰 이상)
+            return text[-self.max_input_tokens:]
+        
+        encoding = _get_encoding(self.chain_manager.model_name)
+        tokens = encoding.encode(text)
+        if len(tokens) <= self.max_input_tokens:
+            return text
+        
+        logger.debug(f"LLM 입력 자름: {len(tokens)} -> {self.max_input_tokens} 토큰")
+        return encoding.decode(tokens[-self.max_input_tokens:])
+    
     def _parse_llm_result(self, result):
         """
         LLM 결과 파싱
@@ -227,37 +398,16 @@ class PhishingDetector:
                 "explanation": "분석 결과를 해석할 수 없습니다."
             }
             
-            # 확률 추출 시도
-            probability_match = re.search(r'확률[:\s]*([0-9.]+)', result)
-            if probability_match:
-                try:
-                    parsed["score"] = float(probability_match.group(1))
-                except (ValueError, TypeError):
-                    parsed["score"] = 0
-            
-            # 위험 수준 추출 시도
-            level_match = re.search(r'위험[^:]*[:\s]*(안전|주의|경고|위험)', result)
-            if level_match:
-                level = level_match.group(1)
-                if level == "안전":
-                    parsed["risk_level"] = "safe"
-                elif level == "주의":
-                    parsed["risk_level"] = "low"
-                elif level == "경고":
-                    parsed["risk_level"] = "medium"
-                elif level == "위험":
-                    parsed["risk_level"] = "high"
-            
-            # 키워드 추출 시도
-            keywords_match = re.search(r'키워드[^:]*[:\s]*(.*?)(?:\n|$)', result)
-            if keywords_match:
-                keywords_str = keywords_match.group(1).strip()
-                parsed["keywords"] = [k.strip() for k in keywords_str.split(',') if k.strip()]
+            # JSON 모드 결과 파싱 (JSON 객체가 아니면 텍스트 형식으로 파싱)
+            try:
+                data = from_json(result)
+            except ValueError:
+                data = None
             
-            # 설명 추출 시도
-            explanation_match = re.search(r'설명[^:]*[:\s]*(.*?)(?:\n|대응|\Z)', result, re.DOTALL)
-            if explanation_match:
-                parsed["explanation"] = explanation_match.group(1).strip()
+            if isinstance(data, dict):
+                self._fill_from_json(parsed, data)
+            else:
+                self._fill_from_text(parsed, result)
             
             return parsed
         
@@ -270,6 +420,73 @@ class PhishingDetector:
                 "explanation": "분석 결과를 해석할 수 없습니다."
             }
     
+    def _fill_from_json(self, parsed, data):
+        """
+        JSON 객체 형식의 LLM 결과로 파싱 결과 채우기
+        
+        Args:
+            parsed (dict): 채울 파싱 결과
+            data (dict): LLM이 반환한 JSON 객체
+        """
+        # 확률
+        try:
+            parsed["score"] = float(data.get("score") or 0)
+        except (ValueError, TypeError):
+            parsed["score"] = 0
+        
+        # 위험 수준 (한국어 표현 또는 영문 위험 수준)
+        level = data.get("risk_level")
+        if isinstance(level, str):
+            level = level.strip()
+            if level in LLM_RISK_LEVELS:
+                parsed["risk_level"] = LLM_RISK_LEVELS[level]
+            elif level in LLM_RISK_LEVELS.values():
+                parsed["risk_level"] = level
+        
+        # 키워드 (배열 또는 쉼표로 구분된 문자열)
+        keywords = data.get("keywords")
+        if isinstance(keywords, str):
+            keywords = keywords.split(',')
+        if isinstance(keywords, list):
+            parsed["keywords"] = [k.strip() for k in keywords if isinstance(k, str) and k.strip()]
+        
+        # 설명
+        explanation = data.get("explanation")
+        if isinstance(explanation, str) and explanation.strip():
+            parsed["explanation"] = explanation.strip()
+    
+    def _fill_from_text(self, parsed, result):
+        """
+        텍스트 형식의 LLM 결과로 파싱 결과 채우기
+        
+        Args:
+            parsed (dict): 채울 파싱 결과
+            result (str): LLM 결과 문자열
+        """
+        # 확률 추출 시도
+        probability_match = _PROBABILITY_RE.search(result)
+        if probability_match:
+            try:
+                parsed["score"] = float(probability_match.group(1))
+            except (ValueError, TypeError):
+                parsed["score"] = 0
+        
+        # 위험 수준 추출 시도
+        level_match = _LEVEL_RE.search(result)
+        if level_match:
+            parsed["risk_level"] = LLM_RISK_LEVELS[level_match.group(1)]
+        
+        # 키워드 추출 시도
+        keywords_match = _KEYWORDS_RE.search(result)
+        if keywords_match:
+            keywords_str = keywords_match.group(1).strip()
+            parsed["keywords"] = [k.strip() for k in keywords_str.split(',') if k.strip()]
+        
+        # 설명 추출 시도
+        explanation_match = _EXPLANATION_RE.search(result)
+        if explanation_match:
+            parsed["explanation"] = explanation_match.group(1).strip()
+    
     def detect(self, text):
         """
         텍스트에서 보이스피싱 감지 (패턴 기반 + LLM 기반)
@@ -301,18 +518,123 @@ class PhishingDetector:
         
         # 규칙 기반 분석 점수가 낮은 경우 LLM 분석 스킵
         if pattern_result["score"] < 0.2:
-            return {
-                "is_phishing": False,
-                "risk_level": pattern_result["risk_level"],
-                "score": pattern_result["score"],
-                "keywords": pattern_result["keywords"],
-                "explanation": pattern_result["explanation"],
-                "method": "pattern"
-            }
+            return self._pattern_only_result(pattern_result)
+        
+        # 규칙 기반 분석만으로 고위험이 확실하면 LLM 분석 스킵
+        if self._is_definite_phishing(pattern_result):
+            return self._pattern_fast_result(pattern_result)
         
         # LLM 기반 분석
         llm_result = self.detect_with_llm(text)
         
+        return self._combine_results(pattern_result, llm_result)
+    
+    async def detect_async(self, text):
+        """
+        텍스트에서 보이스피싱 감지 (비동기, 패턴 기반 + LLM 기반)
+        
+        규칙 기반 분석은 바로 계산하고, LLM 분석이 필요한 경우에만 비동기로 요청합니다.
+        
+        Args:
+            text (str): 분석할 텍스트
+            
+        Returns:
+            dict: 감지 결과
+        """
+        # 타입 검증 추가
+        if not isinstance(text, str):
+            try:
+                text = str(text)
+                logger.warning(f"문자열이 아닌 입력을 문자열로 변환: {type(text).__name__} -> str")
+            except Exception as e:
+                logger.error(f"텍스트 변환 실패: {e}")
+                return {
+                    "is_phishing": False,
+                    "risk_level": "unknown",
+                    "score": 0,
+                    "keywords": [],
+                    "explanation": "유효하지 않은 텍스트 형식입니다.",
+                    "method": "none"
+                }
+        
+        # 규칙 기반 분석
+        pattern_result = self.detect_with_patterns(text)
+        
+        # 규칙 기반 분석 점수가 낮은 경우 LLM 분석 스킵
+        if pattern_result["score"] < 0.2:
+            return self._pattern_only_result(pattern_result)
+        
+        # 규칙 기반 분석만으로 고위험이 확실하면 LLM 분석 스킵
+        if self._is_definite_phishing(pattern_result):
+            return self._pattern_fast_result(pattern_result)
+        
+        # LLM 기반 분석
+        llm_result = await self.detect_with_llm_async(text)
+        
+        return self._combine_results(pattern_result, llm_result)
+    
+    def _is_definite_phishing(self, pattern_result):
+        """
+        규칙 기반 분석만으로 고위험 판정이 확실한지 확인
+        
+        LLM 점수와 합칠 때는 더 큰 점수를 쓰므로, 규칙 기반 점수가 이미 임계값 이상이면
+        LLM 결과와 관계없이 고위험으로 판정됩니다.
+        
+        Args:
+            pattern_result (dict): 규칙 기반 감지 결과
+            
+        Returns:
+            bool: LLM 분석 생략 여부
+        """
+        score = pattern_result["score"]
+        return score >= self.threshold and score >= self.skip_llm_above and len(pattern_result["keywords"]) >= 3
+    
+    def _pattern_fast_result(self, pattern_result):
+        """
+        고위험이 확실한 규칙 기반 분석 결과로 최종 결과 생성 (LLM 분석 생략)
+        
+        Args:
+            pattern_result (dict): 규칙 기반 감지 결과
+            
+        Returns:
+            dict: 감지 결과
+        """
+        logger.info(f"규칙 기반 고위험 판정으로 LLM 분석 생략: score={pattern_result['score']:.2f}, 키워드 {len(pattern_result['keywords'])}개")
+        
+        result = self._combine_results(pattern_result, {"score": 0, "keywords": [], "explanation": ""})
+        result["method"] = "pattern_fast"
+        return result
+    
+    def _pattern_only_result(self, pattern_result):
+        """
+        규칙 기반 분석 결과만으로 최종 결과 생성
+        
+        Args:
+            pattern_result (dict): 규칙 기반 감지 결과
+            
+        Returns:
+            dict: 감지 결과
+        """
+        return {
+            "is_phishing": False,
+            "risk_level": pattern_result["risk_level"],
+            "score": pattern_result["score"],
+            "keywords": pattern_result["keywords"],
+            "explanation": pattern_result["explanation"],
+            "method": "pattern"
+        }
+    
+    def _combine_results(self, pattern_result, llm_result):
+        """
+        규칙 기반 결과와 LLM 결과 결합
+        
+        Args:
+            pattern_result (dict): 규칙 기반 감지 결과
+            llm_result (dict): LLM 기반 감지 결과
+            
+        Returns:
+            dict: 감지 결과
+        """
         # 결합된 결과
         combined_score = max(pattern_result["score"], llm_result["score"])
         
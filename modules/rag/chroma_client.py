@@ -1,26 +1,70 @@
-from langchain_community.vectorstores import Chroma
 import os
+import json
+import hashlib
 import logging
-from dotenv import load_dotenv
 import shutil
+import threading
+from itertools import islice
+import numpy as np
+from langchain_core.documents import Document
 
 # 로컬 모듈 임포트
 from modules.langchain.embeddings import get_embedding_model
+from modules.utils.helpers import load_env
 
 # .env 파일 로드
-load_dotenv()
+load_env()
 
 logger = logging.getLogger(__name__)
 
+# float16 행렬을 float32로 바꿔 곱할 때 한 번에 변환할 행 수 (임시 메모리 제한)
+MATVEC_CHUNK_ROWS = 1024
+
+def _matvec(matrix, vector):
+    """
+    임베딩 행렬과 쿼리 벡터의 곱 (float32가 아닌 행렬은 행 묶음 단위로 float32로 바꿔 BLAS로 계산)
+    
+    Args:
+        matrix (np.ndarray): 임베딩 행렬 (문서 수 x 차원)
+        vector (np.ndarray): 쿼리 벡터 (float32)
+        
+    Returns:
+        np.ndarray: 문서별 내적 (float32)
+    """
+    if matrix.dtype == np.float32:
+        return matrix @ vector
+    
+    result = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], MATVEC_CHUNK_ROWS):
+        end = start + MATVEC_CHUNK_ROWS
+        result[start:end] = matrix[start:end].astype(np.float32) @ vector
+    return result
+
+def _document_id(doc):
+    """
+    문서 내용(본문 + 메타데이터)으로 만든 고정 ID (같은 문서는 항상 같은 ID)
+    
+    Args:
+        doc (Document): 문서
+        
+    Returns:
+        str: SHA-256 해시 문자열
+    """
+    digest = hashlib.sha256(doc.page_content.encode("utf-8"))
+    if doc.metadata:
+        digest.update(json.dumps(doc.metadata, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
 class ChromaManager:
     """Chroma 벡터 데이터베이스 관리 클래스"""
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, embedding_config=None):
         """
         ChromaManager 초기화
         
         Args:
-            config (dict, optional): 구성 정보. 기본값은 None
+            config (dict, optional): RAG 구성 정보. 기본값은 None
+            embedding_config (dict, optional): 임베딩 구성 정보 (설정 파일의 embedding 항목). 기본값은 None
         """
         self.config = config or {}
         
@@ -30,21 +74,67 @@ class ChromaManager:
         self.collection_name = config.get("chroma_collection_name", 
                                     os.getenv("CHROMA_COLLECTION_NAME", "bokdori_knowledge"))
         
-        # 임베딩 모델 로드
-        self.embedding_model = get_embedding_model(config)
+        # 임베딩 모델 로드 (RAG 설정이 아닌 임베딩 설정으로 생성)
+        self.embedding_model = get_embedding_model({"embedding": embedding_config or {}})
+        
+        # 임베딩 요청 1회당 텍스트 수
+        self.embedding_batch_size = self.config.get("embedding_batch_size", 256)
+        
+        # 처음 연 Chroma DB 핸들 (이후 호출에서 재사용, 예열 스레드와 동시에 열지 않도록 잠금)
+        self._db = None
+        self._db_lock = threading.Lock()
+        
+        # 문서 수가 이 값 이하면 전체 임베딩을 메모리에 올려 numpy로 검색 (0이면 항상 Chroma 검색)
+        self.in_memory_search_max = self.config.get("in_memory_search_max", 10000)
+        
+        # 메모리 검색용 임베딩 저장 형식 ("float16"이면 메모리를 절반만 쓰지만 numpy에 float16 BLAS가 없어 검색은 느려짐)
+        self.in_memory_search_dtype = np.dtype(self.config.get("in_memory_search_dtype", "float32"))
+        
+        # 메모리 검색용 (임베딩 행렬, 보조 값, Document 목록, 거리 함수). False면 Chroma 검색 사용
+        self._vectors = None
+        self._vectors_lock = threading.Lock()
         
         # 저장 디렉토리 생성
         os.makedirs(self.persist_directory, exist_ok=True)
         
+        # 첫 검색이 느려지지 않도록 임베딩 모델과 인덱스를 백그라운드에서 미리 로드
+        if self.config.get("warmup", True):
+            threading.Thread(target=self._warmup, name="chroma-warmup", daemon=True).start()
+        
         logger.info(f"ChromaManager 초기화 완료: collection={self.collection_name}, directory={self.persist_directory}")
     
+    def _warmup(self):
+        """임베딩 모델과 Chroma 인덱스 예열 (더미 임베딩 및 검색 1회)"""
+        try:
+            self.embedding_model.embed_query("warmup")
+            self.get_or_create_db().similarity_search("warmup", k=1)
+            logger.debug("Chroma 예열 완료")
+        except Exception as e:
+            logger.warning(f"Chroma 예열 실패: {e}")
+    
     def get_or_create_db(self):
         """
-        기존 Chroma DB를 불러오거나 새로 생성
+        기존 Chroma DB를 불러오거나 새로 생성 (한 번 연 DB는 재사용)
         
         Returns:
             Chroma: Chroma 벡터 데이터베이스
         """
+        with self._db_lock:
+            if self._db is None:
+                self._db = self._open_db()
+            return self._db
+    
+    def _open_db(self):
+        """
+        Chroma DB 열기 (실패 시 디렉토리를 비우고 새로 생성)
+        
+        Returns:
+            Chroma: Chroma 벡터 데이터베이스
+        """
+        # langchain_community는 임포트 비용이 크므로 DB를 실제로 열 때 로드
+        # (임포트 실패가 아래의 DB 재생성으로 이어지지 않도록 try 밖에서 임포트)
+        from langchain_community.vectorstores import Chroma
+        
         try:
             # 기존 DB 로드 시도
             db = Chroma(
@@ -54,10 +144,11 @@ class ChromaManager:
             )
             
             # 컬렉션이 비어있는지 확인
-            if db._collection.count() == 0:
+            count = db._collection.count()
+            if count == 0:
                 logger.info("빈 Chroma 컬렉션입니다. 문서를 추가해주세요.")
             else:
-                logger.info(f"기존 Chroma DB 로드 완료: {db._collection.count()} 문서")
+                logger.info(f"기존 Chroma DB 로드 완료: {count} 문서")
             
             return db
         
@@ -78,6 +169,30 @@ class ChromaManager:
             
             return db
     
+    def get_or_create_collection(self, name, metadata=None):
+        """
+        지식 베이스와 같은 Chroma 클라이언트에서 별도 컬렉션을 불러오거나 생성
+        
+        Args:
+            name (str): 컬렉션 이름
+            metadata (dict, optional): 컬렉션 메타데이터 (예: {"hnsw:space": "cosine"}). 기본값은 None
+            
+        Returns:
+            chromadb.Collection: Chroma 컬렉션
+        """
+        db = self.get_or_create_db()
+        return db._client.get_or_create_collection(name=name, metadata=metadata)
+    
+    def delete_collection(self, name):
+        """
+        get_or_create_collection으로 만든 컬렉션 삭제
+        
+        Args:
+            name (str): 컬렉션 이름
+        """
+        db = self.get_or_create_db()
+        db._client.delete_collection(name)
+    
     def add_documents(self, documents):
         """
         Chroma DB에 문서 추가
@@ -95,12 +210,8 @@ class ChromaManager:
         logger.info(f"Chroma DB에 {len(documents)} 문서 추가 중...")
         
         try:
-            db = Chroma.from_documents(
-                documents=documents,
-                embedding=self.embedding_model,
-                persist_directory=self.persist_directory,
-                collection_name=self.collection_name
-            )
+            db = self.get_or_create_db()
+            self._add_embedded(db, documents)
             
             # 변경사항 저장
             db.persist()
@@ -112,6 +223,94 @@ class ChromaManager:
             logger.error(f"문서 추가 실패: {e}")
             return self.get_or_create_db()
     
+    def _add_embedded(self, db, documents):
+        """
+        문서를 임베딩 배치 단위로 임베딩한 뒤 컬렉션에 직접 추가 (이미 저장된 문서는 건너뜀)
+        
+        Args:
+            db (Chroma): Chroma 벡터 데이터베이스
+            documents (list): Document 객체 리스트
+        """
+        # 내용 기반 ID로 중복 제거 (배치 안의 중복은 첫 문서만 사용)
+        unique = {}
+        for doc in documents:
+            unique.setdefault(_document_id(doc), doc)
+        
+        # 이미 컬렉션에 있는 문서는 다시 임베딩하지 않음
+        existing = set(db._collection.get(ids=list(unique), include=[])["ids"])
+        if existing:
+            logger.debug(f"이미 저장된 문서 {len(existing)}개는 건너뜀")
+        
+        ids = [doc_id for doc_id in unique if doc_id not in existing]
+        if not ids:
+            return
+        
+        documents = [unique[doc_id] for doc_id in ids]
+        texts = [doc.page_content for doc in documents]
+        
+        # embedding_batch_size개씩 한 번의 요청으로 임베딩
+        embeddings = []
+        for i in range(0, len(texts), self.embedding_batch_size):
+            embeddings.extend(self.embedding_model.embed_documents(texts[i:i + self.embedding_batch_size]))
+        
+        # 메타데이터가 빈 문서는 Chroma가 받지 않으므로 따로 추가
+        with_metadata = [i for i, doc in enumerate(documents) if doc.metadata]
+        without_metadata = [i for i, doc in enumerate(documents) if not doc.metadata]
+        
+        if with_metadata:
+            db._collection.upsert(
+                ids=[ids[i] for i in with_metadata],
+                embeddings=[embeddings[i] for i in with_metadata],
+                documents=[texts[i] for i in with_metadata],
+                metadatas=[documents[i].metadata for i in with_metadata]
+            )
+        
+        if without_metadata:
+            db._collection.upsert(
+                ids=[ids[i] for i in without_metadata],
+                embeddings=[embeddings[i] for i in without_metadata],
+                documents=[texts[i] for i in without_metadata]
+            )
+        
+        # 메모리 검색용 행렬은 다음 검색 때 다시 로드 (추가가 끝난 뒤에 비워야 이전 스냅샷이 남지 않음)
+        with self._vectors_lock:
+            self._vectors = None
+    
+    def add_document_batches(self, documents, batch_size=512):
+        """
+        Chroma DB에 문서를 배치 단위로 추가 (이터러블을 끝까지 모아두지 않음)
+        
+        Args:
+            documents (iterable): Document 객체 이터러블 (제너레이터 가능)
+            batch_size (int, optional): 한 번에 추가할 문서 수. 기본값은 512
+            
+        Returns:
+            tuple: (업데이트된 Chroma DB, 추가된 문서 수)
+        """
+        db = self.get_or_create_db()
+        documents = iter(documents)
+        added = 0
+        
+        try:
+            while True:
+                batch = list(islice(documents, batch_size))
+                if not batch:
+                    break
+                
+                self._add_embedded(db, batch)
+                added += len(batch)
+                logger.info(f"Chroma DB에 {len(batch)} 문서 추가 (누적 {added})")
+            
+            # 변경사항 저장
+            db.persist()
+            
+            logger.info(f"문서 추가 완료: 총 {db._collection.count()} 문서")
+        
+        except Exception as e:
+            logger.error(f"문서 추가 실패: {e}")
+        
+        return db, added
+    
     def search_documents(self, query, k=3):
         """
         쿼리와 관련된 문서 검색
@@ -128,7 +327,11 @@ class ChromaManager:
         db = self.get_or_create_db()
         
         try:
-            results = db.similarity_search_with_relevance_scores(query, k=k)
+            vectors = self._load_vectors(db)
+            if vectors:
+                results = self._search_in_memory(db, vectors, query, k)
+            else:
+                results = db.similarity_search_with_relevance_scores(query, k=k)
             logger.debug(f"검색 결과: {len(results)} 문서")
             return results
         
@@ -136,6 +339,84 @@ class ChromaManager:
             logger.error(f"검색 실패: {e}")
             return []
     
+    def _load_vectors(self, db):
+        """
+        컬렉션 전체 임베딩을 메모리 행렬로 로드 (문서 수가 in_memory_search_max 이하일 때, 한 번만 로드)
+        
+        Args:
+            db (Chroma): Chroma 벡터 데이터베이스
+            
+        Returns:
+            tuple: (임베딩 행렬, 보조 값, Document 목록, 거리 함수) 또는 False (Chroma 검색을 써야 하는 경우)
+        """
+        with self._vectors_lock:
+            if self._vectors is not None:
+                return self._vectors
+            
+            count = db._collection.count()
+            if count == 0 or count > self.in_memory_search_max:
+                self._vectors = False
+                return self._vectors
+            
+            data = db._collection.get(include=["embeddings", "documents", "metadatas"])
+            matrix = np.asarray(data["embeddings"], dtype=np.float32)
+            documents = [
+                Document(page_content=text, metadata=metadata or {})
+                for text, metadata in zip(data["documents"], data["metadatas"])
+            ]
+            
+            # 컬렉션과 같은 거리 함수 사용 (Chroma 기본값은 제곱 L2 거리)
+            metadata = db._collection.metadata
+            space = metadata.get("hnsw:space", "l2") if metadata else "l2"
+            
+            if space == "cosine":
+                # 행을 미리 정규화해 두고 내적으로 코사인 유사도 계산
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                matrix = matrix / np.where(norms == 0, 1, norms)
+                extra = None
+            else:
+                # 제곱 L2 거리 = |x|^2 + |q|^2 - 2 x·q 의 |x|^2 항
+                extra = np.einsum("ij,ij->i", matrix, matrix)
+            
+            # 거리 계산에 필요한 값은 float32로 구한 뒤 저장 형식으로 변환
+            matrix = matrix.astype(self.in_memory_search_dtype, copy=False)
+            
+            self._vectors = (matrix, extra, documents, space)
+            logger.info(f"메모리 검색용 임베딩 로드 완료: {len(documents)} 문서")
+            return self._vectors
+    
+    def _search_in_memory(self, db, vectors, query, k):
+        """
+        메모리에 올린 임베딩 행렬로 유사 문서 검색 (Chroma와 같은 거리/관련도 점수)
+        
+        Args:
+            db (Chroma): Chroma 벡터 데이터베이스 (관련도 점수 함수 사용)
+            vectors (tuple): _load_vectors 결과
+            query (str): 검색 쿼리
+            k (int): 반환할 문서 수
+            
+        Returns:
+            list: (Document, 관련도 점수) 목록 (관련도 높은 순)
+        """
+        matrix, extra, documents, space = vectors
+        q = np.asarray(self.embedding_model.embed_query(query), dtype=np.float32)
+        
+        if space == "cosine":
+            q_norm = np.linalg.norm(q)
+            distances = 1.0 - _matvec(matrix, q / q_norm if q_norm else q)
+        elif space == "ip":
+            distances = 1.0 - _matvec(matrix, q)
+        else:
+            distances = extra + q @ q - 2.0 * _matvec(matrix, q)
+        
+        # 상위 k개만 부분 정렬한 뒤 거리순 정렬
+        k = min(k, len(documents))
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top], kind="stable")]
+        
+        relevance_score_fn = db._select_relevance_score_fn()
+        return [(documents[i], relevance_score_fn(float(distances[i]))) for i in top]
+    
     def clear_db(self):
         """
         Chroma DB 초기화 (모든 문서 삭제)
@@ -150,6 +431,12 @@ class ChromaManager:
             db._collection.delete(where={})
             db.persist()
             
+            # 다음 사용 시 DB를 다시 열도록 핸들 해제
+            with self._db_lock:
+                self._db = None
+            with self._vectors_lock:
+                self._vectors = None
+            
             logger.info("Chroma DB 초기화 완료")
             return True
         
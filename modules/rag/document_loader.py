@@ -1,12 +1,54 @@
-from langchain.document_loaders import TextLoader, DirectoryLoader, PyPDFLoader
+from langchain.document_loaders import TextLoader, PyPDFLoader
 from langchain.document_loaders import CSVLoader, JSONLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.schema import Document
 import os
 import logging
 import json
+from bisect import bisect_left, bisect_right
+from collections import deque
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# semantic-text-splitter(Rust 구현)가 있으면 빠른 문서 분할 사용
+try:
+    from semantic_text_splitter import TextSplitter
+    use_semantic_splitter = True
+except ImportError:
+    TextSplitter = None
+    use_semantic_splitter = False
 
 logger = logging.getLogger(__name__)
 
+# 문서 분할 구분자 (우선순위 순, ""는 글자 단위 분할)
+TEXT_SEPARATORS = ["\n\n", "\n", ".", " ", ""]
+
+# 이 크기보다 큰 청크는 구분자 위치를 미리 계산하는 분할기로 나눔
+FAST_SPLIT_MIN_CHUNK_SIZE = 5000
+
+# 확장자별 문서 로더 (목록에 없는 확장자는 텍스트 파일로 처리: .txt, .md 등)
+_LOADERS = {
+    '.pdf': PyPDFLoader,
+    '.csv': CSVLoader,
+    '.json': partial(JSONLoader, jq_schema='.', text_content=False)
+}
+_DEFAULT_LOADER = partial(TextLoader, encoding='utf-8')
+
+def _create_loader(file_path):
+    """
+    파일 확장자에 맞는 문서 로더 생성
+    
+    Args:
+        file_path (str): 로드할 파일 경로
+        
+    Returns:
+        BaseLoader: 문서 로더
+    """
+    file_ext = os.path.splitext(file_path)[1].lower()
+    return _LOADERS.get(file_ext, _DEFAULT_LOADER)(file_path)
+
 def load_document(file_path):
     """
     파일 경로로부터 문서 로드
@@ -19,22 +61,9 @@ def load_document(file_path):
     """
     logger.info(f"문서 로드 중: {file_path}")
     
-    # 파일 확장자에 따라 적절한 로더 선택
-    file_ext = os.path.splitext(file_path)[1].lower()
-    
     try:
-        if file_ext == '.pdf':
-            loader = PyPDFLoader(file_path)
-        elif file_ext == '.csv':
-            loader = CSVLoader(file_path)
-        elif file_ext == '.json':
-            loader = JSONLoader(
-                file_path=file_path,
-                jq_schema='.', 
-                text_content=False
-            )
-        else:  # 기본: 텍스트 파일로 처리 (.txt, .md 등)
-            loader = TextLoader(file_path, encoding='utf-8')
+        # 파일 확장자에 따라 적절한 로더 선택
+        loader = _create_loader(file_path)
         
         documents = loader.load()
         logger.info(f"문서 로드 완료: {len(documents)} 문서")
@@ -44,33 +73,286 @@ def load_document(file_path):
         logger.error(f"문서 로드 실패: {e}")
         return []
 
+def lazy_load_document(file_path):
+    """
+    파일 경로로부터 문서를 하나씩 로드 (PDF는 페이지 단위로 생성)
+    
+    Args:
+        file_path (str): 로드할 파일 경로
+        
+    Yields:
+        Document: 로드된 문서
+    """
+    logger.info(f"문서 로드 중: {file_path}")
+    count = 0
+    
+    try:
+        for document in _create_loader(file_path).lazy_load():
+            count += 1
+            yield document
+        logger.info(f"문서 로드 완료: {count} 문서")
+    
+    except Exception as e:
+        logger.error(f"문서 로드 실패: {e}")
+
+def load_documents(file_paths, max_workers=None):
+    """
+    여러 파일을 병렬로 로드
+    
+    Args:
+        file_paths (list): 로드할 파일 경로 목록
+        max_workers (int, optional): 최대 작업자 수. 기본값은 CPU 수
+        
+    Returns:
+        list: Document 객체 리스트 (입력 순서 유지)
+    """
+    file_paths = list(file_paths)
+    documents = list(iter_load_documents(file_paths, max_workers))
+    logger.info(f"문서 {len(file_paths)}개 로드 완료: {len(documents)} 문서")
+    return documents
+
+def iter_load_documents(file_paths, max_workers=None):
+    """
+    여러 파일을 병렬로 로드하며 파일 순서대로 문서 생성
+    
+    PDF 파싱은 GIL을 잡는 파이썬 코드라 PDF가 있으면 프로세스 풀을, 텍스트/CSV/JSON만 있으면
+    (디스크 I/O 위주이므로) 프로세스 생성과 결과 직렬화 비용이 없는 스레드 풀을 사용합니다.
+    한 번에 max_workers * 2개 파일까지만 미리 로드하므로, 메모리에는 전체 말뭉치가 아니라
+    로드 중인 파일들의 문서만 올라갑니다.
+    
+    Args:
+        file_paths (iterable): 로드할 파일 경로 목록
+        max_workers (int, optional): 최대 작업자 수. 기본값은 CPU 수
+        
+    Yields:
+        Document: 로드된 문서 (입력 순서 유지)
+    """
+    file_paths = list(file_paths)
+    
+    # 파일이 하나뿐이면 프로세스 풀 없이 페이지 단위로 로드
+    if len(file_paths) <= 1:
+        for file_path in file_paths:
+            yield from lazy_load_document(file_path)
+        return
+    
+    workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+    has_pdf = any(os.path.splitext(path)[1].lower() == '.pdf' for path in file_paths)
+    executor_class = ProcessPoolExecutor if has_pdf else ThreadPoolExecutor
+    loaded = 0
+    
+    try:
+        with executor_class(max_workers=workers) as executor:
+            pending = deque()
+            remaining = iter(file_paths)
+            
+            # 미리 로드할 파일 수를 제한하여 결과가 한꺼번에 쌓이지 않도록 함
+            for file_path in islice(remaining, workers * 2):
+                pending.append(executor.submit(load_document, file_path))
+            
+            while pending:
+                documents = pending.popleft().result()
+                for file_path in islice(remaining, 1):
+                    pending.append(executor.submit(load_document, file_path))
+                
+                loaded += 1
+                yield from documents
+    
+    except Exception as e:
+        logger.error(f"병렬 문서 로드 실패: {e}. 순차 로드로 전환합니다.")
+        # 이미 생성한 파일은 건너뛰고 나머지를 순차 로드
+        for file_path in file_paths[loaded:]:
+            yield from lazy_load_document(file_path)
+
 def load_directory(directory_path, glob_pattern="**/*.*"):
     """
-    디렉토리에서 모든 문서 로드
+    디렉토리의 모든 문서를 파일 순서대로 하나씩 로드
     
     Args:
         directory_path (str): 문서가 있는 디렉토리 경로
         glob_pattern (str, optional): 로드할 파일 패턴. 기본값은 "**/*.*"
         
-    Returns:
-        list: Document 객체 리스트
+    Yields:
+        Document: 로드된 문서
     """
     logger.info(f"디렉토리에서 문서 로드 중: {directory_path}, 패턴: {glob_pattern}")
     
     try:
-        loader = DirectoryLoader(
-            directory_path, 
-            glob=glob_pattern,
-            recursive=True
-        )
+        root = Path(directory_path)
         
-        documents = loader.load()
-        logger.info(f"디렉토리 로드 완료: {len(documents)} 문서")
-        return documents
+        # 숨김 파일/디렉토리는 제외
+        file_paths = [
+            str(path) for path in sorted(root.rglob(glob_pattern))
+            if path.is_file() and not any(part.startswith('.') for part in path.relative_to(root).parts)
+        ]
     
     except Exception as e:
         logger.error(f"디렉토리 로드 실패: {e}")
-        return []
+        return
+    
+    yield from iter_load_documents(file_paths)
+
+def _find_all(text, separator):
+    """
+    텍스트에서 구분자가 나타나는 모든 위치 (오름차순)
+    
+    Args:
+        text (str): 텍스트
+        separator (str): 구분자
+        
+    Returns:
+        list: 시작 위치 목록
+    """
+    positions = []
+    pos = text.find(separator)
+    while pos != -1:
+        positions.append(pos)
+        pos = text.find(separator, pos + 1)
+    return positions
+
+def _check_chunk_overlap(chunk_size, chunk_overlap):
+    """
+    청크 중복 크기 확인 (LangChain 분할기와 같이 청크 크기 이상이면 오류)
+    
+    Args:
+        chunk_size (int): 청크 크기
+        chunk_overlap (int): 청크 간 중복 크기
+        
+    Raises:
+        ValueError: 중복 크기가 청크 크기 이상인 경우
+    """
+    if chunk_overlap >= chunk_size:
+        raise ValueError(f"청크 중복 크기({chunk_overlap})는 청크 크기({chunk_size})보다 작아야 합니다.")
+
+def fast_recursive_split(text, chunk_size, chunk_overlap, separators=TEXT_SEPARATORS):
+    """
+    구분자 위치를 한 번만 계산해 두고 이진 탐색으로 자르는 재귀 분할 (큰 청크용)
+    
+    각 청크는 chunk_size 안에서 우선순위가 가장 높은 구분자의 마지막 위치에서 자르고,
+    해당 구분자가 없으면 다음 구분자를, 모두 없으면 chunk_size에서 그대로 자릅니다.
+    다음 청크는 끝에서 chunk_overlap만큼 앞선 위치 이후의 첫 공백부터 시작합니다.
+    
+    Args:
+        text (str): 분할할 텍스트
+        chunk_size (int): 청크 크기 (글자 수)
+        chunk_overlap (int): 청크 간 중복 크기 (글자 수)
+        separators (list, optional): 우선순위 순 구분자 목록. 기본값은 TEXT_SEPARATORS
+        
+    Returns:
+        list: 청크 문자열 목록
+        
+    Raises:
+        ValueError: chunk_overlap이 chunk_size 이상인 경우
+    """
+    _check_chunk_overlap(chunk_size, chunk_overlap)
+    
+    positions = [(separator, _find_all(text, separator)) for separator in separators if separator]
+    spaces = _find_all(text, " ")
+    
+    chunks = []
+    start = 0
+    while start < len(text):
+        limit = start + chunk_size
+        if limit >= len(text):
+            end = len(text)
+        else:
+            end = limit
+            for separator, seps in positions:
+                # 구분자를 포함해 limit 안에 끝나는 마지막 위치
+                idx = bisect_right(seps, limit - len(separator)) - 1
+                if idx >= 0 and seps[idx] > start:
+                    end = seps[idx] + len(separator)
+                    break
+        
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        
+        # 단어 중간에서 시작하지 않도록 중복 구간 안의 첫 공백 다음부터 시작
+        next_start = end
+        if chunk_overlap > 0:
+            idx = bisect_left(spaces, max(end - chunk_overlap, start + 1))
+            if idx < len(spaces) and spaces[idx] < end:
+                next_start = spaces[idx] + 1
+        start = next_start
+    
+    return chunks
+
+class _DocumentSplitter:
+    """텍스트 분할 함수를 LangChain 분할기와 같은 방식(split_documents)으로 사용하기 위한 래퍼"""
+    
+    def __init__(self, split_text):
+        self.split_text = split_text
+    
+    def split_documents(self, documents):
+        """
+        문서를 청크로 분할 (메타데이터는 원본 문서에서 복사)
+        
+        Args:
+            documents (list): Document 객체 리스트
+            
+        Returns:
+            list: 분할된 Document 객체 리스트
+        """
+        return [
+            Document(page_content=chunk, metadata=dict(document.metadata))
+            for document in documents
+            for chunk in self.split_text(document.page_content)
+        ]
+
+def _get_text_splitter(chunk_size, chunk_overlap):
+    """
+    문서 분할기 생성
+    
+    semantic-text-splitter가 있으면 그것을, 없으면 큰 청크는 fast_recursive_split을,
+    그 외에는 LangChain 분할기를 사용합니다.
+    
+    Args:
+        chunk_size (int): 청크 크기
+        chunk_overlap (int): 청크 간 중복 크기
+        
+    Returns:
+        object: split_documents 메서드를 가진 문서 분할기
+    """
+    if use_semantic_splitter:
+        # 길이 계산 콜백을 넘기지 않고 내장 문자 수 계산을 사용 (len 기준과 동일)
+        return _DocumentSplitter(TextSplitter(chunk_size, overlap=chunk_overlap).chunks)
+    
+    if chunk_size > FAST_SPLIT_MIN_CHUNK_SIZE:
+        # LangChain 분할기처럼 분할기를 만들 때 설정 오류 확인
+        _check_chunk_overlap(chunk_size, chunk_overlap)
+        return _DocumentSplitter(
+            partial(fast_recursive_split, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        )
+    
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        separators=TEXT_SEPARATORS
+    )
+
+def iter_split_documents(documents, chunk_size=1000, chunk_overlap=200):
+    """
+    문서를 하나씩 분할하여 청크를 순서대로 생성 (전체 청크 리스트를 만들지 않음)
+    
+    Args:
+        documents (iterable): Document 객체들
+        chunk_size (int, optional): 청크 크기. 기본값은 1000
+        chunk_overlap (int, optional): 청크 간 중복 크기. 기본값은 200
+        
+    Yields:
+        Document: 분할된 청크
+    """
+    text_splitter = _get_text_splitter(chunk_size, chunk_overlap)
+    
+    for document in documents:
+        try:
+            yield from text_splitter.split_documents([document])
+        except Exception as e:
+            logger.error(f"문서 분할 실패: {e}")
+            yield document  # 분할 실패 시 원본 문서 사용
 
 def split_documents(documents, chunk_size=1000, chunk_overlap=200):
     """
@@ -87,12 +369,7 @@ def split_documents(documents, chunk_size=1000, chunk_overlap=200):
     logger.info(f"문서 분할 중: {len(documents)} 문서, 청크 크기: {chunk_size}, 중복: {chunk_overlap}")
     
     try:
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", ".", " ", ""]
-        )
+        text_splitter = _get_text_splitter(chunk_size, chunk_overlap)
         
         chunked_documents = text_splitter.split_documents(documents)
         logger.info(f"문서 분할 완료: {len(chunked_documents)} 청크")
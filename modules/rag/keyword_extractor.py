@@ -3,88 +3,291 @@ import json
 import os
 import logging
 from collections import Counter
+from functools import lru_cache
+from itertools import islice
+import joblib
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
 
 logger = logging.getLogger(__name__)
 
-# Java 없이 동작하도록 soynlp 기반 토크나이저 사용
-try:
-    from soynlp.tokenizer import LTokenizer
-    word_scores = {
-        '복도리': 10.0, 'AI': 9.0, '비서': 8.5,
-        '노인': 8.0, '감정': 7.5, '대화': 7.0
-    }
-    tokenizer = LTokenizer(scores=word_scores)
-    use_tokenizer = True
-    logger.info("LTokenizer(soynlp) 로드 완료")
-except ImportError:
-    tokenizer = None
-    use_tokenizer = False
-    logger.warning("soynlp가 설치되지 않아 토크나이저를 사용할 수 없습니다.")
+# 전처리 정규식 (호출마다 패턴을 찾지 않도록 미리 컴파일)
+_NON_WORD_RE = re.compile(r'[^\w\s가-힣]')
+
+# ASCII 문자 중 정규식이 공백으로 바꾸는 문자(영숫자, '_', 공백 외) 치환표
+# (ASCII로만 된 텍스트는 정규식 대신 str.translate로 한 번에 처리)
+_ASCII_NON_WORD_TABLE = str.maketrans({
+    chr(i): ' ' for i in range(128)
+    if not (chr(i).isalnum() or chr(i) == '_' or chr(i).isspace())
+})
+
+# 토크나이저 백엔드 탐색 순서 (soynlp는 Java 없이 동작하므로 먼저 시도)
+TOKENIZER_BACKENDS = ("soynlp", "konlpy")
+
+DEFAULT_STOPWORDS = frozenset([
+    "이", "그", "저", "것", "수", "를", "은", "는", "가", "으로", "에서",
+    "하고", "하는", "하다", "한", "들", "그것", "그리고", "또는", "그런",
+    "이런", "저런", "하지만", "입니다", "있습니다"
+])
+
+@lru_cache(maxsize=None)
+def _load_tokenizer(backend):
+    """
+    토크나이저 백엔드 로드 (백엔드별로 프로세스당 한 번만 로드)
+    
+    Args:
+        backend (str): 'soynlp' 또는 'konlpy'
+        
+    Returns:
+        callable: 텍스트를 토큰 목록으로 나누는 함수 또는 None (사용 불가 시)
+    """
+    try:
+        if backend == "soynlp":
+            from soynlp.tokenizer import LTokenizer
+            word_scores = {
+                '복도리': 10.0, 'AI': 9.0, '비서': 8.5,
+                '노인': 8.0, '감정': 7.5, '대화': 7.0
+            }
+            tokenizer = LTokenizer(scores=word_scores)
+            logger.info("LTokenizer(soynlp) 로드 완료")
+            return tokenizer.tokenize
+        if backend == "konlpy":
+            from konlpy.tag import Okt
+            tokenizer = Okt()
+            logger.info("Okt(konlpy) 로드 완료")
+            return tokenizer.morphs
+        logger.error(f"알 수 없는 토크나이저 백엔드: {backend}")
+    except ImportError:
+        logger.warning(f"{backend}가 설치되지 않아 토크나이저를 사용할 수 없습니다.")
+    except Exception as e:
+        # konlpy는 Java(JVM)가 없으면 초기화에 실패함
+        logger.warning(f"{backend} 토크나이저 초기화 실패: {e}")
+    return None
+
+def _top_indices(scores, top_n):
+    """
+    점수 상위 top_n개의 인덱스 (점수 내림차순, 동점이면 뒤쪽 인덱스 먼저)
+    
+    Args:
+        scores (np.ndarray): 어휘별 점수
+        top_n (int): 뽑을 개수
+        
+    Returns:
+        np.ndarray: 인덱스 배열
+    """
+    if 0 < top_n < len(scores):
+        # 전체 정렬 대신 top_n번째 점수만 부분 정렬로 구한 뒤, 그보다 큰 항목과
+        # 동점 항목(뒤쪽 어휘 우선)으로 상위 top_n개를 골라 그 안에서만 정렬
+        kth = np.partition(scores, -top_n)[-top_n]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[len(above) - top_n:]
+        candidates = np.concatenate((above, ties))
+        # 점수 내림차순, 동점이면 뒤쪽 어휘 먼저
+        return candidates[np.lexsort((candidates, scores[candidates]))[::-1]]
+    return np.argsort(scores)[-top_n:][::-1]
 
 class KeywordExtractor:
     """텍스트에서 중요 키워드를 추출하는 클래스"""
     
-    def __init__(self, stopwords_file=None):
+    def __init__(self, stopwords_file=None, vectorizer_path=None, tokenizer_backend=None,
+                 ngram_range=(1, 1), analyzer="word", hash_features=None):
         self.stopwords = self._load_stopwords(stopwords_file)
         
+        # 글자 n-gram('char', 'char_wb')은 단어 불용어를 쓰지 않으므로 추출 후 걸러냄
         self.tfidf_vectorizer = TfidfVectorizer(
-            stop_words=self.stopwords,
-            ngram_range=(1, 2),
+            analyzer=analyzer,
+            # sklearn은 list만 허용 (내부에서 frozenset으로 변환함)
+            stop_words=sorted(self.stopwords) if analyzer == "word" else None,
+            ngram_range=ngram_range,
             min_df=1,
             max_df=0.9
         )
+        
+        # hash_features를 지정하면 어휘 사전 없이 해싱으로 TF-IDF 계산 (문서를 계속 추가하는 경우)
+        # 문서 빈도는 fit_corpus 호출마다 누적하고, 해시 -> 처음 관찰한 토큰으로 키워드 이름 표시
+        self._hasher = None
+        if hash_features:
+            self._hasher = HashingVectorizer(
+                analyzer=analyzer,
+                stop_words=sorted(self.stopwords) if analyzer == "word" else None,
+                ngram_range=ngram_range,
+                n_features=hash_features,
+                alternate_sign=False,
+                norm=None
+            )
+            self._hash_analyzer = self._hasher.build_analyzer()
+            self._doc_freq = np.zeros(hash_features, dtype=np.int64)
+            self._n_docs = 0
+            self._hash_tokens = {}
+        
+        # 말뭉치로 학습한 벡터라이저가 있으면 로드 (이후 추출은 transform만 수행)
+        self.vectorizer_path = vectorizer_path
+        self._fitted = False
+        self._feature_names = None
+        if self._hasher is not None and vectorizer_path and os.path.exists(vectorizer_path):
+            try:
+                state = joblib.load(vectorizer_path)
+                self._doc_freq = state["doc_freq"]
+                self._n_docs = state["n_docs"]
+                self._hash_tokens = state["tokens"]
+                self._fitted = True
+                logger.info(f"TF-IDF 해싱 문서 빈도 로드 완료: {vectorizer_path}")
+            except Exception as e:
+                logger.error(f"TF-IDF 해싱 문서 빈도 로드 실패: {e}")
+        elif vectorizer_path and os.path.exists(vectorizer_path):
+            try:
+                self.tfidf_vectorizer = joblib.load(vectorizer_path)
+                self._feature_names = self.tfidf_vectorizer.get_feature_names_out()
+                self._fitted = True
+                logger.info(f"TF-IDF 벡터라이저 로드 완료: {vectorizer_path}")
+            except Exception as e:
+                logger.error(f"TF-IDF 벡터라이저 로드 실패: {e}")
+        self._char_ngrams = self.tfidf_vectorizer.analyzer != "word"
 
-        self.use_tokenizer = use_tokenizer
-        self.tokenizer = tokenizer
+        # 백엔드를 지정하지 않으면 soynlp, konlpy 순으로 사용 가능한 것을 선택
+        backends = (tokenizer_backend,) if tokenizer_backend else TOKENIZER_BACKENDS
+        self.tokenizer_backend = None
+        self.tokenizer = None
+        for backend in backends:
+            self.tokenizer = _load_tokenizer(backend)
+            if self.tokenizer:
+                self.tokenizer_backend = backend
+                break
+        self.use_tokenizer = self.tokenizer is not None
 
         logger.info("KeywordExtractor 초기화 완료")
 
     def _load_stopwords(self, stopwords_file=None):
-        default_stopwords = [
-            "이", "그", "저", "것", "수", "를", "은", "는", "이", "가", "으로", "에서",
-            "하고", "하는", "하다", "한", "것", "들", "그것", "그리고", "또는", "그런",
-            "이런", "저런", "하지만", "입니다", "있습니다"
-        ]
         if stopwords_file and os.path.exists(stopwords_file):
             try:
                 with open(stopwords_file, 'r', encoding='utf-8') as f:
                     custom_stopwords = [line.strip() for line in f if line.strip()]
                 logger.info(f"불용어 파일 로드 완료: {stopwords_file}, {len(custom_stopwords)}개")
-                return default_stopwords + custom_stopwords
+                return DEFAULT_STOPWORDS | frozenset(custom_stopwords)
             except Exception as e:
                 logger.error(f"불용어 파일 로드 실패: {e}")
-        return default_stopwords
+        return DEFAULT_STOPWORDS
 
     def preprocess_text(self, text):
         if not text:
             return ""
         text = text.lower()
-        text = re.sub(r'[^\w\s가-힣]', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        if text.isascii():
+            text = text.translate(_ASCII_NON_WORD_TABLE)
+        else:
+            text = _NON_WORD_RE.sub(' ', text)
+        # 연속 공백을 하나로 줄이고 앞뒤 공백 제거
+        return ' '.join(text.split())
+
+    def fit_corpus(self, texts):
+        """말뭉치로 어휘와 IDF를 한 번 학습 (해싱 모드는 문서 빈도 누적, vectorizer_path가 있으면 저장)"""
+        preprocessed = [self.preprocess_text(t) for t in texts]
+        if self._hasher is not None:
+            counts = self._hasher.transform(preprocessed)
+            self._doc_freq += np.bincount(counts.indices, minlength=counts.shape[1])
+            self._n_docs += counts.shape[0]
+            self._remember_hash_tokens(preprocessed)
+            self._fitted = True
+            logger.info(f"TF-IDF 해싱 문서 빈도 갱신 완료: 누적 {self._n_docs}개 문서")
+            
+            if self.vectorizer_path:
+                try:
+                    os.makedirs(os.path.dirname(self.vectorizer_path) or ".", exist_ok=True)
+                    state = {"doc_freq": self._doc_freq, "n_docs": self._n_docs, "tokens": self._hash_tokens}
+                    joblib.dump(state, self.vectorizer_path)
+                    logger.info(f"TF-IDF 해싱 문서 빈도 저장 완료: {self.vectorizer_path}")
+                except Exception as e:
+                    logger.error(f"TF-IDF 해싱 문서 빈도 저장 실패: {e}")
+            return
+        
+        self.tfidf_vectorizer.fit(preprocessed)
+        # 어휘가 고정되므로 특성 이름 배열은 한 번만 생성
+        self._feature_names = self.tfidf_vectorizer.get_feature_names_out()
+        self._fitted = True
+        logger.info(f"TF-IDF 벡터라이저 학습 완료: {len(self.tfidf_vectorizer.vocabulary_)}개 어휘")
+        
+        if self.vectorizer_path:
+            try:
+                os.makedirs(os.path.dirname(self.vectorizer_path) or ".", exist_ok=True)
+                joblib.dump(self.tfidf_vectorizer, self.vectorizer_path)
+                logger.info(f"TF-IDF 벡터라이저 저장 완료: {self.vectorizer_path}")
+            except Exception as e:
+                logger.error(f"TF-IDF 벡터라이저 저장 실패: {e}")
+
+    def _remember_hash_tokens(self, preprocessed):
+        # HashingVectorizer와 같은 방식(부호 있는 murmurhash3의 절댓값)으로 열 번호 계산
+        n_features = self._hasher.n_features
+        for text in preprocessed:
+            for token in self._hash_analyzer(text):
+                self._hash_tokens.setdefault(abs(murmurhash3_32(token, seed=0)) % n_features, token)
+
+    def _hash_transform(self, preprocessed):
+        counts = self._hasher.transform(preprocessed)
+        self._remember_hash_tokens(preprocessed)
+        if self._n_docs:
+            doc_freq, n_docs = self._doc_freq, self._n_docs
+        else:
+            # 누적 문서 빈도가 없으면 입력 문서로 계산 (fit_transform과 같은 방식)
+            doc_freq, n_docs = np.bincount(counts.indices, minlength=counts.shape[1]), counts.shape[0]
+        # TfidfTransformer(smooth_idf=True)와 같은 IDF, 행별 L2 정규화
+        idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+        return normalize(counts.multiply(idf).tocsr())
 
     def extract_with_tfidf(self, texts, top_n=10):
         if not texts or not isinstance(texts, list):
             return []
         try:
             preprocessed = [self.preprocess_text(t) for t in texts]
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform(preprocessed)
-            feature_names = self.tfidf_vectorizer.get_feature_names_out()
-            tfidf_sum = np.sum(tfidf_matrix.toarray(), axis=0)
-            top_indices = np.argsort(tfidf_sum)[-top_n:][::-1]
-            keywords = [(feature_names[i], tfidf_sum[i]) for i in top_indices]
-            return keywords
+            # 학습된 벡터라이저가 있으면 어휘/IDF를 다시 계산하지 않음
+            if self._hasher is not None:
+                tfidf_matrix = self._hash_transform(preprocessed)
+                # 입력에 나타난 열만 남겨 해시 -> 토큰 이름으로 표시
+                columns = np.unique(tfidf_matrix.indices)
+                tfidf_matrix = tfidf_matrix[:, columns]
+                feature_names = [self._hash_tokens[c] for c in columns]
+            elif self._fitted:
+                tfidf_matrix = self.tfidf_vectorizer.transform(preprocessed)
+                # 입력에 나타난 어휘만 남김 (나머지는 점수가 0이라 순위에 들면 안 됨)
+                columns = np.unique(tfidf_matrix.indices)
+                tfidf_matrix = tfidf_matrix[:, columns]
+                feature_names = [self._feature_names[c] for c in columns]
+            else:
+                tfidf_matrix = self.tfidf_vectorizer.fit_transform(preprocessed)
+                feature_names = self.tfidf_vectorizer.get_feature_names_out()
+            # 희소 행렬 그대로 합산 (밀집 행렬로 변환하지 않음)
+            tfidf_sum = np.asarray(tfidf_matrix.sum(axis=0)).ravel()
+            if not self._char_ngrams:
+                top_indices = _top_indices(tfidf_sum, top_n)
+                return [(feature_names[i], tfidf_sum[i]) for i in top_indices]
+            
+            # 글자 n-gram은 불용어를 뺀 뒤에도 top_n개가 남도록 불용어 수만큼 더 뽑아서 거름
+            keywords = []
+            seen = set()
+            for i in _top_indices(tfidf_sum, top_n + len(self.stopwords)):
+                # 단어 경계 패딩 공백 제거
+                word = feature_names[i].strip()
+                if word and word not in self.stopwords and word not in seen:
+                    seen.add(word)
+                    keywords.append((word, tfidf_sum[i]))
+            return keywords[:top_n]
         except Exception as e:
             logger.error(f"TF-IDF 키워드 추출 실패: {e}")
             return []
 
-    def extract_with_tokenizer(self, text, top_n=10):
-        if not self.use_tokenizer or not text:
+    def extract_with_tokenizer(self, text_or_texts, top_n=10):
+        if not self.use_tokenizer or not text_or_texts:
             return []
-        tokens = self.tokenizer.tokenize(self.preprocess_text(text))
-        counts = Counter(t for t in tokens if t not in self.stopwords and len(t) > 1)
+        if isinstance(text_or_texts, str):
+            text_or_texts = [text_or_texts]
+        stopwords = self.stopwords
+        # 여러 텍스트를 하나로 이어 붙이지 않고 텍스트별로 토큰화해 누적
+        counts = Counter()
+        for text in text_or_texts:
+            tokens = self.tokenizer(self.preprocess_text(text))
+            # 리스트로 걸러서 Counter에 넘김 (제너레이터보다 빠름, 길이 검사를 먼저 수행)
+            counts.update([t for t in tokens if len(t) > 1 and t not in stopwords])
         return counts.most_common(top_n)
 
     def extract_keywords(self, text_or_texts, method="tfidf", top_n=10):
@@ -93,20 +296,22 @@ class KeywordExtractor:
         if method == "tfidf":
             return self.extract_with_tfidf(text_or_texts, top_n)
         elif method == "tokenizer" and self.use_tokenizer:
-            combined = " ".join(text_or_texts)
-            return self.extract_with_tokenizer(combined, top_n=top_n)
+            return self.extract_with_tokenizer(text_or_texts, top_n=top_n)
         else:
             return self.extract_with_tfidf(text_or_texts, top_n)
 
     def extract_from_conversation(self, conversation_history, top_n=10):
-        user_msgs = [conversation_history[i] for i in range(0, len(conversation_history), 2)]
+        # 짝수 번째(사용자 메시지)만 슬라이스로 추출 (deque 등 슬라이스 미지원 시 islice)
+        if isinstance(conversation_history, (list, tuple)):
+            user_msgs = conversation_history[::2]
+        else:
+            user_msgs = list(islice(conversation_history, 0, None, 2))
         if not user_msgs:
             return []
         tfidf_keywords = self.extract_with_tfidf(user_msgs, top_n)
         tokenizer_keywords = []
         if self.use_tokenizer:
-            combined_text = " ".join(user_msgs)
-            tokenizer_keywords = self.extract_with_tokenizer(combined_text, top_n)
+            tokenizer_keywords = self.extract_with_tokenizer(user_msgs, top_n)
 
         all_keywords = {}
         for word, weight in tfidf_keywords:
@@ -1,19 +1,160 @@
-from langchain.retrievers import ContextualCompressionRetriever
-from langchain.retrievers.document_compressors import LLMChainExtractor
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import PrivateAttr
+import time
+import queue
 import logging
+import threading
+from concurrent.futures import Future
+from typing import Any
 
 # 로컬 모듈 임포트
 from modules.rag.chroma_client import ChromaManager
 
 logger = logging.getLogger(__name__)
 
-def get_retriever(config=None, llm=None):
+# 배치 처리 스레드 종료 신호 (검색 요청 대신 큐에 넣음)
+_STOP = object()
+
+class BatchingRetriever(BaseRetriever):
+    """동시에 들어온 검색 요청을 묶어서 한 번의 Chroma 쿼리로 처리하는 검색기"""
+    
+    # Chroma 벡터 데이터베이스
+    db: Any
+    # 쿼리당 반환할 문서 수
+    k: int = 3
+    # Chroma 쿼리 1회당 최대 검색 요청 수
+    batch_size: int = 32
+    # 검색 요청을 모으기 위해 기다리는 최대 시간(ms). 0 이하면 묶지 않고 바로 검색
+    max_wait_ms: int = 10
+    
+    _queue: Any = PrivateAttr(default_factory=queue.Queue)
+    _worker: Any = PrivateAttr(default=None)
+    _worker_lock: Any = PrivateAttr(default_factory=threading.Lock)
+    
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        """
+        쿼리와 관련된 문서 검색 (다른 스레드의 검색 요청과 묶어서 처리)
+        
+        Args:
+            query (str): 검색 쿼리
+            run_manager (CallbackManagerForRetrieverRun, optional): 콜백 관리자
+            
+        Returns:
+            list: Document 객체 리스트
+        """
+        if self.max_wait_ms <= 0:
+            return self._search([query])[0]
+        
+        future = Future()
+        # 요청 등록과 스레드 시작을 함께 잠가서 close() 이후의 요청이 종료된 스레드의 큐에 들어가지 않도록 함
+        with self._worker_lock:
+            self._ensure_worker()
+            self._queue.put((query, future))
+        return future.result()
+    
+    def _ensure_worker(self):
+        """검색 배치 처리 스레드 시작 (_worker_lock을 잡은 상태에서 호출)"""
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run_search_batches, args=(self._queue,), daemon=True
+            )
+            self._worker.start()
+    
+    def close(self):
+        """
+        배치 처리 스레드 종료
+        
+        이미 등록된 검색 요청은 모두 처리한 뒤 종료되며,
+        이후에 들어온 요청은 새 스레드가 처리합니다.
+        """
+        with self._worker_lock:
+            if self._worker is None:
+                return
+            
+            self._queue.put(_STOP)
+            self._queue = queue.Queue()
+            self._worker = None
+    
+    def _run_search_batches(self, requests):
+        """
+        대기 중인 검색 요청을 모아서 한 번의 쿼리로 검색 (종료 신호를 받을 때까지)
+        
+        Args:
+            requests (queue.Queue): 이 스레드가 처리할 검색 요청 큐
+        """
+        max_wait = self.max_wait_ms / 1000
+        stopped = False
+        
+        while not stopped:
+            request = requests.get()
+            if request is _STOP:
+                break
+            
+            pending = [request]
+            deadline = time.monotonic() + max_wait
+            
+            while len(pending) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = requests.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is _STOP:
+                    stopped = True
+                    break
+                pending.append(request)
+            
+            try:
+                if len(pending) > 1:
+                    logger.debug(f"검색 요청 배치 처리: {len(pending)}개")
+                
+                results = self._search([query for query, _ in pending])
+                
+                for (_, future), documents in zip(pending, results):
+                    future.set_result(documents)
+            
+            except Exception as e:
+                logger.error(f"검색 요청 배치 처리 실패: {e}")
+                for _, future in pending:
+                    future.set_exception(e)
+    
+    def _search(self, queries):
+        """
+        여러 쿼리를 한 번의 Chroma 쿼리로 검색
+        
+        Args:
+            queries (list): 검색 쿼리 목록
+            
+        Returns:
+            list: 쿼리별 Document 객체 리스트
+        """
+        if len(queries) == 1:
+            query_embeddings = [self.db.embeddings.embed_query(queries[0])]
+        else:
+            query_embeddings = self.db.embeddings.embed_documents(queries)
+        
+        results = self.db._collection.query(
+            query_embeddings=query_embeddings,
+            n_results=self.k,
+            include=["documents", "metadatas"]
+        )
+        
+        return [
+            [Document(page_content=text, metadata=metadata or {}) for text, metadata in zip(texts, metadatas)]
+            for texts, metadatas in zip(results["documents"], results["metadatas"])
+        ]
+
+def get_retriever(config=None, llm=None, db=None):
     """
     문서 검색기 생성
     
     Args:
         config (dict, optional): 구성 정보. 기본값은 None
         llm (BaseLLM, optional): 압축에 사용할 LLM. 기본값은 None
+        db (Chroma, optional): 이미 연 Chroma DB. 기본값은 None (새로 열기)
         
     Returns:
         Retriever: 문서 검색기
@@ -28,20 +169,26 @@ def get_retriever(config=None, llm=None):
     top_k = rag_config.get("top_k", 3)
     use_compression = rag_config.get("use_compression", False)
     
-    # Chroma DB 로드
-    chroma_manager = ChromaManager(rag_config)
-    db = chroma_manager.get_or_create_db()
+    # Chroma DB 로드 (이미 연 DB가 있으면 임베딩 모델/컬렉션을 다시 로드하지 않고 재사용)
+    if db is None:
+        chroma_manager = ChromaManager(rag_config, (config or {}).get("embedding", {}))
+        db = chroma_manager.get_or_create_db()
     
-    # 기본 검색기
-    base_retriever = db.as_retriever(
-        search_type="similarity",
-        search_kwargs={"k": top_k}
+    # 기본 검색기 (동시에 들어온 검색 요청은 한 번의 쿼리로 묶어서 처리)
+    base_retriever = BatchingRetriever(
+        db=db,
+        k=top_k,
+        max_wait_ms=rag_config.get("retriever_batch_wait_ms", 10)
     )
     
     # LLM 컨텍스트 압축 사용 (선택적)
     if use_compression and llm:
         logger.info("LLM 컨텍스트 압축 활성화")
         
+        # 압축을 쓸 때만 필요하므로 여기서 로드 (langchain.retrievers는 임포트 비용이 큼)
+        from langchain.retrievers import ContextualCompressionRetriever
+        from langchain.retrievers.document_compressors import LLMChainExtractor
+        
         compressor = LLMChainExtractor.from_llm(llm)
         
         retriever = ContextualCompressionRetriever(
@@ -52,4 +199,16 @@ def get_retriever(config=None, llm=None):
         return retriever
     
     logger.info(f"기본 검색기 생성 완료 (top_k={top_k})")
-    return base_retriever
\ No newline at end of file
+    return base_retriever
+
+def close_retriever(retriever):
+    """
+    get_retriever로 만든 검색기의 배치 처리 스레드 종료 (검색기를 교체할 때 호출)
+    
+    Args:
+        retriever (Retriever): 종료할 검색기 (None이면 무시)
+    """
+    # 압축 검색기는 내부의 기본 검색기를 종료
+    base_retriever = getattr(retriever, "base_retriever", retriever)
+    if isinstance(base_retriever, BatchingRetriever):
+        base_retriever.close()
\ No newline at end of file
@@ -1,30 +1,100 @@
 import os
 import json
+import shutil
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
 import logging
+from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
+# orjson이 있으면 빠른 JSON 직렬화 사용
+try:
+    import orjson
+    use_orjson = True
+except ImportError:
+    orjson = None
+    use_orjson = False
+
+# .env 파일 로드 여부
+_env_loaded = False
+
+def load_env():
+    """
+    .env 파일 로드 (프로세스당 한 번만 실행)
+    """
+    global _env_loaded
+    
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
+@lru_cache(maxsize=32)
+def _load_json(file_path, mtime_ns, size):
+    """
+    JSON 파일 읽기 (경로/수정 시각/크기별로 한 번만 읽음)
+    
+    Args:
+        file_path (str): JSON 파일 경로
+        mtime_ns (int): 파일 수정 시각 (파일이 바뀌면 다시 읽도록 캐시 키에 포함)
+        size (int): 파일 크기 (수정 시각 해상도가 낮은 파일 시스템 대비)
+        
+    Returns:
+        object: 파싱된 값
+    """
+    with open(file_path, 'rb') as f:
+        data = from_json(f.read())
+    
+    logger.info(f"JSON 파일 로드 완료: {file_path}")
+    return data
+
+def _copy_json(value):
+    """
+    JSON 값(dict/list/스칼라) 복사 (copy.deepcopy보다 빠름: memo/타입 조회 없음)
+    
+    Args:
+        value (object): 파싱된 JSON 값
+        
+    Returns:
+        object: 복사본
+    """
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+def load_json_file(file_path):
+    """
+    JSON 파일 읽기 (파일이 바뀌지 않았으면 캐시된 내용 사용)
+    
+    Args:
+        file_path (str): JSON 파일 경로
+        
+    Returns:
+        object: 파싱된 값 (호출자가 수정해도 되는 복사본)
+    """
+    stat = os.stat(file_path)
+    return _copy_json(_load_json(file_path, stat.st_mtime_ns, stat.st_size))
+
 def load_config():
     """
     설정 파일 로드
     
     Returns:
-        dict: 설정 정보
+        dict: 설정 정보 (호출자가 수정해도 되는 복사본)
     """
     config_path = "config/config.json"
     
     try:
-        if os.path.exists(config_path):
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            logger.info(f"설정 파일 로드 완료: {config_path}")
-            return config
-        else:
-            logger.warning(f"설정 파일을 찾을 수 없음: {config_path}. 기본 설정을 사용합니다.")
-            return {}
+        # 존재 확인과 수정 시각 확인을 stat 한 번으로 처리
+        return load_json_file(config_path)
+    
+    except FileNotFoundError:
+        logger.warning(f"설정 파일을 찾을 수 없음: {config_path}. 기본 설정을 사용합니다.")
+        return {}
     
     except Exception as e:
         logger.error(f"설정 파일 로드 실패: {e}. 기본 설정을 사용합니다.")
@@ -50,6 +120,9 @@ def save_config(config):
         with open(config_path, 'w', encoding='utf-8') as f:
             json.dump(config, f, indent=2, ensure_ascii=False)
         
+        # 다음 load_config 호출 시 새로 읽도록 캐시 비우기 (수정 시각 해상도가 낮은 파일 시스템 대비)
+        _load_json.cache_clear()
+        
         logger.info(f"설정 파일 저장 완료: {config_path}")
         return True
     
@@ -57,6 +130,181 @@ def save_config(config):
         logger.error(f"설정 파일 저장 실패: {e}")
         return False
 
+def to_json_line(record):
+    """
+    레코드를 JSON Lines 형식의 한 줄로 직렬화
+    
+    Args:
+        record (dict): 직렬화할 레코드
+        
+    Returns:
+        bytes: 줄바꿈이 포함된 UTF-8 JSON 바이트열
+    """
+    if use_orjson:
+        return orjson.dumps(
+            record,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+def from_json(data):
+    """
+    JSON 문자열/바이트열 파싱
+    
+    Args:
+        data (bytes | str): JSON 데이터
+        
+    Returns:
+        object: 파싱된 값
+    """
+    if use_orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def to_json(data):
+    """
+    데이터를 들여쓰기(2칸)된 JSON으로 직렬화
+    
+    Args:
+        data (object): 직렬화할 데이터
+        
+    Returns:
+        bytes: UTF-8 JSON 바이트열
+    """
+    if use_orjson:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+def read_json_records(file_path):
+    """
+    JSON 배열/객체 또는 JSON Lines 형식 로그 파일 읽기
+    
+    Args:
+        file_path (str): 로그 파일 경로
+        
+    Returns:
+        list: 레코드 목록
+    """
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    
+    if not content.strip():
+        return []
+    
+    try:
+        records = from_json(content)
+    except ValueError:
+        # 한 줄에 하나씩 기록된 로그 (JSON Lines)
+        return [from_json(line) for line in content.splitlines() if line.strip()]
+    
+    # 리스트가 아니면 리스트로 변환
+    if not isinstance(records, list):
+        records = [records]
+    
+    return records
+
+def iter_json_records(file_path):
+    """
+    로그 파일의 레코드를 하나씩 반환 (JSON Lines는 한 줄씩 읽어 파일 전체를 메모리에 올리지 않음)
+    
+    Args:
+        file_path (str): 로그 파일 경로
+        
+    Yields:
+        dict: 레코드
+    """
+    with open(file_path, 'rb') as f:
+        first_line = f.readline()
+        while first_line and not first_line.strip():
+            first_line = f.readline()
+        
+        if not first_line:
+            return
+        
+        # 첫 줄이 완전한 JSON 객체면 JSON Lines로 보고 줄 단위로 읽기
+        if first_line.lstrip().startswith(b'{'):
+            try:
+                record = from_json(first_line)
+            except ValueError:
+                record = None
+            
+            if record is not None:
+                yield record
+                for line in f:
+                    if line.strip():
+                        yield from_json(line)
+                return
+    
+    # JSON 배열/여러 줄 객체는 파일 전체를 파싱
+    yield from read_json_records(file_path)
+
+def _read_log_file(file_path):
+    """
+    로그 파일 하나 읽기 (없거나 읽기 실패 시 빈 목록)
+    
+    Args:
+        file_path (str): 로그 파일 경로
+        
+    Returns:
+        list: 레코드 목록
+    """
+    if not os.path.exists(file_path):
+        return []
+    
+    try:
+        return read_json_records(file_path)
+    except Exception as e:
+        logger.error(f"로그 파일 로드 실패: {file_path}, {e}")
+        return []
+
+def read_log_files(file_paths, max_workers=8):
+    """
+    여러 날짜별 로그 파일을 스레드 풀로 동시에 읽기
+    
+    Args:
+        file_paths (list): 로그 파일 경로 목록
+        max_workers (int, optional): 최대 스레드 수. 기본값은 8
+        
+    Returns:
+        list: 파일 순서대로 이어 붙인 레코드 목록
+    """
+    file_paths = [path for path in file_paths if os.path.exists(path)]
+    
+    # 파일이 하나 이하면 스레드 없이 읽기
+    if len(file_paths) <= 1:
+        results = [_read_log_file(path) for path in file_paths]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
+            results = list(executor.map(_read_log_file, file_paths))
+    
+    logs = []
+    for records in results:
+        logs.extend(records)
+    
+    return logs
+
+def recent_dates(days):
+    """
+    오늘을 포함한 최근 날짜 문자열 목록 (오래된 날짜부터)
+    
+    Args:
+        days (int): 오늘 이전으로 포함할 일수 (days + 1개의 날짜 반환)
+        
+    Returns:
+        list: 'YYYY-MM-DD' 형식 날짜 문자열 목록
+    """
+    today = date.today().toordinal()
+    
+    dates = []
+    for ordinal in range(today - days, today + 1):
+        d = date.fromordinal(ordinal)
+        dates.append(f"{d.year:04d}-{d.month:02d}-{d.day:02d}")
+    
+    return dates
+
 def create_backup(original_file):
     """
     파일 백업 생성
@@ -85,10 +333,8 @@ def create_backup(original_file):
         backup_filename = f"{base}_{timestamp}{ext}"
         backup_path = os.path.join(backup_dir, backup_filename)
         
-        # 파일 복사
-        with open(original_file, 'rb') as src:
-            with open(backup_path, 'wb') as dst:
-                dst.write(src.read())
+        # 파일 복사 (전체를 메모리에 읽지 않고 커널에서 복사, Linux는 sendfile 사용)
+        shutil.copyfile(original_file, backup_path)
         
         logger.info(f"백업 생성 완료: {backup_path}")
         return backup_path
@@ -1,9 +1,53 @@
 import os
 import json
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import threading
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
-import time
+from modules.utils.helpers import from_json, read_json_records, to_json_line
+
+logger = logging.getLogger(__name__)
+
+def read_emotion_logs(date_str, emotions_dir="logs/emotions"):
+    """
+    날짜별 감정 로그를 한 줄씩 읽어 생성 (JSON Lines 형식과 이전 JSON 배열 형식 모두 지원)
+    
+    Args:
+        date_str (str): 'YYYY-MM-DD' 형식 날짜
+        emotions_dir (str, optional): 감정 로그 디렉토리. 기본값은 "logs/emotions"
+        
+    Yields:
+        dict: 감정 로그 레코드
+    """
+    file_path = os.path.join(emotions_dir, f"{date_str}_emotion_log.json")
+    if not os.path.exists(file_path):
+        return
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        first = True
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            
+            try:
+                record = None if line.startswith('[') else from_json(line)
+            except ValueError:
+                record = None
+            
+            if first and record is None:
+                # 이전 형식(JSON 배열/여러 줄 객체) 파일은 통째로 읽음
+                yield from read_json_records(file_path)
+                return
+            first = False
+            
+            if record is None:
+                # 기록 중인 마지막 줄 등 깨진 줄은 건너뜀
+                logger.warning(f"감정 로그 줄 파싱 실패: {file_path}")
+                continue
+            yield record
 
 class Logger:
     """애플리케이션 로깅 관리 클래스"""
@@ -43,6 +87,8 @@ class Logger:
             backupCount=5
         )
         info_handler.setLevel(level_map.get(log_level.upper(), logging.INFO))
+        # ERROR 이상은 error.log에만 기록 (두 파일에 중복 기록 방지)
+        info_handler.addFilter(lambda record: record.levelno < logging.ERROR)
 
         error_handler = RotatingFileHandler(
             os.path.join(self.log_dir, "error.log"),
@@ -51,18 +97,43 @@ class Logger:
         )
         error_handler.setLevel(logging.ERROR)
 
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        for handler in (console_handler, info_handler, error_handler):
+            handler.setFormatter(formatter)
+        
+        # 호출 스레드는 큐에 넣기만 하고, 콘솔/파일 기록은 리스너 스레드에서 처리
+        log_queue = queue.SimpleQueue()
+        self._listener = QueueListener(
+            log_queue,
+            console_handler,
+            info_handler,
+            error_handler,
+            respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self._listener.stop)
+        
+        # 큐에는 메시지만 넣고 시간/레벨 형식은 각 핸들러에서 적용
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        
         # 로그 설정
         logging.basicConfig(
             level=level_map.get(log_level.upper(), logging.INFO),
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                console_handler,
-                info_handler,
-                error_handler
-            ]
+            handlers=[queue_handler]
         )
         
         self.logger = logging.getLogger("bokdori")
+        
+        # 유형별로 열어 둔 로그 파일 (유형 -> (파일 경로, 파일 객체))
+        # 매 기록마다 열고 닫지 않고, flush() 또는 종료 시 한 번에 디스크로 내보냄
+        self._files = {}
+        self._files_lock = threading.Lock()
+        
+        # 마지막으로 계산한 (날짜, 'YYYY-MM-DD' 문자열) (자정에만 바뀌므로 재사용)
+        self._date_cache = (None, None)
+        atexit.register(self.close)
+        
         self.logger.info("로거 초기화 완료")
     
     def log_conversation(self, user_input, ai_response, metadata=None):
@@ -81,13 +152,14 @@ class Logger:
         conversation_dir = os.path.join(self.log_dir, "conversations")
         
         # 날짜별 파일명
-        date_str = datetime.now().strftime("%Y-%m-%d")
+        now = datetime.now()
+        date_str = self._date_string(now)
         file_path = os.path.join(conversation_dir, f"{date_str}_conversation_log.json")
         
         # 로그 엔트리 생성
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "unix_timestamp": int(time.time()),
+            "timestamp": now.isoformat(),
+            "unix_timestamp": int(now.timestamp()),
             "user_input": user_input,
             "ai_response": ai_response
         }
@@ -98,10 +170,9 @@ class Logger:
         
         try:
             # 파일에 추가
-            with open(file_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+            self._append_line("conversations", file_path, log_entry)
             
-            self.logger.debug(f"대화 로깅 완료: {file_path}")
+            self.logger.debug("대화 로깅 완료: %s", file_path)
             return True
         
         except Exception as e:
@@ -123,13 +194,14 @@ class Logger:
         emotion_dir = os.path.join(self.log_dir, "emotions")
         
         # 날짜별 파일명
-        date_str = datetime.now().strftime("%Y-%m-%d")
+        now = datetime.now()
+        date_str = self._date_string(now)
         file_path = os.path.join(emotion_dir, f"{date_str}_emotion_log.json")
         
         # 로그 엔트리 생성
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "unix_timestamp": int(time.time()),
+            "timestamp": now.isoformat(),
+            "unix_timestamp": int(now.timestamp()),
             "text": text,
             "dominant_emotion": emotion_result.get("dominant_emotion"),
             "emotion_category": emotion_result.get("emotion_category"),
@@ -138,50 +210,116 @@ class Logger:
         }
         
         try:
-            # 기존 로그 파일 확인
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if content.strip():
-                        try:
-                            logs = json.loads(content)
-                            if not isinstance(logs, list):
-                                logs = [logs]
-                        except json.JSONDecodeError:
-                            # 한 줄씩 JSON 파싱 시도
-                            logs = []
-                            for line in content.strip().split('\n'):
-                                try:
-                                    log = json.loads(line)
-                                    logs.append(log)
-                                except json.JSONDecodeError:
-                                    pass
-                    else:
-                        logs = []
-            else:
-                logs = []
-            
-            # 새 로그 추가
-            logs.append(log_entry)
-            
-            # 파일에 저장
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(logs, f, ensure_ascii=False, indent=2)
+            # 파일에 추가
+            self._append_line("emotions", file_path, log_entry)
             
-            self.logger.debug(f"감정 로깅 완료: {file_path}")
+            self.logger.debug("감정 로깅 완료: %s", file_path)
             return True
         
         except Exception as e:
             self.logger.error(f"감정 로깅 실패: {e}")
+            return False
+    
+    def _date_string(self, now):
+        """
+        날짜별 로그 파일명에 쓰는 날짜 문자열 (날짜가 바뀔 때만 다시 계산)
+        
+        Args:
+            now (datetime): 현재 시각
             
-            # 오류 발생 시 단순 추가 방식으로 시도
-            try:
-                with open(file_path, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
-                return True
-            except Exception as e2:
-                self.logger.error(f"감정 로깅 재시도 실패: {e2}")
-                return False
+        Returns:
+            str: 'YYYY-MM-DD' 형식 날짜 문자열
+        """
+        today = now.date()
+        cached_date, cached_str = self._date_cache
+        if today != cached_date:
+            cached_str = today.strftime("%Y-%m-%d")
+            self._date_cache = (today, cached_str)
+        return cached_str
+    
+    def _append_line(self, category, file_path, log_entry):
+        """
+        로그 엔트리를 JSON Lines 한 줄로 유형별 파일에 추가 (파일은 열어 둔 채 재사용)
+        
+        Args:
+            category (str): 로그 유형 (하위 디렉토리 이름)
+            file_path (str): 날짜별 로그 파일 경로
+            log_entry (dict): 기록할 로그 엔트리
+        """
+        # orjson이 있으면 UTF-8 바이트열로 바로 직렬화 (파일은 바이너리 모드)
+        line = to_json_line(log_entry)
+        
+        with self._files_lock:
+            current = self._files.get(category)
+            
+            # 날짜가 바뀌었거나 처음 기록하는 경우 파일 열기
+            if current is None or current[0] != file_path:
+                if current is not None:
+                    current[1].close()
+                
+                # 이전 버전이 JSON 배열로 저장한 파일이면 JSON Lines로 변환
+                self._migrate_to_jsonl(file_path)
+                
+                current = (file_path, open(file_path, 'ab'))
+                self._files[category] = current
+            
+            current[1].write(line)
+    
+    def flush(self):
+        """버퍼에 남은 로그를 모두 파일에 기록"""
+        with self._files_lock:
+            for _, f in self._files.values():
+                try:
+                    f.flush()
+                except Exception as e:
+                    self.logger.error(f"로그 파일 flush 실패: {e}")
+    
+    def close(self):
+        """열어 둔 로그 파일을 모두 닫기 (버퍼에 남은 로그 기록)"""
+        with self._files_lock:
+            for _, f in self._files.values():
+                try:
+                    f.close()
+                except Exception as e:
+                    self.logger.error(f"로그 파일 닫기 실패: {e}")
+            self._files.clear()
+    
+    def _migrate_to_jsonl(self, file_path):
+        """
+        JSON 배열 형식 로그 파일을 JSON Lines 형식으로 변환
+        
+        Args:
+            file_path (str): 로그 파일 경로
+        """
+        if not os.path.exists(file_path):
+            return
+        
+        with open(file_path, 'rb') as f:
+            head = f.read(64).lstrip()
+        
+        if head.startswith(b'['):
+            logs = read_json_records(file_path)
+            tmp_path = file_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                for log in logs:
+                    f.write(to_json_line(log))
+            os.replace(tmp_path, file_path)
+            self.logger.info(f"로그 파일을 JSON Lines 형식으로 변환: {file_path}, {len(logs)}건")
+    
+    def read_emotion_logs(self, date_str):
+        """
+        날짜별 감정 로그를 한 줄씩 읽어 생성 (버퍼에 남은 로그를 먼저 기록)
+        
+        Args:
+            date_str (str): 'YYYY-MM-DD' 형식 날짜
+            
+        Yields:
+            dict: 감정 로그 레코드
+        """
+        # 아직 버퍼에 남은 로그도 읽히도록 먼저 기록
+        self.flush()
+        
+        yield from read_emotion_logs(date_str, os.path.join(self.log_dir, "emotions"))
     
     def log_phishing_detection(self, text, result):
         """
@@ -198,27 +336,27 @@ class Logger:
         phishing_dir = os.path.join(self.log_dir, "phishing")
         
         # 날짜별 파일명
-        date_str = datetime.now().strftime("%Y-%m-%d")
+        now = datetime.now()
+        date_str = self._date_string(now)
         file_path = os.path.join(phishing_dir, f"{date_str}_phishing_log.json")
         
         # 로그 엔트리 생성
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "unix_timestamp": int(time.time()),
+            "timestamp": now.isoformat(),
+            "unix_timestamp": int(now.timestamp()),
             "text": text,
             "result": result
         }
         
         try:
             # 파일에 추가
-            with open(file_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+            self._append_line("phishing", file_path, log_entry)
             
             # 위험도가 높은 경우 추가 로깅
             if result.get("is_phishing", False) or result.get("risk_level") in ["high", "medium"]:
                 self.logger.warning(f"보이스피싱 의심 감지: score={result.get('score')}, level={result.get('risk_level')}")
             
-            self.logger.debug(f"보이스피싱 감지 로깅 완료: {file_path}")
+            self.logger.debug("보이스피싱 감지 로깅 완료: %s", file_path)
             return True
         
         except Exception as e:
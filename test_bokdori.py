@@ -1,18 +1,10 @@
 import sys
+import asyncio
 from pathlib import Path
 from dotenv import load_dotenv
 import logging
 import time
 
-# 모듈 임포트
-from modules.llm.openai_client import OpenAIClient
-from modules.langchain.chains import ChainManager
-from modules.phishing.detector import PhishingDetector
-from modules.rag.chroma_client import ChromaManager
-from modules.rag.document_loader import load_document, split_documents
-from modules.rag.retriever import get_retriever
-from modules.utils.helpers import load_config
-
 # .env 파일 로드
 load_dotenv()
 
@@ -27,13 +19,24 @@ class BokdoriDemo:
         """초기화"""
         print("복도리 AI 비서 초기화 중...")
         
+        # process_message에서 사용하는 이벤트 루프 (처음 호출할 때 생성)
+        self._loop = None
+        
+        # langchain/chromadb 등 임포트 비용이 큰 모듈은 실제로 초기화할 때 로드
+        from modules.llm.openai_client import OpenAIClient
+        from modules.langchain.chains import ChainManager
+        from modules.phishing.detector import PhishingDetector
+        from modules.rag.chroma_client import ChromaManager
+        from modules.rag.retriever import get_retriever
+        from modules.utils.helpers import load_config
+        
         # 설정 로드
         self.config = load_config()
         
         # 컴포넌트 초기화
         self.llm_client = OpenAIClient()
         self.chain_manager = ChainManager(self.config)
-        self.chroma_manager = ChromaManager(self.config.get("rag", {}))
+        self.chroma_manager = ChromaManager(self.config.get("rag", {}), self.config.get("embedding", {}))
         self.phishing_detector = PhishingDetector(self.config)
         
         # RAG 검색기 초기화
@@ -50,8 +53,11 @@ class BokdoriDemo:
         """테스트 문서 추가"""
         print("\n=== 테스트 문서 추가 ===")
         
-        # 테스트 문서 디렉토리 생성
         import os
+        from modules.rag.document_loader import load_document, split_documents
+        from modules.rag.retriever import get_retriever, close_retriever
+        
+        # 테스트 문서 디렉토리 생성
         os.makedirs("data/documents/test", exist_ok=True)
         
         # 테스트 문서 생성
@@ -70,25 +76,37 @@ class BokdoriDemo:
         
         # Chroma DB에 추가
         print(f"문서 청크 {len(chunks)}개를 Chroma DB에 추가합니다...")
-        db = self.chroma_manager.add_documents(chunks)
+        db, _ = self.chroma_manager.add_document_batches(chunks, batch_size=64)
         
-        # 검색기 갱신
-        self.retriever = get_retriever(self.config)
+        # 검색기 갱신 (방금 문서를 추가한 DB를 그대로 사용, 이전 검색기의 배치 처리 스레드는 종료)
+        close_retriever(self.retriever)
+        self.retriever = get_retriever(self.config, db=db)
         
         print("테스트 문서 추가 완료")
     
-    def process_message(self, user_input, use_rag=True):
-        """사용자 메시지 처리"""
+    async def aprocess_message(self, user_input, use_rag=True):
+        """사용자 메시지 처리 (보이스피싱 감지와 문서 검색을 동시에 실행)"""
         if not user_input or len(user_input.strip()) == 0:
             return "메시지가 비어있습니다. 질문이나 대화를 입력해주세요."
         
         start_time = time.time()
         print(f"\n사용자: {user_input}")
         
-        # 보이스피싱 감지
-        phishing_result = self.phishing_detector.detect_with_patterns(user_input)
+        use_rag = use_rag and self.retriever is not None
+        
+        # 보이스피싱 감지와 문서 검색은 서로 독립적이므로 동시에 실행
+        detection = asyncio.to_thread(self.phishing_detector.detect_with_patterns, user_input)
+        if use_rag:
+            retrieval = self.retriever.ainvoke(user_input)
+            phishing_result, documents = await asyncio.gather(detection, retrieval, return_exceptions=True)
+        else:
+            phishing_result, documents = await detection, None
+        
+        if isinstance(phishing_result, BaseException):
+            print(f"보이스피싱 감지 중 오류 발생: {phishing_result}")
+            phishing_result = {"risk_level": "low"}
         
-        # 위험도가 높은 보이스피싱 감지 시
+        # 위험도가 높은 보이스피싱 감지 시 (검색 결과는 버림)
         if phishing_result["risk_level"] in ["high", "medium"]:
             warning = f"⚠️ 주의: 이 대화에서 보이스피싱 의심 징후가 감지되었습니다!\n\n"
             warning += f"위험 수준: {phishing_result['risk_level']}\n"
@@ -100,21 +118,41 @@ class BokdoriDemo:
         
         try:
             # RAG 또는 일반 대화 처리
-            if use_rag and self.retriever:
-                # RAG 체인으로 처리
-                chain = self.chain_manager.get_rag_chain(self.retriever)
-                result = chain({"question": user_input})
+            if use_rag:
+                if isinstance(documents, BaseException):
+                    raise documents
+                
+                # 이미 검색한 문서로 답변만 생성 (생성되는 대로 바로 출력)
+                chain = self.chain_manager.rag_document_chain
+                
+                sys.stdout.write("복도리: ")
+                sys.stdout.flush()
                 
-                response = result.get("answer", "죄송합니다. 응답을 생성하는 데 문제가 발생했습니다.")
+                chunks = []
+                first_token_time = None
+                async for chunk in chain.astream({"input": user_input, "context": documents}):
+                    if first_token_time is None:
+                        first_token_time = time.time() - start_time
+                    sys.stdout.write(chunk)
+                    sys.stdout.flush()
+                    chunks.append(chunk)
+                print()
+                
+                response = "".join(chunks)
+                if not response:
+                    response = "죄송합니다. 응답을 생성하는 데 문제가 발생했습니다."
+                    print(f"복도리: {response}")
+                elif first_token_time is not None:
+                    print(f"첫 토큰까지: {first_token_time:.2f}초")
             else:
-                # 일반 대화 체인으로 처리
+                # 일반 대화 체인으로 처리 (메모리를 쓰는 LLMChain은 결과를 한 번에 반환)
                 chain = self.chain_manager.get_conversation_chain()
-                result = chain({"question": user_input})
+                result = await chain.ainvoke({"input": user_input})
                 
                 response = result.get("text", "죄송합니다. 응답을 생성하는 데 문제가 발생했습니다.")
+                print(f"복도리: {response}")
             
             elapsed_time = time.time() - start_time
-            print(f"복도리: {response}")
             print(f"처리 시간: {elapsed_time:.2f}초")
             
             return response
@@ -122,6 +160,13 @@ class BokdoriDemo:
         except Exception as e:
             print(f"메시지 처리 중 오류 발생: {e}")
             return f"죄송합니다. 메시지를 처리하는 중에 오류가 발생했습니다: {e}"
+    
+    def process_message(self, user_input, use_rag=True):
+        """사용자 메시지 처리 (동기 래퍼, 호출마다 같은 이벤트 루프 재사용)"""
+        # LLM 클라이언트의 비동기 연결 풀은 처음 사용한 루프에 묶이므로 루프를 매번 새로 만들지 않음
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.aprocess_message(user_input, use_rag))
 
 def interactive_demo():
     """대화형 데모 실행"""
@@ -136,25 +181,34 @@ def interactive_demo():
     # 테스트 문서 추가
     bokdori.add_test_document()
     
-    while True:
-        try:
-            # 사용자 입력 받기
-            user_input = input("\n사용자 > ")
+    # 메시지 처리용 이벤트 루프 (세션 동안 재사용)
+    loop = asyncio.new_event_loop()
+    
+    try:
+        while True:
+            try:
+                # 사용자 입력 받기
+                user_input = input("\n사용자 > ")
+                
+                # 종료 명령 확인
+                if user_input.lower() in ["exit", "quit", "종료"]:
+                    print("복도리 AI 비서 데모를 종료합니다.")
+                    break
+                
+                # 메시지 처리
+                loop.run_until_complete(bokdori.aprocess_message(user_input))
             
-            # 종료 명령 확인
-            if user_input.lower() in ["exit", "quit", "종료"]:
-                print("복도리 AI 비서 데모를 종료합니다.")
+            except KeyboardInterrupt:
+                print("\n복도리 AI 비서 데모를 종료합니다.")
                 break
             
-            # 메시지 처리
-            bokdori.process_message(user_input)
-        
-        except KeyboardInterrupt:
-            print("\n복도리 AI 비서 데모를 종료합니다.")
-            break
-        
-        except Exception as e:
-            print(f"오류 발생: {e}")
+            except Exception as e:
+                print(f"오류 발생: {e}")
+    finally:
+        # LLM 클라이언트의 HTTP 연결 풀 닫기 (비동기 연결 풀은 메시지를 처리한 루프에서 닫음)
+        loop.run_until_complete(bokdori.llm_client.aclose())
+        loop.close()
+        bokdori.llm_client.close()
 
 if __name__ == "__main__":
     interactive_demo()
\ No newline at end of file
@@ -7,12 +7,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 import logging
 import time
-
-from modules.llm.openai_client import OpenAIClient
-from modules.langchain.chains import ChainManager
-from modules.langchain.prompts import get_conversation_prompt, get_rag_prompt
-from modules.phishing.detector import PhishingDetector
-from modules.utils.helpers import load_config
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 
 # .env 파일 로드
 load_dotenv()
@@ -21,13 +17,34 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 테스트끼리 공유하는 컴포넌트 (처음 요청할 때 한 번만 생성, 모듈도 이때 로드)
+@lru_cache(maxsize=None)
+def _get_config():
+    from modules.utils.helpers import load_config
+    return load_config()
+
+@lru_cache(maxsize=None)
+def _get_client():
+    from modules.llm.openai_client import OpenAIClient
+    return OpenAIClient()
+
+@lru_cache(maxsize=None)
+def _get_chain_manager():
+    from modules.langchain.chains import ChainManager
+    return ChainManager(_get_config())
+
+@lru_cache(maxsize=None)
+def _get_detector():
+    from modules.phishing.detector import PhishingDetector
+    return PhishingDetector(_get_config())
+
 def test_openai_client():
     """OpenAI 클라이언트 테스트"""
     print("\n=== OpenAI 클라이언트 테스트 ===")
     
     try:
-        # OpenAI 클라이언트 초기화
-        client = OpenAIClient()
+        # OpenAI 클라이언트 (공유)
+        client = _get_client()
         
         # 간단한 대화 생성 테스트
         prompt = "안녕하세요, 당신은 누구인가요? 한 문장으로 대답해주세요."
@@ -45,6 +62,10 @@ def test_openai_client():
         print(f"임베딩 차원: {len(embedding)}")
         print(f"임베딩 샘플: {embedding[:5]}...")
         
+        # 같은 텍스트는 캐시에서 반환되어야 함
+        client.create_embedding(text)
+        print(f"임베딩 캐시 통계: {client.get_embedding_cache_stats()}")
+        
         return True
     except Exception as e:
         print(f"OpenAI 클라이언트 테스트 실패: {e}")
@@ -55,8 +76,7 @@ def test_chain_manager():
     print("\n=== ChainManager 테스트 ===")
     
     try:
-        config = load_config()
-        manager = ChainManager(config)
+        manager = _get_chain_manager()
         
         # 대화 체인 테스트
         conversation_chain = manager.get_conversation_chain()
@@ -88,8 +108,7 @@ def test_phishing_detector():
     print("\n=== 보이스피싱 감지 테스트 ===")
     
     try:
-        config = load_config()
-        detector = PhishingDetector(config)
+        detector = _get_detector()
         
         # 정상 텍스트 테스트
         normal_text = "내일 날씨가 어떨까요? 오후에 약속이 있어서요."
@@ -114,13 +133,20 @@ def main():
     """메인 테스트 함수"""
     print("LLM/LangChain API 테스트 시작")
     
-    # 테스트 실행
-    test_results = {
-        "OpenAI 클라이언트": test_openai_client(),
-        "ChainManager": test_chain_manager(),
-        "보이스피싱 감지": test_phishing_detector()
+    tests = {
+        "OpenAI 클라이언트": test_openai_client,
+        "ChainManager": test_chain_manager,
+        "보이스피싱 감지": test_phishing_detector
     }
     
+    # 서로 독립적인 테스트이므로 동시에 실행 (API 응답 대기 시간이 겹침), 끝나는 순서대로 결과 수집
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = {executor.submit(test): name for name, test in tests.items()}
+        completed = {futures[future]: future.result() for future in as_completed(futures)}
+    
+    # 요약은 원래 순서대로 출력
+    test_results = {name: completed[name] for name in tests}
+    
     # 결과 출력
     print("\n=== 테스트 결과 요약 ===")
     for name, result in test_results.items():
@@ -7,12 +7,18 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
 import logging
+import math
+import random
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # 로컬 모듈 임포트
+from modules.emotion import analyzer as analyzer_module
 from modules.emotion.analyzer import EmotionAnalyzer
 from modules.emotion.trend_monitor import EmotionTrendMonitor
 from modules.emotion.alert_manager import AlertManager
-from modules.utils.helpers import load_config
+from modules.utils.helpers import load_config, to_json
 
 # .env 파일 로드
 load_dotenv()
@@ -36,9 +42,11 @@ def test_emotion_analyzer():
         "그냥 평범한 하루였어요. 특별한 일은 없었어요."
     ]
     
-    for text in test_texts:
+    # 여러 텍스트를 한 번에 분석
+    results = analyzer.analyze_texts(test_texts)
+    
+    for text, result in zip(test_texts, results):
         print(f"\n텍스트: '{text}'")
-        result = analyzer.analyze_text(text)
         print(f"주요 감정: {result['dominant_emotion']}")
         print(f"감정 카테고리: {result['emotion_category']}")
         print(f"감정 점수: {result['emotion_scores']}")
@@ -73,7 +81,6 @@ def test_trend_monitor():
     
     # 오늘 날짜로 테스트 로그 생성
     from datetime import datetime, timedelta
-    import json
     
     today = datetime.now()
     file_path = os.path.join(log_dir, f"{today.strftime('%Y-%m-%d')}_emotion_log.json")
@@ -96,8 +103,8 @@ def test_trend_monitor():
         }
     ]
     
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(test_logs, f, ensure_ascii=False, indent=2)
+    with open(file_path, 'wb') as f:
+        f.write(to_json(test_logs))
     
     # 트렌드 모니터 초기화
     monitor = EmotionTrendMonitor()
@@ -144,17 +151,261 @@ def test_alert_manager():
     
     return True
 
+def test_daily_emotions_unknown_category():
+    """알 수 없는 카테고리만 있는 날짜는 일별 통계에서 제외되는지 테스트"""
+    print("\n=== 일별 감정 통계 (알 수 없는 카테고리) 테스트 ===")
+    
+    monitor = EmotionTrendMonitor()
+    logs = [
+        {"timestamp": "2026-10-01T09:00:00", "emotion_category": "positive"},
+        {"timestamp": "2026-10-01T10:00:00", "emotion_category": "negative"},
+        {"timestamp": "2026-10-02T09:00:00", "emotion_category": "unknown"},
+        {"timestamp": "2026-10-03T09:00:00", "emotion_category": "unknown"},
+        {"timestamp": "2026-10-03T10:00:00", "emotion_category": "neutral"}
+    ]
+    
+    daily_stats = monitor.calculate_daily_emotions(logs)
+    print(f"일별 감정 통계: {daily_stats}")
+    
+    assert list(daily_stats) == ["2026-10-01", "2026-10-03"]
+    assert daily_stats["2026-10-01"]["positive_ratio"] == 0.5
+    assert daily_stats["2026-10-01"]["dominant_emotion"] == "positive"
+    assert daily_stats["2026-10-03"]["neutral_ratio"] == 1.0
+    
+    return True
+
+def _reference_analyze(analyzer, text):
+    """기존 정규식 방식의 감정 점수 계산 (analyze_text 결과 비교용)"""
+    if not text or len(text) < 3:
+        return {
+            "dominant_emotion": "unknown",
+            "emotion_scores": {},
+            "emotion_category": "unknown",
+            "confidence": 0.0
+        }
+    
+    emotion_scores = {emotion: 0 for emotion in analyzer.patterns["emotions"]}
+    keywords = []
+    text_lower = text.lower()
+    
+    for emotion, emotion_keywords in analyzer.patterns["emotions"].items():
+        for keyword in emotion_keywords:
+            for match in re.finditer(r'\b' + keyword + r'\w*\b', text_lower):
+                keywords.append(keyword)
+                score = 1.0
+                context = text[max(0, match.start() - 20):min(len(text), match.end() + 20)].lower()
+                
+                for modifier in analyzer.patterns["intensity_modifiers"]["high"]:
+                    if modifier in context:
+                        score *= 1.5
+                        break
+                for modifier in analyzer.patterns["intensity_modifiers"]["low"]:
+                    if modifier in context:
+                        score *= 0.7
+                        break
+                for negation in analyzer.patterns["negation_words"]:
+                    if negation in context:
+                        score *= -0.5
+                        break
+                
+                emotion_scores[emotion] += score
+    
+    total_score = sum(abs(score) for score in emotion_scores.values())
+    if total_score > 0:
+        normalized_scores = {k: abs(v) / total_score for k, v in emotion_scores.items()}
+        dominant_emotion = max(normalized_scores.items(), key=lambda x: x[1])[0]
+        dominant_score = normalized_scores[dominant_emotion]
+    else:
+        normalized_scores = emotion_scores
+        dominant_emotion = "neutral"
+        dominant_score = 0.0
+    
+    if dominant_emotion in analyzer.emotion_categories["positive"]:
+        category = "positive"
+    elif dominant_emotion in analyzer.emotion_categories["negative"]:
+        category = "negative"
+    else:
+        category = "neutral"
+    
+    scores_list = sorted(normalized_scores.values(), reverse=True)
+    confidence = dominant_score
+    if len(scores_list) > 1 and scores_list[1] > 0:
+        confidence = (scores_list[0] - scores_list[1]) / scores_list[0]
+    
+    return {
+        "dominant_emotion": dominant_emotion,
+        "emotion_category": category,
+        "emotion_scores": normalized_scores,
+        "confidence": min(confidence, 1.0),
+        "keywords": set(keywords)
+    }
+
+def _assert_same_result(result, expected, text):
+    """analyze_text 결과와 기존 정규식 방식 결과 비교"""
+    assert result["dominant_emotion"] == expected["dominant_emotion"], text
+    assert result["emotion_category"] == expected["emotion_category"], text
+    assert list(result["emotion_scores"]) == list(expected["emotion_scores"]), text
+    for emotion, score in expected["emotion_scores"].items():
+        assert math.isclose(result["emotion_scores"][emotion], score, abs_tol=1e-9), text
+    assert math.isclose(result["confidence"], expected["confidence"], abs_tol=1e-9), text
+    
+    # 기존 방식은 키워드 집합에서 임의의 5개를 골랐으므로 집합 관계로 비교
+    if "keywords" not in expected:
+        assert "keywords" not in result, text
+    elif len(expected["keywords"]) <= 5:
+        assert set(result["keywords"]) == expected["keywords"], text
+    else:
+        assert len(result["keywords"]) == 5 and set(result["keywords"]) <= expected["keywords"], text
+
+def _matcher_variants(analyzer):
+    """검색기 종류별(기본, Hyperscan, 트라이/str.find)로 분석기 상태를 바꿔 가며 반환"""
+    analyzer._cache.clear()
+    yield "기본"
+    
+    if analyzer_module.use_hyperscan:
+        analyzer._automaton = None
+        analyzer._build_hyperscan()
+        analyzer._cache.clear()
+        yield "Hyperscan"
+    
+    analyzer._automaton = None
+    analyzer._hs_db = None
+    analyzer._cache.clear()
+    yield "트라이/str.find"
+    
+    analyzer._build_matcher()
+
+def test_analyzer_matches_regex_reference():
+    """analyze_text/analyze_texts 결과가 기존 정규식 방식과 같은지 테스트"""
+    print("\n=== 감정 분석 결과 (기존 정규식 방식 비교) 테스트 ===")
+    
+    analyzer = EmotionAnalyzer()
+    
+    # 부정어, 강도 수정자, 단어 경계, 여러 감정에 중복된 키워드(우울, 좋아) 사례
+    texts = [
+        "오늘은 정말 행복한 하루였어요. 좋은 소식을 들었거든요!",
+        "너무 슬프고 우울해요. 마음이 아파서 울고 싶어요.",
+        "행복하지 않아요. 기쁘지도 않고 그냥 그래요.",
+        "조금 걱정되지만 약간 설레기도 해요.",
+        "정말 화가 나고 짜증나요. 짜증스럽고 열받아요.",
+        "우울우울 우울_해 우울1 (우울) 너무우울해",
+        "좋아좋아 좋아요 안 좋아 좋아하는 사람을 사랑해요",
+        "불안불안해요 불편해요 안녕하세요",
+        "고요하고 고요한 밤, 충분히 충분해요",
+        "그냥 평범한 하루였어요. 특별한 일은 없었어요.",
+        "정말 " * 30 + "행복해요 " + "그리고 " * 40 + "약간 슬퍼요",
+        "매우 기쁘고 " * 40
+    ]
+    
+    # 키워드, 수정자, 부정어를 무작위로 이어 붙인 텍스트 (구분 문자 없이 붙여 단어 경계 확인)
+    patterns = analyzer.patterns
+    tokens = [kw for keywords in patterns["emotions"].values() for kw in keywords]
+    tokens += patterns["intensity_modifiers"]["high"] + patterns["intensity_modifiers"]["low"]
+    tokens += patterns["negation_words"] + ["하루", "요", "Hi", "A", "_", "1", "!"]
+    separators = ["", "", " ", ", ", ".\n"]
+    rng = random.Random(0)
+    for _ in range(200):
+        parts = []
+        for _ in range(rng.randint(1, 30)):
+            parts.append(rng.choice(tokens))
+            parts.append(rng.choice(separators))
+        texts.append("".join(parts))
+    
+    for variant in _matcher_variants(analyzer):
+        expected = [_reference_analyze(analyzer, text) for text in texts]
+        
+        for text, exp in zip(texts, expected):
+            _assert_same_result(analyzer.analyze_text(text), exp, text)
+        
+        # 캐시를 비우고 여러 텍스트 한 번에 분석하는 경로도 확인
+        analyzer._cache.clear()
+        for text, result, exp in zip(texts, analyzer.analyze_texts(texts), expected):
+            _assert_same_result(result, exp, text)
+        
+        print(f"{variant}: {len(texts)}개 텍스트 일치")
+    
+    # 영문 키워드로 단어 경계(접두어, 밑줄, 숫자, 하이픈) 확인
+    analyzer.patterns = {
+        "emotions": {"기쁨": ["happy", "glad"], "슬픔": ["sad", "down", "happy"]},
+        "intensity_modifiers": {"high": ["very"], "low": ["bit"]},
+        "negation_words": ["not", "no"]
+    }
+    analyzer._build_matcher()
+    texts = [
+        "I am happy and glad",
+        "unhappy sadness downtown",
+        "happy_go lucky, happy1, happy-go, HAPPY!",
+        "not very happy, a bit sad",
+        "gladly saddened down-to-earth"
+    ]
+    for variant in _matcher_variants(analyzer):
+        for text in texts:
+            _assert_same_result(analyzer.analyze_text(text), _reference_analyze(analyzer, text), text)
+        analyzer._cache.clear()
+        for text, result in zip(texts, analyzer.analyze_texts(texts)):
+            _assert_same_result(result, _reference_analyze(analyzer, text), text)
+    
+    return True
+
+def test_trend_monitor_log_formats():
+    """추세 모니터가 JSON Lines/이전 JSON 배열 형식 감정 로그를 모두 읽는지 테스트"""
+    print("\n=== 감정 로그 형식 읽기 테스트 ===")
+    
+    from datetime import date, timedelta
+    
+    today = date.today()
+    dates = [(today - timedelta(days=i)).isoformat() for i in range(3)]
+    
+    with tempfile.TemporaryDirectory() as logs_dir:
+        # JSON Lines (기록 중인 마지막 줄은 건너뜀)
+        with open(os.path.join(logs_dir, f"{dates[0]}_emotion_log.json"), "w", encoding="utf-8") as f:
+            f.write('{"timestamp": "%sT09:00:00", "emotion_category": "positive"}\n' % dates[0])
+            f.write('{"timestamp": "%sT10:00:00", "emotion_category": "negative"}\n' % dates[0])
+            f.write('{"timestamp": "%sT11:00:00", "emoti' % dates[0])
+        
+        # 이전 JSON 배열 형식
+        with open(os.path.join(logs_dir, f"{dates[1]}_emotion_log.json"), "wb") as f:
+            f.write(to_json([{"timestamp": f"{dates[1]}T09:00:00", "emotion_category": "neutral"}]))
+        
+        # 여러 줄로 기록된 JSON 객체
+        with open(os.path.join(logs_dir, f"{dates[2]}_emotion_log.json"), "w", encoding="utf-8") as f:
+            f.write('{\n  "timestamp": "%sT09:00:00",\n  "emotion_category": "positive"\n}\n' % dates[2])
+        
+        monitor = EmotionTrendMonitor(logs_dir=logs_dir)
+        logs = monitor.load_emotion_logs(days=2)
+        print(f"로드된 로그 수: {len(logs)}")
+        
+        assert [log["emotion_category"] for log in logs] == ["positive", "neutral", "positive", "negative"]
+        assert list(monitor.iter_emotion_logs(days=2)) == sorted(logs, key=lambda x: x["timestamp"])
+    
+    return True
+
+def _test_trend_monitor_and_alerts():
+    """알림 관리자 테스트는 추세 모니터 테스트가 만든 로그를 읽으므로 순서대로 실행"""
+    trend_result = test_trend_monitor()
+    alert_result = test_alert_manager()
+    return trend_result and alert_result
+
 def main():
     """메인 테스트 함수"""
     print("감정 분석 시스템 테스트 시작")
     
-    # 테스트 실행
-    test_results = {
-        "감정 분석기": test_emotion_analyzer(),
-        "감정 추세 모니터": test_trend_monitor(),
-        "알림 관리자": test_alert_manager()
+    tests = {
+        "감정 분석기": test_emotion_analyzer,
+        "감정 추세 모니터 / 알림 관리자": _test_trend_monitor_and_alerts,
+        "일별 통계 (알 수 없는 카테고리)": test_daily_emotions_unknown_category,
+        "감정 로그 형식 읽기": test_trend_monitor_log_formats,
+        "기존 정규식 방식 비교": test_analyzer_matches_regex_reference
     }
     
+    # 서로 독립적인 테스트이므로 동시에 실행하고 끝나는 순서대로 결과 수집
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = {executor.submit(test): name for name, test in tests.items()}
+        completed = {futures[future]: future.result() for future in as_completed(futures)}
+    
+    # 요약은 원래 순서대로 출력
+    test_results = {name: completed[name] for name in tests}
+    
     # 결과 출력
     print("\n=== 테스트 결과 요약 ===")
     for name, result in test_results.items():
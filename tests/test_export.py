@@ -7,11 +7,14 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
 import logging
+import tempfile
 from datetime import datetime, timedelta
-import json
+from functools import lru_cache
 
 # 로컬 모듈 임포트
+from modules.export import csv_exporter
 from modules.export.csv_exporter import LogExporter
+from modules.utils.helpers import to_json
 
 # .env 파일 로드
 load_dotenv()
@@ -20,14 +23,21 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
 def create_test_logs():
-    """테스트용 로그 생성"""
+    """테스트용 로그 생성 (여러 번 호출해도 한 번만 생성)"""
     print("\n=== 테스트 로그 생성 ===")
     
     # 날짜 설정
     today = datetime.now()
     yesterday = today - timedelta(days=1)
     
+    # 로그마다 다시 포맷하지 않도록 한 번만 계산
+    today_iso = today.isoformat()
+    yesterday_iso = yesterday.isoformat()
+    today_str = today.strftime('%Y-%m-%d')
+    yesterday_str = yesterday.strftime('%Y-%m-%d')
+    
     # 로그 디렉토리 생성
     log_dirs = {
         "conversations": "logs/conversations",
@@ -42,7 +52,7 @@ def create_test_logs():
     test_logs = {
         "conversations": [
             {
-                "timestamp": today.isoformat(),
+                "timestamp": today_iso,
                 "user_input": "안녕하세요, 오늘 날씨 어때요?",
                 "ai_response": "안녕하세요! 오늘은 맑고 화창한 날씨입니다.",
                 "metadata": {
@@ -51,7 +61,7 @@ def create_test_logs():
                 }
             },
             {
-                "timestamp": yesterday.isoformat(),
+                "timestamp": yesterday_iso,
                 "user_input": "복도리 AI 비서란 무엇인가요?",
                 "ai_response": "복도리 AI 비서는 LLM, RAG, LangChain 기술을 활용한 지능형 대화 시스템입니다.",
                 "metadata": {
@@ -62,7 +72,7 @@ def create_test_logs():
         ],
         "emotions": [
             {
-                "timestamp": today.isoformat(),
+                "timestamp": today_iso,
                 "text": "오늘은 정말 행복한 하루였어요. 좋은 소식을 들었거든요!",
                 "dominant_emotion": "기쁨",
                 "emotion_category": "positive",
@@ -70,7 +80,7 @@ def create_test_logs():
                 "keywords": ["행복", "좋은", "소식"]
             },
             {
-                "timestamp": yesterday.isoformat(),
+                "timestamp": yesterday_iso,
                 "text": "조금 피곤하네요. 그래도 괜찮아요.",
                 "dominant_emotion": "평온",
                 "emotion_category": "neutral",
@@ -80,7 +90,7 @@ def create_test_logs():
         ],
         "phishing": [
             {
-                "timestamp": today.isoformat(),
+                "timestamp": today_iso,
                 "text": "제 계좌번호를 알려드릴까요?",
                 "result": {
                     "is_phishing": True,
@@ -91,7 +101,7 @@ def create_test_logs():
                 }
             },
             {
-                "timestamp": yesterday.isoformat(),
+                "timestamp": yesterday_iso,
                 "text": "오늘 약속 장소가 어디였죠?",
                 "result": {
                     "is_phishing": False,
@@ -106,16 +116,16 @@ def create_test_logs():
     
     # 로그 파일 저장
     for log_type, logs in test_logs.items():
-        today_file = os.path.join(log_dirs[log_type], f"{today.strftime('%Y-%m-%d')}_{log_type[:-1]}_log.json")
-        yesterday_file = os.path.join(log_dirs[log_type], f"{yesterday.strftime('%Y-%m-%d')}_{log_type[:-1]}_log.json")
+        today_file = os.path.join(log_dirs[log_type], f"{today_str}_{log_type[:-1]}_log.json")
+        yesterday_file = os.path.join(log_dirs[log_type], f"{yesterday_str}_{log_type[:-1]}_log.json")
         
         # 오늘 로그
-        with open(today_file, 'w', encoding='utf-8') as f:
-            json.dump([logs[0]], f, ensure_ascii=False, indent=2)
+        with open(today_file, 'wb') as f:
+            f.write(to_json([logs[0]]))
         
         # 어제 로그
-        with open(yesterday_file, 'w', encoding='utf-8') as f:
-            json.dump([logs[1]], f, ensure_ascii=False, indent=2)
+        with open(yesterday_file, 'wb') as f:
+            f.write(to_json([logs[1]]))
         
         print(f"{log_type} 테스트 로그 생성 완료: {today_file}, {yesterday_file}")
     
@@ -125,6 +135,9 @@ def test_log_exporter():
     """로그 내보내기 테스트"""
     print("\n=== 로그 내보내기 테스트 ===")
     
+    # 테스트 로그 준비 (main에서 이미 만들었으면 생략)
+    create_test_logs()
+    
     # 로그 내보내기 초기화
     exporter = LogExporter()
     
@@ -159,6 +172,57 @@ def test_log_exporter():
     
     return True
 
+def test_csv_export_paths_match():
+    """pyarrow 경로와 csv 모듈 경로의 CSV 내보내기 결과가 바이트 단위로 같은지 테스트"""
+    print("\n=== CSV 내보내기 경로 비교 테스트 ===")
+    
+    if not csv_exporter.use_pyarrow:
+        print("pyarrow가 설치되지 않아 비교를 생략합니다.")
+        return True
+    
+    datasets = {
+        # 따옴표가 필요 없는 값 (pyarrow CSV 작성기 사용)
+        "unquoted": [
+            {"timestamp": "2026-10-01T09:00:00", "text": "좋은 하루", "confidence": 1.0, "count": 3,
+             "flag": True, "result": {"score": 0.85, "is_phishing": False}, "keywords": ["행복"]},
+            {"timestamp": "2026-10-01T10:30:00.500000Z", "text": "", "confidence": 1e-7, "count": None,
+             "flag": False, "result": {"score": 0.1 + 0.2, "is_phishing": True}, "keywords": []},
+            {"timestamp": "어제", "confidence": 0.5, "extra": None}
+        ],
+        # 따옴표가 필요한 값 (구분자, 따옴표, 줄바꿈)
+        "quoted": [
+            {"timestamp": "2026-10-01T09:00:00", "text": "안녕, 복도리", "keywords": ["a", "b"], "flag": True},
+            {"timestamp": "2026-10-01T09:00:01", "text": "그가 \"안녕\"이라고\n말했어요", "keywords": [], "flag": False}
+        ]
+    }
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, logs in datasets.items():
+            logs_dir = os.path.join(temp_dir, name, "logs")
+            os.makedirs(os.path.join(logs_dir, "emotions"))
+            with open(os.path.join(logs_dir, "emotions", "2026-10-01_emotion_log.json"), "wb") as f:
+                f.write(to_json(logs))
+            
+            exporter = LogExporter(base_logs_dir=logs_dir, export_dir=os.path.join(temp_dir, name, "exports"))
+            
+            outputs = {}
+            for flag in (True, False):
+                csv_exporter.use_pyarrow = flag
+                try:
+                    output_file = exporter.export_to_csv(
+                        "emotions", "2026-10-01", "2026-10-01",
+                        output_file=os.path.join(temp_dir, name, f"pyarrow_{flag}.csv")
+                    )
+                finally:
+                    csv_exporter.use_pyarrow = True
+                with open(output_file, "rb") as f:
+                    outputs[flag] = f.read()
+            
+            print(f"{name}: {outputs[True].decode('utf-8-sig')!r}")
+            assert outputs[True] == outputs[False], name
+    
+    return True
+
 def main():
     """메인 테스트 함수"""
     print("데이터 내보내기 시스템 테스트 시작")
@@ -168,7 +232,8 @@ def main():
     
     # 테스트 실행
     test_results = {
-        "로그 내보내기": test_log_exporter()
+        "로그 내보내기": test_log_exporter(),
+        "CSV 내보내기 경로 비교": test_csv_export_paths_match()
     }
     
     # 결과 출력
@@ -7,10 +7,17 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
 import logging
+import math
+import random
+import tempfile
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from modules.langchain.embeddings import BatchedEmbeddings, CachedEmbeddings
 from modules.rag.chroma_client import ChromaManager
-from modules.rag.document_loader import load_document, split_documents
-from modules.rag.retriever import get_retriever
+from modules.rag.document_loader import fast_recursive_split, load_document, split_documents
+from modules.rag.retriever import BatchingRetriever, get_retriever
 from modules.utils.helpers import load_config
+from langchain.schema import Document
 
 # .env 파일 로드
 load_dotenv()
@@ -19,11 +26,14 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def test_document_loading():
-    """문서 로드 테스트"""
-    print("\n=== 문서 로드 테스트 ===")
+@lru_cache(maxsize=None)
+def _get_test_documents():
+    """
+    테스트 문서를 생성하고 로드/분할 (테스트끼리 공유, 한 번만 실행)
     
-    # 테스트 문서 생성
+    Returns:
+        tuple: (로드된 문서 목록, 분할된 청크 목록)
+    """
     os.makedirs("data/documents/test", exist_ok=True)
     test_file = "data/documents/test/test_document.txt"
     
@@ -32,13 +42,18 @@ def test_document_loading():
         f.write("복도리 AI 비서는 사용자의 질문에 정확하게 답변하기 위해 문서 기반 검색을 활용합니다.\n")
         f.write("LangChain과 Chroma를 사용하여 효율적인 벡터 검색을 구현했습니다.")
     
-    # 문서 로드
     documents = load_document(test_file)
+    chunks = split_documents(documents, chunk_size=100, chunk_overlap=20)
+    return documents, chunks
+
+def test_document_loading():
+    """문서 로드 테스트"""
+    print("\n=== 문서 로드 테스트 ===")
+    
+    # 테스트 문서 생성, 로드 및 분할
+    documents, chunks = _get_test_documents()
     print(f"로드된 문서: {len(documents)} 개")
     print(f"문서 내용 샘플: {documents[0].page_content[:50]}...")
-    
-    # 문서 분할
-    chunks = split_documents(documents, chunk_size=100, chunk_overlap=20)
     print(f"분할된 청크: {len(chunks)} 개")
     for i, chunk in enumerate(chunks):
         print(f"청크 {i+1}: {chunk.page_content[:30]}...")
@@ -52,15 +67,13 @@ def test_chroma_db():
     config = load_config()
     
     # ChromaManager 초기화
-    chroma_manager = ChromaManager(config.get("rag", {}))
+    chroma_manager = ChromaManager(config.get("rag", {}), config.get("embedding", {}))
     
-    # 테스트 문서 생성 및 로드
-    test_file = "data/documents/test/test_document.txt"
-    documents = load_document(test_file)
-    chunks = split_documents(documents, chunk_size=100, chunk_overlap=20)
+    # 문서 로드 테스트에서 만든 청크 재사용 (같은 청크는 다시 임베딩하지 않음)
+    _, chunks = _get_test_documents()
     
     # Chroma DB에 문서 추가
-    db = chroma_manager.add_documents(chunks)
+    db, _ = chroma_manager.add_document_batches(chunks, batch_size=64)
     count = db._collection.count() if hasattr(db, '_collection') else 0
     print(f"Chroma DB 문서 수: {count}")
     
@@ -92,6 +105,186 @@ def test_rag_retriever():
     
     return len(results) > 0
 
+def test_batching_retriever():
+    """동시 검색 요청을 묶어서 처리한 결과가 요청별 직접 검색 결과와 같은지 테스트"""
+    print("\n=== 검색 요청 배치 처리 테스트 ===")
+    
+    config = load_config()
+    chroma_manager = ChromaManager(config.get("rag", {}), config.get("embedding", {}))
+    
+    # 문서 로드 테스트에서 만든 청크 재사용
+    _, chunks = _get_test_documents()
+    db, _ = chroma_manager.add_document_batches(chunks, batch_size=64)
+    
+    retriever = BatchingRetriever(db=db, k=2, max_wait_ms=50)
+    queries = [
+        "복도리 AI 비서는 어떤 기술을 사용하나요?",
+        "RAG 시스템 테스트 문서",
+        "벡터 검색은 무엇으로 구현했나요?",
+        "문서 기반 검색을 활용하나요?"
+    ] * 4
+    
+    # 여러 스레드에서 동시에 검색 (한 번의 쿼리로 묶여서 처리됨)
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        results = list(executor.map(retriever.invoke, queries))
+    
+    # 요청별로 직접 검색한 결과와 비교
+    for query, documents in zip(queries, results):
+        expected = retriever._search([query])[0]
+        assert [doc.page_content for doc in documents] == [doc.page_content for doc in expected], query
+        assert [doc.metadata for doc in documents] == [doc.metadata for doc in expected], query
+    print(f"동시 검색 요청 {len(queries)}개 결과 일치")
+    
+    # 검색기를 닫으면 배치 처리 스레드가 종료됨
+    worker = retriever._worker
+    retriever.close()
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    
+    # 닫은 뒤의 요청은 새 스레드가 처리
+    documents = retriever.invoke(queries[0])
+    assert [doc.page_content for doc in documents] == [doc.page_content for doc in retriever._search([queries[0]])[0]]
+    retriever.close()
+    
+    return True
+
+def test_embedding_cache_config():
+    """설정 파일의 embedding.cache_enabled가 ChromaManager 임베딩 모델에 반영되는지 테스트"""
+    print("\n=== 임베딩 캐시 설정 테스트 ===")
+    
+    config = load_config()
+    rag_config = dict(config.get("rag", {}), warmup=False)
+    
+    # 환경 변수가 설정 파일보다 우선하므로 테스트 중에는 제거
+    env_value = os.environ.pop("ENABLE_EMBEDDING_CACHE", None)
+    try:
+        embedding_config = dict(config.get("embedding", {}), cache_enabled=False)
+        model = ChromaManager(rag_config, embedding_config).embedding_model
+        print(f"cache_enabled=False: {type(model).__name__}")
+        assert isinstance(model, BatchedEmbeddings)
+        
+        embedding_config = dict(config.get("embedding", {}), cache_enabled=True)
+        model = ChromaManager(rag_config, embedding_config).embedding_model
+        print(f"cache_enabled=True: {type(model).__name__}")
+        assert isinstance(model, CachedEmbeddings)
+    finally:
+        if env_value is not None:
+            os.environ["ENABLE_EMBEDDING_CACHE"] = env_value
+    
+    return True
+
+def test_embedding_batch_config():
+    """설정 파일의 embedding.batch_size/max_wait_ms가 배치 임베딩 모델에 반영되는지 테스트"""
+    print("\n=== 임베딩 배치 설정 테스트 ===")
+    
+    config = load_config()
+    rag_config = dict(config.get("rag", {}), warmup=False)
+    embedding_config = dict(config.get("embedding", {}), batch_size=8, max_wait_ms=25)
+    
+    model = ChromaManager(rag_config, embedding_config).embedding_model
+    
+    # 캐시를 사용하면 배치 임베딩 모델은 캐시 안쪽에 있음
+    if isinstance(model, CachedEmbeddings):
+        model = model.inner
+    print(f"batch_size={model.batch_size}, max_wait={model.max_wait}")
+    
+    assert isinstance(model, BatchedEmbeddings)
+    assert model.batch_size == 8
+    assert model.max_wait == 0.025
+    
+    return True
+
+def test_fast_recursive_split():
+    """큰 청크용 분할기가 청크 크기를 지키고 내용을 잃지 않는지 테스트 (무작위 텍스트)"""
+    print("\n=== 큰 청크 분할기 테스트 ===")
+    
+    # 중복 크기가 청크 크기 이상이면 LangChain 분할기처럼 오류
+    for chunk_overlap in (100, 150):
+        try:
+            fast_recursive_split("텍스트", chunk_size=100, chunk_overlap=chunk_overlap)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"chunk_overlap={chunk_overlap}에서 ValueError가 발생하지 않음")
+    
+    rng = random.Random(0)
+    words = ["복도리", "AI", "비서", "검색", "문서", "a" * 70, "끝."]
+    separators = [" ", " ", " ", ". ", "\n", "\n\n", "  "]
+    
+    for _ in range(200):
+        text = "".join(rng.choice(words) + rng.choice(separators) for _ in range(rng.randint(1, 300)))
+        chunk_size = rng.randint(10, 200)
+        chunk_overlap = rng.randint(0, chunk_size - 1)
+        
+        chunks = fast_recursive_split(text, chunk_size, chunk_overlap)
+        
+        # 모든 청크는 chunk_size 이하
+        assert all(0 < len(chunk) <= chunk_size for chunk in chunks), (chunk_size, chunk_overlap)
+        
+        # 각 청크를 지금까지 덮은 구간(+이어지는 공백) 안에서 시작하는 가장 뒤의 위치에 놓았을 때
+        # 원문에서 공백 외에 덮이지 않는 내용이 없어야 함
+        covered = 0
+        for chunk in chunks:
+            rest = text[covered:]
+            limit = covered + len(rest) - len(rest.lstrip())
+            pos = text.rfind(chunk, 0, limit + len(chunk))
+            assert pos != -1, (chunk_size, chunk_overlap, text[covered:limit + len(chunk)])
+            covered = max(covered, pos + len(chunk))
+        assert not text[covered:].strip(), (chunk_size, chunk_overlap)
+    
+    print("무작위 텍스트 200개: 청크 크기와 내용 보존 확인")
+    return True
+
+def test_in_memory_search_matches_chroma():
+    """메모리 numpy 검색 결과가 Chroma 쿼리 결과와 같은 문서/순서인지 테스트"""
+    print("\n=== 메모리 검색 / Chroma 검색 비교 테스트 ===")
+    
+    config = load_config()
+    
+    # 고정된 작은 문서 모음 (지식 베이스와 섞이지 않도록 임시 디렉토리에 저장)
+    corpus = [
+        "복도리 AI 비서는 사용자의 질문에 답변합니다.",
+        "보이스피싱 전화는 계좌번호와 비밀번호를 요구합니다.",
+        "감정 분석기는 텍스트에서 기쁨, 슬픔, 분노를 찾습니다.",
+        "Chroma는 벡터 데이터베이스입니다.",
+        "LangChain으로 RAG 체인을 구성합니다.",
+        "오늘 날씨는 맑고 화창합니다.",
+        "검찰청을 사칭하는 전화에 주의하세요.",
+        "우울한 기분이 계속되면 전문가와 상담하세요.",
+        "문서는 청크로 나누어 임베딩합니다.",
+        "임베딩 캐시는 같은 텍스트를 다시 요청하지 않습니다."
+    ]
+    documents = [Document(page_content=text, metadata={"doc_id": i}) for i, text in enumerate(corpus)]
+    queries = ["보이스피싱 예방 방법", "벡터 검색", "기분이 우울해요", "날씨 어때요?"]
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        rag_config = dict(
+            config.get("rag", {}),
+            chroma_persist_directory=temp_dir,
+            chroma_collection_name="test_in_memory_search",
+            warmup=False
+        )
+        chroma_manager = ChromaManager(rag_config, config.get("embedding", {}))
+        db, _ = chroma_manager.add_document_batches(documents, batch_size=64)
+        
+        for query in queries:
+            for k in (3, len(corpus)):
+                in_memory = chroma_manager.search_documents(query, k=k)
+                chroma = db.similarity_search_with_relevance_scores(query, k=k)
+                
+                # 메모리 검색 경로를 실제로 사용했는지 확인
+                assert chroma_manager._vectors, "메모리 검색용 임베딩이 로드되지 않음"
+                
+                in_memory_ids = [doc.metadata["doc_id"] for doc, _ in in_memory]
+                chroma_ids = [doc.metadata["doc_id"] for doc, _ in chroma]
+                assert in_memory_ids == chroma_ids, (query, k, in_memory_ids, chroma_ids)
+                for (_, score), (_, expected) in zip(in_memory, chroma):
+                    assert math.isclose(score, expected, rel_tol=1e-4, abs_tol=1e-5), (query, score, expected)
+            
+            print(f"'{query}': {in_memory_ids[:3]}")
+    
+    return True
+
 def main():
     """메인 테스트 함수"""
     print("RAG 시스템 테스트 시작")
@@ -100,7 +293,12 @@ def main():
     test_results = {
         "문서 로드": test_document_loading(),
         "Chroma DB": test_chroma_db(),
-        "RAG 검색기": test_rag_retriever()
+        "RAG 검색기": test_rag_retriever(),
+        "검색 요청 배치 처리": test_batching_retriever(),
+        "임베딩 캐시 설정": test_embedding_cache_config(),
+        "임베딩 배치 설정": test_embedding_batch_config(),
+        "큰 청크 분할기": test_fast_recursive_split(),
+        "메모리 검색 / Chroma 검색 비교": test_in_memory_search_matches_chroma()
     }
     
     # 결과 출력